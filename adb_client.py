@@ -0,0 +1,276 @@
+import socket
+import struct
+import subprocess
+from typing import Callable
+from adb_session import SESSION_TIMEOUT
+
+ADB_HOST: str = "127.0.0.1"
+ADB_PORT: int = 5037
+
+# Shell protocol v2 packet ids.
+SHELL_STDOUT: int = 1
+SHELL_STDERR: int = 2
+SHELL_EXIT: int = 3
+
+
+class AdbError(Exception):
+    """Raised when the adb server cannot be reached or refuses a request."""
+
+
+class AdbStreamError(AdbError):
+    """Raised when a shell stream ends without an exit status, after the command may have run."""
+
+
+def split_lines(buffer: bytearray, on_line: Callable[[str], None]) -> bytearray:
+    """
+    Pass the complete lines of a stdout buffer to a callback.
+
+    Args:
+        buffer (bytearray): The output received so far.
+        on_line (Callable[[str], None]): Called with each complete line, including the newline.
+
+    Returns:
+        bytearray: The incomplete last line, kept for the next chunk.
+    """
+    end = buffer.rfind(b"\n")
+    if end == -1:
+        return buffer
+    for line in bytes(buffer[:end]).decode("utf-8", errors="replace").split("\n"):
+        on_line(line + "\n")
+    return buffer[end + 1:]
+
+
+def parse_device_lines(text: str) -> list[dict]:
+    """
+    Parse `adb devices -l` style lines.
+
+    Args:
+        text (str): Lines such as `emulator-5554  device product:sdk model:Pixel_7 transport_id:1`.
+
+    Returns:
+        list[dict]: The serial, state and any `key:value` details of each device.
+    """
+    devices = []
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 2 or line.startswith("List of devices"):
+            continue
+        device = {"serial": fields[0], "state": fields[1]}
+        for field in fields[2:]:
+            key, _, value = field.partition(":")
+            device[key] = value
+        devices.append(device)
+    return devices
+
+
+class AdbClient:
+    """A pure-Python client for the adb server's smart-socket protocol."""
+
+    def __init__(self, host: str = ADB_HOST, port: int = ADB_PORT, timeout: float | None = SESSION_TIMEOUT):
+        """
+        Initialize the client.
+
+        Args:
+            host (str): The address of the adb server.
+            port (int): The port of the adb server.
+            timeout (float | None): Seconds the adb server may stay silent, on connect and on each
+                read; the same idle timeout as the session pool and the asyncio backend.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _connect(self) -> socket.socket:
+        """Open a connection to the adb server."""
+        try:
+            return socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError as e:
+            raise AdbError(f"Cannot connect to adb server at {self.host}:{self.port}: {e}") from e
+
+    @staticmethod
+    def _read_exact(sock: socket.socket, size: int) -> bytes:
+        """Read exactly `size` bytes from the socket."""
+        data = bytearray()
+        while len(data) < size:
+            try:
+                chunk = sock.recv(size - len(data))
+            except OSError as e:
+                raise AdbError(f"Connection to adb server failed: {e}") from e
+            if not chunk:
+                raise AdbError("Connection closed by adb server.")
+            data.extend(chunk)
+        return bytes(data)
+
+    def _read_length_prefixed(self, sock: socket.socket) -> str:
+        """Read a payload prefixed with a four-digit hex length."""
+        length = int(self._read_exact(sock, 4), 16)
+        return self._read_exact(sock, length).decode("utf-8", errors="replace")
+
+    def _request(self, sock: socket.socket, service: str) -> None:
+        """
+        Send a service request and check the OKAY/FAIL status.
+
+        Args:
+            sock (socket.socket): The connection to the adb server.
+            service (str): The service name, e.g. `host:version`.
+        """
+        payload = service.encode("utf-8")
+        try:
+            sock.sendall(b"%04x" % len(payload) + payload)
+        except OSError as e:
+            raise AdbError(f"Connection to adb server failed: {e}") from e
+        status = self._read_exact(sock, 4)
+        if status == b"FAIL":
+            raise AdbError(self._read_length_prefixed(sock))
+        if status != b"OKAY":
+            raise AdbError(f"Unexpected adb server response: {status!r}")
+
+    def _host_query(self, service: str) -> str:
+        """Run a host service that answers with one length-prefixed payload."""
+        with self._connect() as sock:
+            self._request(sock, service)
+            return self._read_length_prefixed(sock)
+
+    def _open_device_service(self, serial: str, service: str) -> socket.socket:
+        """
+        Switch a new connection to a device and open a service on it.
+
+        Args:
+            serial (str): The serial number of the device.
+            service (str): The device service, e.g. `shell:ls`.
+
+        Returns:
+            socket.socket: The connection, positioned at the start of the service stream.
+        """
+        sock = self._connect()
+        try:
+            self._request(sock, f"host:transport:{serial}")
+            self._request(sock, service)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    def server_version(self) -> int | None:
+        """
+        Query the adb server version.
+
+        Returns:
+            int | None: The version, or None when no server is listening.
+        """
+        try:
+            return int(self._host_query("host:version"), 16)
+        except (AdbError, ValueError):
+            return None
+
+    def is_server_alive(self) -> bool:
+        """Check whether an adb server answers on the configured port."""
+        return self.server_version() is not None
+
+    def kill_server(self) -> None:
+        """Ask the adb server to exit."""
+        with self._connect() as sock:
+            self._request(sock, "host:kill")
+
+    def devices(self) -> list[dict]:
+        """
+        List the devices known to the adb server (`host:devices-l`).
+
+        Returns:
+            list[dict]: The serial, state and any `key:value` details of each device.
+        """
+        return parse_device_lines(self._host_query("host:devices-l"))
+
+    def open_device_tracker(self) -> socket.socket:
+        """
+        Open a `host:track-devices-l` stream.
+
+        The server sends the full device list once, then again every time it changes;
+        read each list with `read_device_list`.
+
+        Returns:
+            socket.socket: The blocking tracker connection.
+        """
+        sock = self._connect()
+        try:
+            self._request(sock, "host:track-devices-l")
+        except Exception:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return sock
+
+    def read_device_list(self, sock: socket.socket) -> list[dict]:
+        """
+        Wait for the next device list on a tracker stream.
+
+        Args:
+            sock (socket.socket): A connection from `open_device_tracker`.
+
+        Returns:
+            list[dict]: The serial, state and details of each device.
+        """
+        return parse_device_lines(self._read_length_prefixed(sock))
+
+    def exec(self, serial: str, command: str) -> bytes:
+        """
+        Run a command with the raw `exec:` service.
+
+        Args:
+            serial (str): The serial number of the device.
+            command (str): The command line to run.
+
+        Returns:
+            bytes: Everything the command wrote to stdout.
+        """
+        with self._open_device_service(serial, f"exec:{command}") as sock:
+            chunks = []
+            try:
+                while chunk := sock.recv(65536):
+                    chunks.append(chunk)
+            except OSError as e:
+                raise AdbError(f"Connection to adb server failed: {e}") from e
+            return b"".join(chunks)
+
+    def shell(self, serial: str, command: str, on_line: Callable[[str], None] | None = None) -> subprocess.CompletedProcess:
+        """
+        Run a shell command with the shell v2 protocol, which separates stdout, stderr and the exit code.
+
+        A stream that closes or stalls before the exit packet raises AdbStreamError
+        rather than passing off partial output as a success.
+
+        Args:
+            serial (str): The serial number of the device.
+            command (str): The shell command line to run.
+            on_line (Callable[[str], None] | None): Called with each stdout line as it arrives,
+                instead of collecting stdout in the result.
+
+        Returns:
+            subprocess.CompletedProcess: The result of the command.
+        """
+        stdout, stderr = bytearray(), bytearray()
+        returncode = None
+        with self._open_device_service(serial, f"shell,v2,raw:{command}") as sock:
+            try:
+                while returncode is None:
+                    packet_id, length = struct.unpack("<BI", self._read_exact(sock, 5))
+                    data = self._read_exact(sock, length) if length else b""
+                    if packet_id == SHELL_STDOUT:
+                        stdout.extend(data)
+                        if on_line is not None:
+                            stdout = split_lines(stdout, on_line)
+                    elif packet_id == SHELL_STDERR:
+                        stderr.extend(data)
+                    elif packet_id == SHELL_EXIT:
+                        returncode = data[0] if data else 0
+            except AdbError as e:
+                raise AdbStreamError(f"Shell on {serial} ended without an exit status: {e}") from e
+        if on_line is not None and stdout:
+            on_line(stdout.decode("utf-8", errors="replace"))
+            stdout.clear()
+        return subprocess.CompletedProcess(
+            ["adb", "-s", serial, "shell", command],
+            returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace")
+        )
@@ -0,0 +1,413 @@
+import os
+import queue
+import shlex
+import codecs
+import threading
+import subprocess
+from pathlib import Path
+from typing import Callable
+
+CREATE_NO_WINDOW: int = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+# Seconds a pooled command may stay silent before the session is given up.
+SESSION_TIMEOUT: float = 120.0
+
+
+class SessionError(Exception):
+    """Raised when a persistent shell session cannot run a command."""
+
+
+class SessionClosedError(SessionError):
+    """Raised when a command could not be sent to the session, so it never ran and can be retried."""
+
+
+class ShellSession:
+    """A long-lived `adb -s <serial> shell` process that runs commands over stdin."""
+
+    def __init__(self, adb_path: Path, serial: str):
+        """
+        Start the shell session.
+
+        Args:
+            adb_path (Path): The path to the ADB executable.
+            serial (str): The serial number of the device.
+        """
+        self.adb_path = adb_path
+        self.serial = serial
+        self.lock = threading.Lock()
+        self.shell_v2 = self._has_shell_v2()
+        self.stdout_queue: queue.Queue = queue.Queue()
+        self.stderr_queue: queue.Queue = queue.Queue()
+        self.process = subprocess.Popen(
+            [str(adb_path), "-s", serial, "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=CREATE_NO_WINDOW
+        )
+        for stream, target in ((self.process.stdout, self.stdout_queue), (self.process.stderr, self.stderr_queue)):
+            threading.Thread(target=self._pump, args=(stream, target), daemon=True).start()
+
+    def _has_shell_v2(self) -> bool:
+        """Check whether the device keeps stderr apart from stdout (the shell_v2 feature)."""
+        try:
+            result = subprocess.run(
+                [str(self.adb_path), "-s", self.serial, "features"], text=True, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, timeout=10, creationflags=CREATE_NO_WINDOW
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return result.returncode == 0 and "shell_v2" in result.stdout.replace("\n", ",").split(",")
+
+    @staticmethod
+    def _pump(stream, target: queue.Queue) -> None:
+        """Move lines from a pipe into a queue until the pipe closes."""
+        for line in iter(stream.readline, ""):
+            target.put(line)
+        target.put(None)
+
+    def is_alive(self) -> bool:
+        """Check whether the underlying adb process is still running and has not been closed."""
+        return self.process.poll() is None and not self.process.stdin.closed
+
+    def run(self, command: str, timeout: float | None = None,
+            on_line: Callable[[str], None] | None = None) -> subprocess.CompletedProcess:
+        """
+        Run a shell command in the session.
+
+        The command runs in its own `sh -c`, so `exit`, `cd`, variables and even
+        a syntax error stay inside it, and is framed with unique begin/end markers
+        on both stdout and stderr, so its output and exit code can be separated
+        from the stream.
+        Without shell_v2 the device merges stderr into stdout, so both markers
+        are read from stdout and stderr stays empty. Raises SessionClosedError if
+        the command could not be sent and SessionError if the session ended or
+        timed out while it ran. An exception raised by `on_line` closes the
+        session, which stops the command on the device.
+
+        Args:
+            command (str): The shell command line to run on the device.
+            timeout (float | None): Seconds to wait for each line of output.
+            on_line (Callable[[str], None] | None): Called with each stdout line as it arrives,
+                instead of collecting stdout in the result.
+
+        Returns:
+            subprocess.CompletedProcess: The result of the command.
+        """
+        with self.lock:
+            if not self.is_alive():
+                raise SessionClosedError(f"Shell session for {self.serial} is not running.")
+            token = os.urandom(8).hex()
+            begin, end = f"__UNBLOAT_BEGIN_{token}__", f"__UNBLOAT_END_{token}__"
+            stderr_markers = (f"echo {begin} >&2; ", f"; echo {end} >&2") if self.shell_v2 else ("", "")
+            framed = (
+                f"echo {begin}; {stderr_markers[0]}sh -c {shlex.quote(command)} </dev/null; "
+                f"echo \"{end} $?\"{stderr_markers[1]}\n"
+            )
+            try:
+                self.process.stdin.write(framed)
+                self.process.stdin.flush()
+            except (OSError, ValueError) as e:
+                raise SessionClosedError(f"Shell session for {self.serial} closed: {e}") from e
+
+            try:
+                stdout, returncode = self._collect(self.stdout_queue, begin, end, timeout, on_line)
+            except SessionError:
+                raise
+            except Exception:
+                self.close()
+                raise
+            stderr = self._collect(self.stderr_queue, begin, end, timeout)[0] if self.shell_v2 else ""
+            return subprocess.CompletedProcess(
+                [str(self.adb_path), "-s", self.serial, "shell", command], returncode, stdout, stderr
+            )
+
+    def _collect(self, source: queue.Queue, begin: str, end: str, timeout: float | None,
+                 on_line: Callable[[str], None] | None = None) -> tuple[str, int]:
+        """
+        Read one framed block from a stream queue, passing its lines to `on_line` if given.
+
+        Returns:
+            tuple[str, int]: The text between the markers and the exit code found on the end marker.
+        """
+        lines = []
+        started = False
+        while True:
+            try:
+                line = source.get(timeout=timeout)
+            except queue.Empty:
+                self.close()
+                raise SessionError(f"Command timed out on {self.serial}.")
+            if line is None:
+                raise SessionError(f"Shell session for {self.serial} ended unexpectedly.")
+            if not started:
+                started = line.rstrip("\n") == begin
+                continue
+            index = line.find(end)
+            if index == -1:
+                if on_line is not None:
+                    on_line(line)
+                else:
+                    lines.append(line)
+                continue
+            if on_line is not None and index:
+                on_line(line[:index])
+            else:
+                lines.append(line[:index])
+            code = line[index + len(end):].strip()
+            return "".join(lines), int(code) if code.lstrip("-").isdigit() else 0
+
+    def close(self) -> None:
+        """Terminate the shell session."""
+        try:
+            if self.is_alive():
+                self.process.stdin.close()
+                self.process.terminate()
+        except OSError:
+            pass
+
+
+class SessionPool:
+    """Keeps one persistent shell session per device."""
+
+    def __init__(self, adb_path: Path):
+        """
+        Initialize the session pool.
+
+        Args:
+            adb_path (Path): The path to the ADB executable.
+        """
+        self.adb_path = adb_path
+        self.sessions: dict[str, ShellSession] = {}
+        self.lock = threading.Lock()
+
+    def get(self, serial: str) -> ShellSession:
+        """
+        Return the session for a device, starting a new one if needed.
+
+        Args:
+            serial (str): The serial number of the device.
+
+        Returns:
+            ShellSession: A running shell session.
+        """
+        with self.lock:
+            session = self.sessions.get(serial)
+            if session is None or not session.is_alive():
+                try:
+                    session = ShellSession(self.adb_path, serial)
+                except OSError as e:
+                    raise SessionClosedError(f"Could not start shell session for {serial}: {e}") from e
+                self.sessions[serial] = session
+            return session
+
+    def run(self, serial: str, command: str, timeout: float | None = SESSION_TIMEOUT,
+            on_line: Callable[[str], None] | None = None) -> subprocess.CompletedProcess:
+        """
+        Run a shell command on a device.
+
+        A command that could not be sent is retried once on a fresh session. One that
+        timed out or lost its session while running is not, since it may have had effects.
+        Any failure while it ran, including an exception from `on_line`, drops the session
+        from the pool.
+
+        Args:
+            serial (str): The serial number of the device.
+            command (str): The shell command line to run on the device.
+            timeout (float | None): Seconds to wait for each line of output.
+            on_line (Callable[[str], None] | None): Called with each stdout line as it arrives.
+
+        Returns:
+            subprocess.CompletedProcess: The result of the command.
+        """
+        try:
+            return self.get(serial).run(command, timeout, on_line)
+        except SessionClosedError:
+            self.discard(serial)
+            return self.get(serial).run(command, timeout, on_line)
+        except Exception:
+            self.discard(serial)
+            raise
+
+    def discard(self, serial: str) -> None:
+        """Close and forget the session of a device."""
+        with self.lock:
+            session = self.sessions.pop(serial, None)
+        if session:
+            session.close()
+
+    def close_all(self) -> None:
+        """Close every session in the pool."""
+        with self.lock:
+            sessions, self.sessions = list(self.sessions.values()), {}
+        for session in sessions:
+            session.close()
+
+
+class InteractiveShell:
+    """
+    A long-lived `adb -s <serial> shell` for an interactive terminal.
+
+    Unlike ShellSession, output is streamed as it arrives: stdout and stderr
+    are read concurrently by two threads and forwarded in chunks, so a command
+    writing heavily to stderr can neither block nor delay its stdout. Shell
+    state such as the working directory persists between commands.
+    """
+
+    def __init__(self, adb_path: Path, serial: str, on_output: Callable[[str, str], None], on_done: Callable[[int], None],
+                 program: list[str] | None = None):
+        """
+        Initialize the shell. Call `start` to launch it.
+
+        Args:
+            adb_path (Path): The path to the ADB executable.
+            serial (str): The serial number of the device.
+            on_output (Callable[[str, str], None]): Called from the reader threads with
+                "stdout" or "stderr" and a chunk of text.
+            on_done (Callable[[int], None]): Called with the exit code when a command finishes.
+            program (list[str] | None): A shell program to run instead of the default
+                shell, e.g. ["su"] for a root shell reading the commands.
+        """
+        self.adb_path = adb_path
+        self.serial = serial
+        self.program = program or []
+        self.on_output = on_output
+        self.on_done = on_done
+        self.lock = threading.Lock()
+        self.process: subprocess.Popen | None = None
+        self.end_marker: str | None = None
+        self.pending_streams: set[str] = set()
+        self.returncode: int = 0
+        self.cwd: str | None = None
+
+    def start(self) -> None:
+        """Launch the adb shell process and its reader threads."""
+        self.process = subprocess.Popen(
+            [str(self.adb_path), "-s", self.serial, "shell"] + self.program,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            creationflags=CREATE_NO_WINDOW
+        )
+        for name, stream in (("stdout", self.process.stdout), ("stderr", self.process.stderr)):
+            threading.Thread(target=self._read, args=(self.process, name, stream), daemon=True).start()
+
+    def is_alive(self) -> bool:
+        """Check whether the adb shell process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def is_busy(self) -> bool:
+        """Check whether a command is still running."""
+        with self.lock:
+            return self.end_marker is not None
+
+    def send(self, line: str) -> None:
+        """
+        Write a raw line to the shell, outside of any command framing.
+
+        Args:
+            line (str): The line, without the newline.
+        """
+        try:
+            self.process.stdin.write(f"{line}\n".encode("utf-8"))
+            self.process.stdin.flush()
+        except (OSError, AttributeError) as e:
+            raise SessionError(f"Shell session for {self.serial} closed: {e}") from e
+
+    def run(self, command: str) -> None:
+        """
+        Start a command. Its output goes to `on_output` and its exit code to `on_done`.
+
+        Args:
+            command (str): The shell command line.
+        """
+        with self.lock:
+            if self.end_marker is not None:
+                raise SessionError("A command is already running.")
+            self.end_marker = f"__UNBLOAT_END_{os.urandom(8).hex()}__"
+            self.pending_streams = {"stdout", "stderr"}
+            marker = self.end_marker
+        try:
+            self.send(f"{{ {command}\n}} </dev/null; echo \"{marker} $? $PWD\"; echo {marker} >&2")
+        except SessionError:
+            with self.lock:
+                self.end_marker = None
+            raise
+
+    def _read(self, process: subprocess.Popen, name: str, stream) -> None:
+        """Forward one output stream in chunks, cutting it at the end marker of the running command."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        while True:
+            try:
+                data = os.read(stream.fileno(), 65536)
+            except OSError:
+                data = b""
+            buffer += decoder.decode(data, final=not data)
+            buffer = self._scan(name, buffer, final=not data)
+            if not data:
+                break
+        with self.lock:
+            if process is not self.process or self.end_marker is None:
+                return
+            self.end_marker = None
+        self.on_done(-1)
+
+    def _scan(self, name: str, buffer: str, final: bool) -> str:
+        """
+        Forward the text of a stream up to the end marker and finish the command once both streams reached it.
+
+        Returns:
+            str: The text held back because it may be the start of a marker.
+        """
+        while buffer:
+            with self.lock:
+                marker = self.end_marker if name in self.pending_streams else None
+            index = buffer.find(marker) if marker else -1
+            if index == -1:
+                hold = 0
+                if marker and not final:
+                    hold = next((size for size in range(min(len(marker) - 1, len(buffer)), 0, -1)
+                                 if marker.startswith(buffer[-size:])), 0)
+                if len(buffer) > hold:
+                    self.on_output(name, buffer[:len(buffer) - hold])
+                return buffer[len(buffer) - hold:]
+            newline = buffer.find("\n", index)
+            if newline == -1 and not final:
+                if index:
+                    self.on_output(name, buffer[:index])
+                return buffer[index:]
+            if index:
+                self.on_output(name, buffer[:index])
+            status = buffer[index + len(marker):newline if newline != -1 else len(buffer)].split(None, 1)
+            buffer = buffer[newline + 1:] if newline != -1 else ""
+            with self.lock:
+                if name == "stdout" and status:
+                    self.returncode = int(status[0]) if status[0].lstrip("-").isdigit() else 0
+                    self.cwd = status[1].strip() if len(status) > 1 else self.cwd
+                self.pending_streams.discard(name)
+                finished = not self.pending_streams and self.end_marker == marker
+                if finished:
+                    self.end_marker = None
+                returncode = self.returncode
+            if finished:
+                self.on_done(returncode)
+        return buffer
+
+    def close(self) -> None:
+        """Terminate the shell. A running command is reported as finished with -1."""
+        process, self.process = self.process, None
+        with self.lock:
+            busy, self.end_marker = self.end_marker is not None, None
+        if process is not None and process.poll() is None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            process.terminate()
+        if busy:
+            self.on_done(-1)
@@ -1,13 +1,15 @@
-import re
-import threading
-import subprocess
 import tkinter as tk
+import threading
 from pathlib import Path
 from gui import GUI, DefaultPackageManager
-from tkinter import ttk, filedialog, messagebox
+from debloater_engine import DebloaterEngine
+from device_watcher import DeviceWatcher
+from fleet import run_on_fleet, summarize
+from path_list import read_path_list, format_bytes
+from task_scheduler import TaskHandle, TaskScheduler, PRIORITY_BACKGROUND, PRIORITY_BULK
 
 
-class AndroidDebloater(GUI, DefaultPackageManager):
+class AndroidDebloater(GUI, DefaultPackageManager, DebloaterEngine):
     """A GUI application to debloat Android devices using ADB."""
 
     def __init__(self, root: tk.Tk, title: str):
@@ -24,47 +26,39 @@ class AndroidDebloater(GUI, DefaultPackageManager):
         self.device_info: dict = {}
 
         super().__init__(root, title)
-        self.adb_path: Path = Path("assets/adb/adb.exe")
-        self.package_command = lambda: self.debloat_selected(self.package_tree_holder)
-
-    def execute(self, command: str, print_log: bool = True) -> subprocess.CompletedProcess | None:
-        """
-        Execute the given adb command.
-
-        Args:
-            command (str): The adb command to execute.
-            print_log (bool): Whether to print the command log. Defaults to True.
-
-        Returns:
-            subprocess.CompletedProcess | None: The result of the command execution.
-        """
-        command_list = [self.adb_path] + command.split()
-        try:
-            return subprocess.run(
-                command_list,
-                check=True,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-        except subprocess.CalledProcessError as e:
-            if print_log:
-                self.log_message(f"Error: {e.stderr}")
-            return None
+        DebloaterEngine.__init__(self, Path("assets/adb/adb.exe"))
+        self.callback_queue = self.ui_queue
+        self.warned_unauthorized: set[str] = set()
+        self.device_watcher: DeviceWatcher = DeviceWatcher(self.adb_client, self._on_devices_changed, self.list_devices)
+        self.package_command = self.debloat_selected_presets
+        self.scheduler: TaskScheduler = TaskScheduler(on_error=self._on_task_error)
+
+    def _on_task_error(self, handle: TaskHandle, error: Exception) -> None:
+        """Log an exception that escaped a scheduled task."""
+        self.log_message(f"Task {handle.key or handle.function.__name__} failed: {error}")
+
+    def cancel_tasks(self) -> None:
+        """Cancel the queued tasks and ask the running ones to stop."""
+        count = self.scheduler.cancel_all()
+        self.log_message(f"Cancelled {count} task(s)." if count else "No tasks to cancel.")
+
+    def on_close(self) -> None:
+        """Cancel the scheduled tasks, then close the window."""
+        self.scheduler.shutdown()
+        self.close_async_adb()
+        super().on_close()
 
     def start_adb(self) -> None:
         """Start the adb server."""
-        threading.Thread(target=self._start_adb_thread).start()
+        self.scheduler.submit(self._start_adb_thread, key="start-adb", lane="adb-server")
 
     def _start_adb_thread(self) -> None:
         """Start the adb server in a separate thread."""
         try:
-            self.log_message("ADB server is starting...")
-            self.execute("start-server")
+            self.ensure_server()
             self.adb_active = True
-            self.log_message("ADB server started.")
             self.get_device_name()
+            self.device_watcher.start()
         except Exception as e:
             self.log_message(f"Failed to start ADB: {e}")
 
@@ -72,63 +66,54 @@ class AndroidDebloater(GUI, DefaultPackageManager):
         """Stop the adb server."""
         try:
             if self.adb_active:
-                self.execute("kill-server")
+                self.device_watcher.stop()
+                self.shutdown_server()
                 self.adb_active = False
                 self.log_message("ADB server stopped.")
         except Exception as e:
             self.log_message(f"Failed to stop ADB: {e}")
 
-    def get_device_model(self, device: str) -> str:
-        """
-        Get the model name of the connected device.
-
-        Args:
-            device (str): The device ID.
-
-        Returns:
-            str: The model name of the device.
-        """
-        try:
-            result = self.execute(f"-s {device} shell getprop ro.product.model")
-            if result and result.returncode == 0:
-                return result.stdout.strip()
-            return "unknown"
-        except Exception as e:
-            self.log_message(f"Failed to get model for device {device}: {e}")
-            return "unknown"
-
     def get_device_name(self) -> None:
         """Fetch the list of connected devices."""
         if not self.adb_active:
             self.log_message("ADB is not active. Start ADB first.")
             return
 
-        threading.Thread(target=self._get_device_name_thread).start()
+        self.scheduler.submit(self._get_device_name_thread, key="devices", lane="adb-server")
 
     def _get_device_name_thread(self) -> None:
         """Fetch the list of connected devices in a separate thread."""
         try:
-            result = self.execute("devices")
-            if not result:
-                return
+            self._on_devices_changed(self.list_devices())
+        except Exception as e:
+            self.log_message(f"Failed to get device names: {e}")
 
-            devices_output = result.stdout.strip()
-            device_lines = devices_output.splitlines()[1:]
-            device_names = []
+    def _on_devices_changed(self, devices: list[dict]) -> None:
+        """
+        Refresh the device dropdown from a device list. Called from worker threads.
 
-            for line in device_lines:
-                device_id, status = line.split()
-                if status == "unauthorized":
-                    self.show_permission_warning(device_id)
-                    return
-                model = self.get_device_model(device_id)
-                device_names.append(f"{model} - {device_id}")
+        Args:
+            devices (list[dict]): The devices from `list_devices` or the device watcher.
+        """
+        for device in devices:
+            if device["state"] == "unauthorized" and device["serial"] not in self.warned_unauthorized:
+                self.warned_unauthorized.add(device["serial"])
+                self.run_on_ui(self.show_permission_warning, device["serial"])
+        models = self.resolve_device_models(devices)
+        device_names = [f"{model} - {serial}" for serial, model in models.items()]
+        self.run_on_ui(self._update_device_dropdown, device_names)
+
+    def _update_device_dropdown(self, device_names: list[str]) -> None:
+        """
+        Show the given devices in the dropdown, keeping the current selection if it is still connected.
 
-            self.device_dropdown["values"] = device_names
-            if device_names:
-                self.device_var.set(device_names[0])
-        except Exception as e:
-            self.log_message(f"Failed to get device names: {e}")
+        Args:
+            device_names (list[str]): The "<model> - <serial>" entries.
+        """
+        self.device_dropdown["values"] = device_names
+        if self.device_var.get() in device_names:
+            return
+        self.device_var.set(device_names[0] if device_names else "")
 
     def get_selected_device_id(self) -> tuple[str, str] | None:
         """
@@ -145,38 +130,98 @@ class AndroidDebloater(GUI, DefaultPackageManager):
         return None
 
     def fetch_apps(self) -> None:
-        """Fetch the list of installed applications on the selected device."""
-        threading.Thread(target=self._fetch_apps_thread).start()
+        """
+        Fetch the installed applications of the selected device, or of every device in fleet mode.
+
+        Repeated clicks coalesce.
+        """
+        if self.fleet_mode:
+            self.scheduler.submit(self._fleet_fetch_thread, key="fleet-fetch", lane="adb-server")
+            return
+        device_info = self.get_selected_device_id()
+        if device_info:
+            self.scheduler.submit(self._fetch_apps_thread, *device_info, key=f"fetch:{device_info[0]}", lane=device_info[0])
+
+    def _fetch_apps_thread(self, device: str, model: str) -> None:
+        """
+        Fetch the list of installed applications in a separate thread.
 
-    def _fetch_apps_thread(self) -> None:
-        """Fetch the list of installed applications in a separate thread."""
+        Args:
+            device (str): The device ID, read from the selection when the task was submitted.
+            model (str): The model name of the device.
+        """
         try:
-            device_info = self.get_selected_device_id()
-            if not device_info:
-                return
-            device, model = device_info
             self.log_message(f"Fetching installed applications from {model} - {device}...")
 
-            result_all = self.execute(f"-s {device} shell pm list packages")
-            result_disabled = self.execute(f"-s {device} shell pm list packages -d")
-            result_system = self.execute(f"-s {device} shell pm list packages -s")
+            apps, changed = self.fetch_inventory(device)
+            if self.device_var.get().rsplit(" - ", 1)[-1] != device:
+                self.log_message(f"Discarded the applications of {device}: another device is selected.")
+                return
+            self.app_list = apps
+            source = f"refreshed: {', '.join(changed)}" if changed else "unchanged, from cache"
+            self.log_message(f"Loaded {len(self.app_list)} applications for {model} - {device} ({source}).")
+            self.run_on_ui(self.update_app_tree)
+            installed = [app["package"] for app in self.app_list]
+            self.run_on_ui(self.update_preset_matches, device, installed, self.removed_packages(device))
+            unfinished = self.unfinished_jobs(device)
+            if unfinished:
+                self.log_message(f"{len(unfinished)} interrupted job(s) on {device}; resume them from Option > Jobs...")
+        except Exception as e:
+            self.log_message(f"Error fetching applications: {e}")
+            return
+        self.scheduler.submit(self._enrich_apps, device, key=f"metadata:{device}", lane=device, priority=PRIORITY_BACKGROUND)
+
+    def _fleet_fetch_thread(self) -> None:
+        """Refresh the application list of every connected device, one task per device lane."""
+        try:
+            devices = self.ready_devices()
+        except Exception as e:
+            self.log_message(f"Failed to list devices: {e}")
+            return
+        if not devices:
+            self.log_message("No authorized devices connected.")
+            return
+        self.log_message(f"Fleet fetch on {len(devices)} device(s)...")
+        selected = self.device_var.get().rsplit(" - ", 1)[-1]
+        for device in devices:
+            if device == selected:
+                self.scheduler.submit(self._fetch_apps_thread, device, self.device_models.get(device, "unknown"),
+                                      key=f"fetch:{device}", lane=device)
+            else:
+                self.scheduler.submit(self._fetch_inventory_thread, device, key=f"fetch:{device}", lane=device)
+
+    def _fetch_inventory_thread(self, device: str) -> None:
+        """
+        Refresh the cached application list of a device that is not shown.
+
+        Args:
+            device (str): The device ID.
+        """
+        try:
+            apps, changed = self.fetch_inventory(device)
+        except Exception as e:
+            self.log_message(f"Error fetching applications from {device}: {e}")
+            return
+        source = f"refreshed: {', '.join(changed)}" if changed else "unchanged, from cache"
+        self.log_message(f"Loaded {len(apps)} applications for {device} ({source}).")
 
-            if not result_all or not result_disabled or not result_system:
-                raise Exception("Error fetching package lists.")
+    def _enrich_apps(self, device: str) -> None:
+        """
+        Add version, installer, install times and sizes to the shown applications.
 
-            all_apps = [line.replace("package:", "").strip() for line in result_all.stdout.splitlines() if line.strip()]
-            disabled_apps = {line.replace("package:", "").strip() for line in result_disabled.stdout.splitlines() if line.strip()}
-            system_apps = {line.replace("package:", "").strip() for line in result_system.stdout.splitlines() if line.strip()}
+        Runs after the list is displayed, so the metadata columns fill in later.
 
-            self.app_list = [
-                {"package": app, "status": "Disabled" if app in disabled_apps else "Active",
-                 "type": "System" if app in system_apps else "User"}
-                for app in all_apps
-            ]
-            self.log_message(f"Loaded {len(self.app_list)} applications for {model} - {device}.")
-            self.update_app_tree()
+        Args:
+            device (str): The device ID.
+        """
+        try:
+            metadata = self.fetch_package_metadata(device)
         except Exception as e:
-            self.log_message(f"Error fetching applications: {e}")
+            self.log_message(f"Error fetching package details: {e}")
+            return
+        self.app_list = [dict(app, **metadata.get(app["package"], {})) for app in self.app_list]
+        self.log_message(f"Loaded details of {len(metadata)} packages.")
+        self.run_on_ui(self.update_app_tree)
 
     def load_applications(self) -> None:
         """Load the list of applications from the device."""
@@ -187,67 +232,209 @@ class AndroidDebloater(GUI, DefaultPackageManager):
 
     def debloat(self, apps: list[str]) -> None:
         """
-        Uninstall the selected applications from the device.
+        Uninstall the selected applications from the device, or from every device in fleet mode.
 
         Args:
             apps (list[str]): The list of application package names to uninstall.
         """
-        threading.Thread(target=self._debloat_thread, args=(apps,)).start()
+        if self.fleet_mode:
+            self.fleet_debloat(apps)
+            return
+        device_info = self.get_selected_device_id()
+        if device_info:
+            self.scheduler.submit(self._debloat_thread, apps, device_info[0], lane=device_info[0], priority=PRIORITY_BULK)
 
-    def _debloat_thread(self, apps: list[str]) -> None:
-        """Uninstall the selected applications in a separate thread."""
-        for app in apps:
-            try:
+    def _debloat_thread(self, apps: list[str], device: str | None = None) -> dict[str, tuple[int, str]]:
+        """
+        Uninstall applications in a separate thread as one batched, journaled script.
+
+        The shown application list only changes if the device is still the selected one.
+
+        Args:
+            apps (list[str]): The package names to uninstall.
+            device (str | None): The device ID. Defaults to the selected device.
+
+        Returns:
+            dict[str, tuple[int, str]]: The exit code and message per package, or {"error": message}.
+        """
+        try:
+            if device is None:
                 device_info = self.get_selected_device_id()
                 if not device_info:
-                    return
+                    return {}
                 device, _ = device_info
-                self.log_message(f"Debloating {app}...")
-                result = self.execute(f"-s {device} shell pm uninstall -k --user 0 {app}")
-                if result and result.returncode == 0:
-                    self.log_message(f"Successfully debloated: {app}")
-                    self.app_list = [
-                        item for item in self.app_list if item["package"] != app
-                    ]
-                else:
-                    raise Exception(result.stderr if result else "Unknown error")
-            except Exception as e:
-                self.log_message(f"Failed to debloat {app}: {e}\nDid you connect the device?")
-        self.update_app_tree()
-
-    def debloat_selected(self, package_tree: ttk.Treeview = None) -> None:
-        """
-        Uninstall the selected applications from the tree view.
+            results = self.run_job(self.start_job(device, "uninstall", apps))
+        except Exception as e:
+            self.log_message(f"Failed to debloat on {device}: {e}\nDid you connect the device?")
+            return {"error": str(e)}
+        if self.device_var.get().rsplit(" - ", 1)[-1] == device:
+            removed = {app for app, (code, _) in results.items() if code == 0}
+            self._drop_from_app_list(removed)
+            self.run_on_ui(self.mark_presets_removed, device, removed)
+            self.run_on_ui(self.update_app_tree)
+        return results
+
+    def _drop_from_app_list(self, packages: set[str]) -> None:
+        """
+        Remove packages from the in-memory application list in one pass.
+
+        Args:
+            packages (set[str]): The package names to remove.
+        """
+        if not packages:
+            return
+        apps_by_package = {item["package"]: item for item in self.app_list}
+        for package in packages:
+            apps_by_package.pop(package, None)
+        self.app_list = list(apps_by_package.values())
+
+    def fleet_debloat(self, apps: list[str]) -> None:
+        """
+        Uninstall applications from every connected device concurrently.
 
         Args:
-            package_tree (ttk.Treeview, optional): The tree view containing the application packages.
+            apps (list[str]): The list of application package names to uninstall.
         """
-        selected_items = package_tree.selection() if package_tree else self.app_tree.selection()
+        if not self.adb_active:
+            self.log_message("ADB is not active. Start ADB first.")
+            return
+        self.scheduler.submit(self._fleet_debloat_thread, apps, lane="adb-server", priority=PRIORITY_BULK)
+
+    def _fleet_debloat_thread(self, apps: list[str]) -> None:
+        """
+        Uninstall applications from every connected device, one journaled task per device lane.
+
+        The summary is logged once every device task ended, including ones cancelled
+        before they ran, which are reported as errors.
+
+        Args:
+            apps (list[str]): The package names to uninstall.
+        """
+        try:
+            devices = self.ready_devices()
+        except Exception as e:
+            self.log_message(f"Failed to list devices: {e}")
+            return
+        if not devices:
+            self.log_message("No authorized devices connected.")
+            return
+        self.log_message(f"Fleet debloat of {len(apps)} application(s) on {len(devices)} device(s)...")
+        results = {}
+        pending = set(devices)
+        lock = threading.Lock()
+
+        def debloat_device(device: str) -> None:
+            statuses = self._debloat_thread(apps, device)
+            with lock:
+                results[device] = statuses
+
+        def device_done(handle: TaskHandle) -> None:
+            device = handle.args[0]
+            with lock:
+                results.setdefault(device, {"error": "Cancelled" if handle.cancelled else "Failed"})
+                pending.discard(device)
+                if pending:
+                    return
+            for line in summarize(results):
+                self.log_message(line)
+
+        for device in devices:
+            self.scheduler.submit(debloat_device, device, lane=device, priority=PRIORITY_BULK).add_done_callback(device_done)
+
+    def debloat_selected(self) -> None:
+        """Uninstall the applications selected in the application list."""
+        selected_items = self.app_tree.selection()
         if not selected_items:
             self.log_message("No application selected for debloating.")
             return
+        item_packages = {item: package for package, item in self.app_tree_items.items()}
+        self.debloat([item_packages[item] for item in selected_items if item in item_packages])
 
-        selected_apps = [
-            package_tree.item(item, "values")[1] if package_tree else self.app_tree.item(item, "values")[0]
-            for item in selected_items
-        ]
+    def debloat_selected_presets(self) -> None:
+        """Uninstall the packages selected in the package manager."""
+        selected_apps = self.package_manager.selected_packages() if self.package_manager else []
+        if not selected_apps:
+            self.log_message("No application selected for debloating.")
+            return
+        if not self.fleet_mode:
+            selected_apps = self._installed_presets(selected_apps)
+            if not selected_apps:
+                return
         self.debloat(selected_apps)
 
+    def _installed_presets(self, packages: list[str]) -> list[str]:
+        """
+        Keep the preset packages that are installed on the selected device.
+
+        Without a loaded inventory of that device every package is kept.
+
+        Args:
+            packages (list[str]): The selected preset packages.
+
+        Returns:
+            list[str]: The packages to uninstall.
+        """
+        index = self.get_preset_index()
+        device_info = self.get_selected_device_id()
+        if not device_info or index.device != device_info[0]:
+            return packages
+        installed, skipped = index.installed_members(packages)
+        if skipped:
+            self.log_message(f"Skipping {len(skipped)} package(s) not installed on the device.")
+        if not installed:
+            self.log_message("None of the selected packages is installed on the device.")
+        return installed
+
     def remove_apps_from_path(self) -> None:
-        """Remove applications from paths listed in a text file."""
+        """Remove applications from paths listed in a text file, on every rooted device in fleet mode."""
         if not self.adb_active:
             self.log_message("ADB is not active. Start ADB first.")
             return
 
-        if not self._check_root_access():
+        if self.fleet_mode:
+            # Root is checked per device once the path list is chosen.
+            self.scheduler.submit(self._select_and_process_file, key="path-file")
+            return
+        device_info = self.get_selected_device_id()
+        if not device_info:
+            return
+        device = device_info[0]
+        if self.adb_backend == "async":
+            # Check root on the event loop; the result comes back through the UI queue.
+            self.shell_async(device, "su -c echo rooted", self._on_root_checked)
+        else:
+            self.scheduler.submit(self._check_root_thread, device, key=f"root:{device}", lane=device)
+
+    def _check_root_thread(self, device: str) -> None:
+        """
+        Check root through the selected backend, then continue removing paths.
+
+        Args:
+            device (str): The device ID.
+        """
+        if not self.check_root(device):
+            self.log_message("Root Access Required")
+            return
+        self.scheduler.submit(self._select_and_process_file, key="path-file")
+
+    def _on_root_checked(self, result) -> None:
+        """
+        Continue removing paths once the asynchronous root check answered. Runs on the GUI thread.
+
+        Args:
+            result (subprocess.CompletedProcess | Exception): The outcome of the `su` check.
+        """
+        if isinstance(result, Exception) or result.returncode != 0 or "rooted" not in result.stdout:
             self.log_message("Root Access Required")
             return
 
         # Run the file dialog in a separate thread to avoid freezing the GUI
-        threading.Thread(target=self._select_and_process_file).start()
+        self.scheduler.submit(self._select_and_process_file, key="path-file")
 
     def _select_and_process_file(self) -> None:
-        """Open a file dialog to select a text file and process it in a separate thread."""
+        """Select a path list, check it on the device(s) and remove the existing paths after confirmation."""
+        from tkinter import filedialog, messagebox
+
         exe_directory = Path(__file__).parent.resolve()
         initial_directory = exe_directory / 'assets'
         txt_file_path = filedialog.askopenfilename(
@@ -259,9 +446,57 @@ class AndroidDebloater(GUI, DefaultPackageManager):
         if not txt_file_path:
             self.log_message("No file selected!")
             return
-        
+
+        try:
+            paths = read_path_list(Path(txt_file_path))
+            if not paths:
+                self.log_message("The selected file lists no paths.")
+                return
+            if self.fleet_mode:
+                devices = self.ready_devices()
+            else:
+                devices = [self.get_selected_device_id()[0]]
+        except Exception as e:
+            self.log_message(f"An error occurred: {e}")
+            return
+
+        def preflight_task(device: str) -> dict:
+            if self.fleet_mode and not self.check_root(device):
+                raise Exception("Root access required")
+            preflight, total = self.preflight_paths(device, paths)
+            return {"paths": preflight, "total": total}
+
+        existing = {}
+        matches = size = 0
+        for device, checked in run_on_fleet(devices, preflight_task).items():
+            if "error" in checked:
+                self.log_message(f"Skipping {device}: {checked['error']}")
+                continue
+            preflight = checked["paths"]
+            for path, (count, _) in preflight.items():
+                if not count:
+                    self.log_message(f"{path} already does not exist on {device}.")
+            found = [path for path, (count, _) in preflight.items() if count]
+            if found:
+                existing[device] = found
+                matches += sum(preflight[path][0] for path in found)
+                size += checked["total"]
+                self.log_message(f"{len(found)} of {len(paths)} path(s) exist on {device}.")
+        if not existing:
+            self.log_message("None of the listed paths exist on the device." if len(devices) == 1
+                             else "None of the listed paths exist on any device.")
+            return
+        size = format_bytes(size)
+        self.log_message(f"{matches} item(s), {size} on {len(existing)} device(s).")
+
+        if len(devices) == 1:
+            found = next(iter(existing.values()))
+            summary = f"{len(found)} of {len(paths)} listed path(s) exist"
+        else:
+            summary = f"Listed paths exist on {len(existing)} of {len(devices)} device(s)"
         confirm = messagebox.askyesno(
             "Confirm Removal",
+            f"{summary} ({matches} item(s), about {size} to be freed).\n"
             "Removing files can damage your device. Do you want to proceed?"
         )
 
@@ -269,54 +504,60 @@ class AndroidDebloater(GUI, DefaultPackageManager):
             self.log_message("File removal canceled by user.")
             return
 
-        threading.Thread(target=self._remove_apps_in_thread, args=(txt_file_path,)).start()
+        for device, found in existing.items():
+            self.scheduler.submit(self._remove_apps_in_thread, found, device, lane=device, priority=PRIORITY_BULK)
+
+    def _remove_apps_in_thread(self, paths: list[str], device: str | None = None) -> None:
+        """
+        Remove paths from a device in a separate thread.
 
-    def _remove_apps_in_thread(self, txt_file_path: str) -> None:
-        """Remove applications from paths listed in a text file in a separate thread."""
+        Args:
+            paths (list[str]): The paths or glob patterns that passed the preflight.
+            device (str | None): The device ID. Defaults to the selected device.
+        """
         try:
-            serial_number, device_model = self.get_selected_device_id()
-
-            with open(txt_file_path, "r") as file:
-                lines = file.readlines()
-            
-            if not lines:
-                self.log_message("The selected file is empty.")
-                return                
-
-            if any("/system" in line for line in lines):
-                self.execute(f"-s {serial_number} shell su -c mount -o rw,remount /system")
-                self.log_message("System mounted as READ/WRITE")
-
-            pattern = re.compile(r"/[^ ]+")
-
-            for line in lines:
-                matches = pattern.findall(line)
-                for match in matches:
-                    app_path = match
-                    rm_command = f"-s {serial_number} shell rm -r {app_path}"
-                    result = self.execute(rm_command, print_log=False)
-                    try:
-                        if result.returncode == 0:
-                            self.log_message(f"Successfully removed: {app_path}")
-                        else:
-                            self.log_message(f"Failed to remove: {app_path}. Error: {result.stderr}")
-                    except AttributeError:
-                        self.log_message(f"{app_path} already does not exist on {device_model} ({serial_number}).")
-            self.log_message("DONE!")
+            if device is None:
+                device, _ = self.get_selected_device_id()
+            self.run_job(self.start_job(device, "remove-paths", paths))
+            self.log_message(f"DONE on {device}!")
         except Exception as e:
-            self.log_message(f"An error occurred: {e}")
+            self.log_message(f"An error occurred on {device}: {e}")
+
+    def resume_job(self, job: str) -> None:
+        """
+        Resume an interrupted job in a separate thread.
 
-    def _check_root_access(self) -> bool:
-        """Check if the device has root access."""
-        serial_number, _ = self.get_selected_device_id()
-        command = f"-s {serial_number} shell su -c echo rooted"
-        result = self.execute(command)
+        Args:
+            job (str): The job ID.
+        """
+        self._submit_job_action(self.run_job, job)
+
+    def restore_removed(self, job: str) -> None:
+        """
+        Reinstall the packages removed by a job in a separate thread.
+
+        Args:
+            job (str): The job ID.
+        """
+        self._submit_job_action(self.restore_job, job)
+
+    def _submit_job_action(self, action: callable, job: str) -> None:
+        """Schedule an action on a job in the lane of its device."""
+        state = self.job_journal.load(job)
+        lane = state["device"] if state else None
+        self.scheduler.submit(self._job_thread, action, job, key=f"job:{job}", lane=lane, priority=PRIORITY_BULK)
+
+    def _job_thread(self, action: callable, job: str) -> None:
+        """Run a job action, then reload the application list if it changed the selected device."""
         try:
-            if result and "rooted" in result.stdout:
-                return True
-        except AttributeError:
-            return False
-        return False
+            action(job)
+        except Exception as e:
+            self.log_message(f"Job {job} failed: {e}")
+            return
+        state = self.job_journal.load(job)
+        device_info = self.get_selected_device_id() if self.device_var.get() else None
+        if state and state["kind"] == "uninstall" and device_info and device_info[0] == state["device"]:
+            self._fetch_apps_thread(*device_info)
 
 
 if __name__ == '__main__':
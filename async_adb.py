@@ -0,0 +1,295 @@
+import sys
+import queue
+import struct
+import asyncio
+import threading
+import concurrent.futures
+import subprocess
+from pathlib import Path
+from typing import Callable, Coroutine
+from adb_client import ADB_HOST, ADB_PORT, SHELL_STDOUT, SHELL_STDERR, SHELL_EXIT, AdbError, AdbStreamError, split_lines
+from adb_session import CREATE_NO_WINDOW, SESSION_TIMEOUT
+
+ASYNC_MAX_CONCURRENCY: int = 256
+ASYNC_MAX_PER_DEVICE: int = 8
+
+
+class AsyncAdb:
+    """
+    Device I/O on one background asyncio event loop.
+
+    Shell commands talk to the adb server over asyncio streams (shell v2 protocol)
+    and fall back to `asyncio.create_subprocess_exec` of the adb binary when the
+    server cannot be reached. A global semaphore and one semaphore per device bound
+    the commands in flight, so hundreds of concurrent commands cost one thread.
+    Like the session pool, `timeout` bounds each read (from the server or a spawned
+    adb), not the whole command, so a long batch runs as long as it makes progress.
+    """
+
+    def __init__(self, adb_path: Path, max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 max_per_device: int = ASYNC_MAX_PER_DEVICE, callback_queue: queue.Queue | None = None,
+                 host: str = ADB_HOST, port: int | None = ADB_PORT,
+                 timeout: float | None = SESSION_TIMEOUT):
+        """
+        Initialize the backend; the event loop starts on first use.
+
+        Args:
+            adb_path (Path): The adb executable used when the server socket is unreachable.
+            max_concurrency (int): The upper bound of commands in flight.
+            max_per_device (int): The upper bound of commands in flight per device.
+            callback_queue (queue.Queue | None): Where `submit` puts `(callback, (result,))`, e.g. the
+                Tk UI queue. Without it callbacks run on the event loop thread.
+            host (str): The address of the adb server.
+            port (int | None): The port of the adb server, or None to always run the adb binary.
+            timeout (float | None): Seconds to wait on connect and for each read of output.
+        """
+        self.adb_path = adb_path
+        self.max_concurrency = max_concurrency
+        self.max_per_device = max_per_device
+        self.callback_queue = callback_queue
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.limit: asyncio.Semaphore | None = None
+        self.device_limits: dict[str, asyncio.Semaphore] = {}
+        self.lock = threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the event loop thread if it is not running and return the loop."""
+        with self.lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                if sys.platform != "win32" and sys.version_info < (3, 12) and hasattr(asyncio, "PidfdChildWatcher"):
+                    # The default watcher before 3.12 waits for every child in its own thread.
+                    try:
+                        watcher = asyncio.PidfdChildWatcher()
+                        watcher.attach_loop(loop)
+                        asyncio.set_child_watcher(watcher)
+                    except OSError:
+                        pass
+                self.limit = asyncio.Semaphore(self.max_concurrency)
+                self.device_limits = {}
+                self.thread = threading.Thread(target=loop.run_forever, name="adb-asyncio", daemon=True)
+                self.thread.start()
+                self.loop = loop
+            return self.loop
+
+    def close(self) -> None:
+        """
+        Stop the event loop thread.
+
+        The commands in flight are cancelled first, so their adb processes are
+        killed and their server connections closed before the loop stops.
+        """
+        with self.lock:
+            loop, thread = self.loop, self.thread
+            self.loop = self.thread = None
+        if loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._cancel_tasks(), loop).result(timeout=5)
+            except concurrent.futures.TimeoutError:
+                pass
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+    @staticmethod
+    async def _cancel_tasks() -> None:
+        """Cancel every other task on the loop and wait until their cleanup ran."""
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self, coroutine: Coroutine, timeout: float | None = None):
+        """
+        Run a coroutine on the event loop and wait for its result. Must not be called from the loop thread.
+
+        Args:
+            coroutine (Coroutine): The coroutine, e.g. `shell(serial, command)`.
+            timeout (float | None): Seconds to wait; on expiry the coroutine is cancelled and
+                TimeoutError is raised.
+
+        Returns:
+            The result of the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.start())
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"No result after {timeout} seconds.") from None
+
+    def submit(self, coroutine: Coroutine, callback: Callable | None = None):
+        """
+        Schedule a coroutine without waiting.
+
+        Args:
+            coroutine (Coroutine): The coroutine.
+            callback (Callable | None): Called with the result, or with the exception if it raised,
+                through `callback_queue` when one is set.
+
+        Returns:
+            concurrent.futures.Future: The future of the result.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.start())
+        if callback is not None:
+            def done(finished) -> None:
+                result = finished.exception() or finished.result()
+                if self.callback_queue is not None:
+                    self.callback_queue.put((callback, (result,)))
+                else:
+                    callback(result)
+
+            future.add_done_callback(done)
+        return future
+
+    def _device_limit(self, serial: str) -> asyncio.Semaphore:
+        """Return the semaphore of a device. Runs on the loop thread."""
+        limit = self.device_limits.get(serial)
+        if limit is None:
+            limit = self.device_limits[serial] = asyncio.Semaphore(self.max_per_device)
+        return limit
+
+    async def shell(self, serial: str, command: str,
+                    on_line: Callable[[str], None] | None = None) -> subprocess.CompletedProcess:
+        """
+        Run a shell command on a device within the concurrency limits.
+
+        The adb binary only runs when the server cannot be reached. A command that
+        may already have run on the device (its stream broke off, or it stayed
+        silent for `timeout`) raises AdbStreamError instead of being run a second time.
+
+        Args:
+            serial (str): The serial number of the device.
+            command (str): The shell command line.
+            on_line (Callable[[str], None] | None): Called on the event loop thread with each stdout
+                line as it arrives, instead of collecting stdout in the result.
+
+        Returns:
+            subprocess.CompletedProcess: The result of the command.
+        """
+        async with self.limit, self._device_limit(serial):
+            if self.port is not None:
+                try:
+                    return await self._socket_shell(serial, command, on_line)
+                except AdbStreamError:
+                    raise
+                except (AdbError, OSError):
+                    pass
+            return await self._spawn(["-s", serial, "shell", command], on_line)
+
+    async def execute(self, args: list[str]) -> subprocess.CompletedProcess:
+        """
+        Run the adb binary with arguments, within the global limit.
+
+        Args:
+            args (list[str]): The adb arguments, e.g. `["devices", "-l"]`.
+
+        Returns:
+            subprocess.CompletedProcess: The result of the command.
+        """
+        async with self.limit:
+            return await self._spawn(args)
+
+    async def _spawn(self, args: list[str], on_line: Callable[[str], None] | None = None) -> subprocess.CompletedProcess:
+        """
+        Run the adb binary without a thread per process, passing stdout lines to `on_line` if given.
+
+        Raises AdbStreamError if stdout stays silent for `timeout`.
+        """
+        process = await asyncio.create_subprocess_exec(
+            str(self.adb_path), *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            creationflags=CREATE_NO_WINDOW
+        )
+        stdout, errors = bytearray(), asyncio.ensure_future(process.stderr.read())
+        try:
+            while True:
+                read = process.stdout.readline() if on_line is not None else process.stdout.read(65536)
+                try:
+                    data = await asyncio.wait_for(read, self.timeout)
+                except asyncio.TimeoutError as e:
+                    raise AdbStreamError(f"adb {' '.join(args[:3])} printed nothing for {self.timeout} seconds.") from e
+                if not data:
+                    break
+                if on_line is not None:
+                    on_line(data.decode("utf-8", errors="replace"))
+                else:
+                    stdout.extend(data)
+            stderr = await errors
+            await process.wait()
+        finally:
+            # Timed out, cancelled or stopped by `on_line`: do not leave adb running.
+            if process.returncode is None:
+                process.kill()
+                errors.cancel()
+                await process.wait()
+        return subprocess.CompletedProcess(
+            [str(self.adb_path), *args], process.returncode,
+            stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace")
+        )
+
+    async def _read_exact(self, reader: asyncio.StreamReader, size: int) -> bytes:
+        """Read exactly `size` bytes from the adb server within the timeout."""
+        try:
+            return await asyncio.wait_for(reader.readexactly(size), self.timeout)
+        except asyncio.IncompleteReadError as e:
+            raise AdbError("Connection closed by adb server.") from e
+        except asyncio.TimeoutError as e:
+            raise AdbError(f"No data from adb server for {self.timeout} seconds.") from e
+        except OSError as e:
+            raise AdbError(f"Connection to adb server failed: {e}") from e
+
+    async def _request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, service: str) -> None:
+        """Send a smart-socket service request and check the OKAY/FAIL status."""
+        payload = service.encode("utf-8")
+        writer.write(b"%04x" % len(payload) + payload)
+        await writer.drain()
+        status = await self._read_exact(reader, 4)
+        if status == b"FAIL":
+            length = int(await self._read_exact(reader, 4), 16)
+            raise AdbError((await self._read_exact(reader, length)).decode("utf-8", errors="replace"))
+        if status != b"OKAY":
+            raise AdbError(f"Unexpected adb server response: {status!r}")
+
+    async def _socket_shell(self, serial: str, command: str,
+                            on_line: Callable[[str], None] | None = None) -> subprocess.CompletedProcess:
+        """
+        Run a shell command through the adb server with the shell v2 protocol.
+
+        A stream that closes or stalls before the exit packet raises AdbStreamError.
+        """
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise AdbError(f"Cannot connect to adb server at {self.host}:{self.port}: {e}") from e
+        stdout, stderr = bytearray(), bytearray()
+        returncode = None
+        try:
+            await self._request(reader, writer, f"host:transport:{serial}")
+            await self._request(reader, writer, f"shell,v2,raw:{command}")
+            while returncode is None:
+                try:
+                    packet_id, length = struct.unpack("<BI", await self._read_exact(reader, 5))
+                    data = await self._read_exact(reader, length) if length else b""
+                except AdbError as e:
+                    raise AdbStreamError(f"Shell on {serial} ended without an exit status: {e}") from e
+                if packet_id == SHELL_STDOUT:
+                    stdout.extend(data)
+                    if on_line is not None:
+                        stdout = split_lines(stdout, on_line)
+                elif packet_id == SHELL_STDERR:
+                    stderr.extend(data)
+                elif packet_id == SHELL_EXIT:
+                    returncode = data[0] if data else 0
+        finally:
+            writer.close()
+        if on_line is not None and stdout:
+            on_line(stdout.decode("utf-8", errors="replace"))
+            stdout.clear()
+        return subprocess.CompletedProcess(
+            ["adb", "-s", serial, "shell", command], returncode,
+            stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace")
+        )
@@ -0,0 +1,68 @@
+"""
+Compare spawning the adb binary with the native smart-socket client.
+
+Usage:
+    python benchmarks/bench_adb_client.py [--commands N] [--latency SECONDS]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from adb_client import AdbClient
+from adb_session import CREATE_NO_WINDOW
+from fake_adb_server import start_server
+
+FAKE_ADB = Path(__file__).resolve().parent / "fake_adb.py"
+SERIAL = "FAKE0001"
+
+
+def spawn_per_command(commands: list[str]) -> None:
+    """Run every command through a fresh adb client process."""
+    for command in commands:
+        subprocess.run(
+            [str(FAKE_ADB), "-s", SERIAL, "shell"] + command.split(),
+            check=True,
+            capture_output=True,
+            creationflags=CREATE_NO_WINDOW
+        )
+
+
+def smart_socket(client: AdbClient, commands: list[str]) -> None:
+    """Run every command over the adb server socket."""
+    for command in commands:
+        if client.shell(SERIAL, command).returncode != 0:
+            raise RuntimeError(command)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=200, help="number of shell commands to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated adb client startup latency in seconds")
+    args = parser.parse_args()
+
+    os.environ.setdefault("FAKE_ADB_STATE", tempfile.mkdtemp(prefix="unbloatware_bench_"))
+    os.environ["FAKE_ADB_DEVICES"] = SERIAL
+    os.environ["FAKE_ADB_LATENCY"] = str(args.latency)
+    commands = [f"pm path com.fake.vendor{i % 7}.app{i:05d}" for i in range(args.commands)]
+
+    server = start_server()
+    client = AdbClient(port=server.server_address[1])
+    try:
+        print(f"server alive: {client.is_server_alive()}, devices: {[d['serial'] for d in client.devices()]}")
+        for name, runner in (("spawn-per-command", spawn_per_command), ("smart-socket", lambda c: smart_socket(client, c))):
+            start = time.perf_counter()
+            runner(commands)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>18}: {elapsed:8.3f}s total, {elapsed / args.commands * 1000:7.2f} ms/command")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measure per-keystroke latency of the Applications view with synthetic packages.
+
+Types a query one character at a time and deletes it again, comparing the
+diff-based GUI.update_app_tree with a full delete-and-reinsert rebuild.
+Needs a display for Tk.
+
+Usage:
+    python benchmarks/bench_app_tree.py [--sizes 1000 10000]
+"""
+import sys
+import time
+import argparse
+import statistics
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gui import GUI
+
+QUERY = "com.fake.vendor3.app01"
+
+
+def synthetic_apps(count: int) -> list[dict]:
+    """Build `count` application entries shaped like a fetched inventory."""
+    return [
+        {"package": f"com.fake.vendor{i % 7}.app{i:05d}", "status": "Disabled" if i % 10 == 0 else "Active",
+         "type": "System" if i % 3 == 0 else "User"}
+        for i in range(count)
+    ]
+
+
+def full_rebuild(gui: GUI) -> None:
+    """The delete-everything-and-reinsert update the diff replaces."""
+    search_query = gui.search_var.get().lower()
+    for row in gui.app_tree.get_children():
+        gui.app_tree.delete(row)
+    for app in gui.app_list:
+        if search_query in app["package"].lower():
+            gui.app_tree.insert("", tk.END, values=(app["package"], app["status"], app["type"]))
+
+
+def keystrokes(gui: GUI, update) -> list[float]:
+    """Type QUERY and erase it again, timing each update in milliseconds."""
+    queries = [QUERY[:i] for i in range(1, len(QUERY) + 1)] + [QUERY[:i] for i in range(len(QUERY) - 1, -1, -1)]
+    timings = []
+    for query in queries:
+        gui.search_var.set(query)
+        start = time.perf_counter()
+        update(gui)
+        gui.root.update_idletasks()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"A display is required for this benchmark: {e}")
+    root.withdraw()
+    gui = GUI(root)
+    sys.stdout = gui.old_stdout
+    gui.search_var.trace_remove("write", gui.search_var.trace_info()[0][1])
+
+    for size in args.sizes:
+        for name, update in (("full rebuild", full_rebuild), ("diff update", GUI.update_app_tree)):
+            gui.app_tree.delete(*gui.app_tree.get_children())
+            gui.app_tree_items, gui.app_tree_values, gui.app_tree_shown = {}, {}, []
+            gui.app_list = synthetic_apps(size)
+            gui.search_var.set("")
+            update(gui)
+            timings = keystrokes(gui, update)
+            print(f"{size:>6} packages, {name:>12}: median {statistics.median(timings):8.2f} ms, "
+                  f"max {max(timings):8.2f} ms per keystroke")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
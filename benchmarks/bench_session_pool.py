@@ -0,0 +1,67 @@
+"""
+Compare spawn-per-command adb calls with the persistent session pool.
+
+Usage:
+    python benchmarks/bench_session_pool.py [--commands N] [--latency SECONDS]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from adb_session import SessionPool, CREATE_NO_WINDOW
+
+FAKE_ADB = Path(__file__).resolve().parent / "fake_adb.py"
+SERIAL = "FAKE0001"
+
+
+def spawn_per_command(adb_path: Path, commands: list[str]) -> None:
+    """Run every command in a fresh adb process, as `execute` used to."""
+    for command in commands:
+        subprocess.run(
+            [str(adb_path), "-s", SERIAL, "shell"] + command.split(),
+            check=True,
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=CREATE_NO_WINDOW
+        )
+
+
+def pooled(adb_path: Path, commands: list[str]) -> None:
+    """Run every command over one persistent shell session."""
+    pool = SessionPool(adb_path)
+    try:
+        for command in commands:
+            result = pool.run(SERIAL, command)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr)
+    finally:
+        pool.close_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=200, help="number of shell commands to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated adb startup latency in seconds")
+    args = parser.parse_args()
+
+    os.environ.setdefault("FAKE_ADB_STATE", tempfile.mkdtemp(prefix="unbloatware_bench_"))
+    os.environ["FAKE_ADB_DEVICES"] = SERIAL
+    os.environ["FAKE_ADB_LATENCY"] = str(args.latency)
+    commands = [f"pm path com.fake.vendor{i % 7}.app{i:05d}" for i in range(args.commands)]
+
+    for name, runner in (("spawn-per-command", spawn_per_command), ("session-pool", pooled)):
+        start = time.perf_counter()
+        runner(FAKE_ADB, commands)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>18}: {elapsed:8.3f}s total, {elapsed / args.commands * 1000:7.2f} ms/command")
+
+
+if __name__ == "__main__":
+    main()
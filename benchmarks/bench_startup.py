@@ -0,0 +1,100 @@
+"""
+Measure cold start: import time per module and time to the first mapped window.
+
+Each measurement runs in a fresh interpreter. The script exits with status 1
+when a budget is exceeded, so it can guard startup in CI or on kiosk PCs.
+Time to first window needs a display and is skipped without one.
+
+Usage:
+    python benchmarks/bench_startup.py [--import-budget-ms 150] [--window-budget-ms 1500] [--top 15]
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+FIRST_WINDOW = """
+import tkinter as tk
+from android_debloater import AndroidDebloater
+root = tk.Tk()
+app = AndroidDebloater(root, "Android Debloater")
+root.update()
+while not root.winfo_viewable():
+    root.update()
+print("ready", flush=True)
+root.destroy()
+"""
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    """
+    Import a module in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        list[tuple[int, int, str]]: The self and cumulative microseconds and the name of every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO, capture_output=True, text=True, check=True
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((int(self_us), int(cumulative_us), name.strip()))
+    return times
+
+
+def time_to_first_window() -> float | None:
+    """
+    Start the GUI in a fresh interpreter and wait until its window is mapped.
+
+    Returns:
+        float | None: Milliseconds from process start to the mapped window, or None without a display.
+    """
+    if os.name != "nt" and not os.environ.get("DISPLAY"):
+        return None
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", FIRST_WINDOW], cwd=REPO, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed if "ready" in result.stdout else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-budget-ms", type=float, default=150.0)
+    parser.add_argument("--window-budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    failed = False
+    times = import_times("android_debloater")
+    total_ms = next(cumulative for _, cumulative, name in times if name == "android_debloater") / 1000
+    print(f"import android_debloater: {total_ms:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    for self_us, cumulative_us, name in sorted(times, key=lambda item: item[0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.2f} ms self {cumulative_us / 1000:8.2f} ms cumulative  {name}")
+    failed |= total_ms > args.import_budget_ms
+
+    headless_ms = next(cumulative for _, cumulative, name in import_times("debloater_cli") if name == "debloater_cli") / 1000
+    print(f"import debloater_cli (headless): {headless_ms:.1f} ms")
+
+    window_ms = time_to_first_window()
+    if window_ms is None:
+        print("time to first window: skipped (no display)")
+    else:
+        print(f"time to first window: {window_ms:.0f} ms (budget {args.window_budget_ms:.0f} ms)")
+        failed |= window_ms > args.window_budget_ms
+
+    if failed:
+        print("Startup budget exceeded.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+A stand-in for the adb client binary used by the benchmarks.
+
+Every device is simulated by a state directory and a POSIX shell whose PATH
+starts with fake `pm`, `getprop`, `dumpsys`, `su` and filesystem commands (see
+fake_device/bin). Filesystem commands only touch the device's "fs" folder;
+shell globs are still expanded against the host, where they match nothing.
+Point `adb_path` at this script to drive the debloater without real phones.
+
+Environment:
+    FAKE_ADB_STATE: Directory holding the simulated devices.
+    FAKE_ADB_DEVICES: Comma-separated serial numbers. Defaults to FAKE0001.
+        A "devices" file in FAKE_ADB_STATE overrides it, so devices can be
+        plugged and unplugged while the fake server is running.
+    FAKE_ADB_PACKAGES: Number of packages seeded on a new device. Defaults to 200.
+    FAKE_ADB_LATENCY: Seconds added to every adb invocation. Defaults to 0.
+    FAKE_ADB_SHELL_LATENCY: Seconds added to every device command (pm, su, ...). Defaults to 0.
+    FAKE_ADB_FAILURE_RATE: Probability (0-1) that `pm uninstall` or `rm` fails. Defaults to 0.
+    FAKE_ADB_ROOT: "1" if `su` is available on the devices, "0" if not. Defaults to 1.
+    FAKE_ADB_SHELL_V2: "0" to simulate devices without shell_v2, whose shell merges
+        stderr into stdout. Defaults to 1.
+"""
+import os
+import sys
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+
+BIN_DIR = Path(__file__).resolve().parent / "fake_device" / "bin"
+
+
+def state_dir() -> Path:
+    """Return the directory holding the simulated devices."""
+    return Path(os.environ.get("FAKE_ADB_STATE", Path(tempfile.gettempdir()) / "unbloatware_fake_adb"))
+
+
+def device_serials() -> list[str]:
+    """Return the serial numbers of the simulated devices."""
+    try:
+        serials = (state_dir() / "devices").read_text()
+    except OSError:
+        serials = os.environ.get("FAKE_ADB_DEVICES", "FAKE0001")
+    return [serial for serial in serials.replace("\n", ",").split(",") if serial.strip()]
+
+
+def device_listing(long: bool) -> str:
+    """
+    Format the device list like `adb devices` (without the header).
+
+    Args:
+        long (bool): Whether to add the `-l` details.
+
+    Returns:
+        str: One line per device.
+    """
+    details = " product:fake model:Fake_{0} device:fake transport_id:{1}" if long else ""
+    return "".join(f"{device}\tdevice{details.format(device, index + 1)}\n" for index, device in enumerate(device_serials()))
+
+
+def seed_device(serial: str) -> Path:
+    """
+    Create the state directory of a device if it does not exist yet.
+
+    Args:
+        serial (str): The serial number of the device.
+
+    Returns:
+        Path: The state directory of the device.
+    """
+    device_dir = state_dir() / serial
+    if (device_dir / "packages").exists():
+        return device_dir
+    device_dir.mkdir(parents=True, exist_ok=True)
+    count = int(os.environ.get("FAKE_ADB_PACKAGES", "200"))
+    lines = []
+    for index in range(count):
+        package = f"com.fake.vendor{index % 7}.app{index:05d}"
+        if index % 3 == 0:
+            path, app_type, installer = f"/system/app/App{index:05d}/App{index:05d}.apk", "system", "null"
+            apk = device_dir / "fs" / path.lstrip("/")
+            apk.parent.mkdir(parents=True, exist_ok=True)
+            apk.write_bytes(b"\0" * 4096)
+        else:
+            path, app_type, installer = f"/data/app/{package}-1/base.apk", "user", "com.android.vending"
+        state = "disabled" if index % 10 == 0 else "enabled"
+        lines.append(f"{package} {app_type} {state} {path} {installer}\n")
+    tmp_path = device_dir / f"packages.{os.getpid()}"
+    tmp_path.write_text("".join(lines))
+    os.replace(tmp_path, device_dir / "packages")
+    (device_dir / "props").write_text(f"ro.product.model=Fake {serial}\nro.build.fingerprint=fake/{serial}/1:14/UNB1/1:user/release-keys\n")
+    if os.environ.get("FAKE_ADB_ROOT", "1") == "1":
+        (device_dir / "rooted").touch()
+    return device_dir
+
+
+def run_shell(serial: str, command: list[str]) -> int:
+    """
+    Run a command, or an interactive session when no command is given, on a device.
+
+    Args:
+        serial (str): The serial number of the device.
+        command (list[str]): The shell command words.
+
+    Returns:
+        int: The exit code of the shell.
+    """
+    env = dict(os.environ)
+    env["FAKE_ADB_DEVICE_DIR"] = str(seed_device(serial))
+    env["PATH"] = f"{BIN_DIR}{os.pathsep}{env.get('PATH', '')}"
+    argv = ["sh", "-c", " ".join(command)] if command else ["sh"]
+    merged = os.environ.get("FAKE_ADB_SHELL_V2", "1") == "0"
+    sys.stdout.flush()
+    if os.name == "posix":
+        if merged:
+            os.dup2(1, 2)
+        os.execvpe("sh", argv, env)
+    return subprocess.run(argv, env=env, stderr=subprocess.STDOUT if merged else None).returncode
+
+
+def main(argv: list[str]) -> int:
+    """Dispatch an adb command line."""
+    time.sleep(float(os.environ.get("FAKE_ADB_LATENCY", "0")))
+    serials = device_serials()
+    serial = None
+    if argv[:1] == ["-s"]:
+        serial, argv = argv[1], argv[2:]
+    if not argv:
+        print("fake adb: no command", file=sys.stderr)
+        return 1
+
+    command, args = argv[0], argv[1:]
+    if command in ("start-server", "kill-server"):
+        return 0
+    if command == "devices":
+        print("List of devices attached")
+        print(device_listing("-l" in args))
+        return 0
+    if command == "features":
+        print("cmd,stat_v2" if os.environ.get("FAKE_ADB_SHELL_V2", "1") == "0" else "shell_v2,cmd,stat_v2")
+        return 0
+    if command == "shell":
+        serial = serial or (serials[0] if len(serials) == 1 else None)
+        if serial not in serials:
+            print(f"adb: device '{serial}' not found", file=sys.stderr)
+            return 1
+        return run_shell(serial, args)
+    print(f"fake adb: unknown command {command}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+A fake adb server speaking the smart-socket protocol on localhost.
+
+It serves the same simulated devices as fake_adb.py (see its environment
+variables) and answers host:version, host:kill, host:devices[-l],
+host:track-devices[-l], host:transport:<serial>, shell:, shell,v2,raw: and exec: requests.
+
+Usage:
+    python benchmarks/fake_adb_server.py [--port 5037]
+"""
+import os
+import time
+import struct
+import argparse
+import threading
+import subprocess
+import socketserver
+
+from fake_adb import BIN_DIR, device_serials, device_listing, seed_device
+
+ADB_SERVER_VERSION: int = 41
+
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    """Serves one client connection."""
+
+    def read_exact(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("client closed the connection")
+            data.extend(chunk)
+        return bytes(data)
+
+    def okay(self, payload: str | None = None) -> None:
+        message = b"OKAY"
+        if payload is not None:
+            data = payload.encode("utf-8")
+            message += b"%04x" % len(data) + data
+        self.request.sendall(message)
+
+    def fail(self, reason: str) -> None:
+        data = reason.encode("utf-8")
+        self.request.sendall(b"FAIL" + b"%04x" % len(data) + data)
+
+    def handle(self) -> None:
+        serial = None
+        try:
+            while True:
+                service = self.read_exact(int(self.read_exact(4), 16)).decode("utf-8")
+                if service == "host:version":
+                    return self.okay(f"{ADB_SERVER_VERSION:04x}")
+                if service == "host:kill":
+                    self.okay()
+                    return threading.Thread(target=self.server.stop, daemon=True).start()
+                if service in ("host:devices", "host:devices-l"):
+                    return self.okay(device_listing(service.endswith("-l")))
+                if service in ("host:track-devices", "host:track-devices-l"):
+                    self.okay()
+                    return self.track_devices(service.endswith("-l"))
+                if service.startswith("host:transport:"):
+                    serial = service.split(":", 2)[2]
+                    if serial not in device_serials():
+                        return self.fail(f"device '{serial}' not found")
+                    self.okay()
+                    continue
+                if serial is None:
+                    return self.fail(f"unknown host service: {service}")
+                name, _, command = service.partition(":")
+                if name not in ("shell", "shell,v2,raw", "exec"):
+                    return self.fail(f"unknown device service: {name}")
+                self.okay()
+                return self.run_command(serial, name, command)
+        except ConnectionError:
+            return
+
+    def track_devices(self, long: bool) -> None:
+        """Send the device list now and whenever it changes."""
+        last = None
+        while True:
+            listing = device_listing(long)
+            if listing != last:
+                data = listing.encode("utf-8")
+                self.request.sendall(b"%04x" % len(data) + data)
+                last = listing
+            time.sleep(0.2)
+
+    def run_command(self, serial: str, service: str, command: str) -> None:
+        env = dict(os.environ)
+        env["FAKE_ADB_DEVICE_DIR"] = str(seed_device(serial))
+        env["PATH"] = f"{BIN_DIR}{os.pathsep}{env.get('PATH', '')}"
+        if service == "shell,v2,raw":
+            # Stream stdout as the command writes it, like adbd, so slow scripts show progress.
+            process = subprocess.Popen(["sh", "-c", command], env=env, stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            errors = []
+            reader = threading.Thread(target=lambda: errors.append(process.stderr.read()), daemon=True)
+            reader.start()
+            try:
+                for data in iter(lambda: process.stdout.read1(65536), b""):
+                    self.request.sendall(struct.pack("<BI", 1, len(data)) + data)
+            except OSError:
+                # The client hung up: stop the command like adbd does.
+                process.kill()
+                raise
+            reader.join()
+            if errors[0]:
+                self.request.sendall(struct.pack("<BI", 2, len(errors[0])) + errors[0])
+            self.request.sendall(struct.pack("<BI", 3, 1) + bytes([process.wait() & 0xFF]))
+            return
+        result = subprocess.run(["sh", "-c", command], env=env, stdin=subprocess.DEVNULL, capture_output=True)
+        if service == "shell":
+            self.request.sendall(result.stdout + result.stderr)
+        else:
+            self.request.sendall(result.stdout)
+
+
+class FakeAdbServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self.shutdown()
+        self.server_close()
+
+
+def start_server(port: int = 0) -> FakeAdbServer:
+    """
+    Start the fake server on a background thread.
+
+    Args:
+        port (int): The port to listen on, 0 for any free port.
+
+    Returns:
+        FakeAdbServer: The running server; its port is `server.server_address[1]`.
+    """
+    server = FakeAdbServer(("127.0.0.1", port), FakeAdbHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5037)
+    args = parser.parse_args()
+    with FakeAdbServer(("127.0.0.1", args.port), FakeAdbHandler) as server:
+        print(f"Fake adb server listening on 127.0.0.1:{args.port}")
+        server.serve_forever()
@@ -0,0 +1,13 @@
+# Sourced by the filesystem shims: rewrites absolute path arguments into the
+# simulated device filesystem "$FAKE_ADB_DEVICE_DIR/fs" and drops the shim
+# directory from PATH so the real tool can be exec'd.
+fs="$FAKE_ADB_DEVICE_DIR/fs"
+for arg; do
+    shift
+    case "$arg" in
+    "$fs"*) set -- "$@" "$arg" ;;
+    /*) set -- "$@" "$fs$arg" ;;
+    *) set -- "$@" "$arg" ;;
+    esac
+done
+PATH="${PATH#*:}"
@@ -0,0 +1,13 @@
+# Sourced by the fake device commands: adds the configured per-command
+# latency and defines should_fail, which is true with FAKE_ADB_FAILURE_RATE.
+case "$FAKE_ADB_SHELL_LATENCY" in
+"" | 0 | 0.0) ;;
+*) sleep "$FAKE_ADB_SHELL_LATENCY" ;;
+esac
+
+should_fail() {
+    case "$FAKE_ADB_FAILURE_RATE" in
+    "" | 0 | 0.0) return 1 ;;
+    esac
+    awk -v rate="$FAKE_ADB_FAILURE_RATE" -v seed="$$" 'BEGIN { srand(seed); exit !(rand() < rate) }'
+}
@@ -0,0 +1,208 @@
+"""
+Run the hot paths of the debloater against the fake adb binary and write the timings as JSON.
+
+Each package count gets fresh simulated devices. The benchmarks are:
+    devices:      list_devices and resolve_device_models over the simulated fleet
+    fetch:        the application list, cold (empty cache), warm and after a debloat
+    metadata:     the streamed dumpsys parse of versions, installers and sizes
+    debloat:      a batched uninstall of every tenth user application
+    fleet-shell:  50 concurrent getprop calls per simulated device (see `shell_many`)
+    preflight:    the existence and size check of the path list below
+    remove-paths: a root removal of every tenth system application folder, batched
+                  into one su script and, for another tenth, one rm per path
+    app-tree:     update_app_tree with the fetched list (needs a display)
+
+With a display the GUI thread methods (`_fetch_apps_thread`, `_debloat_thread`,
+`_remove_apps_in_thread`, `_get_device_name_thread`) are timed directly;
+without one the same DebloaterEngine calls are timed headless.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 100 1000 10000] [--devices 4]
+        [--shell-latency SECONDS] [--failure-rate RATE] [--no-root] [--output results.json]
+
+The results default to benchmarks/benchmark_results.json, which git ignores.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from async_adb import AsyncAdb
+from debloater_engine import DebloaterEngine
+from inventory_cache import InventoryCache
+from job_journal import JobJournal
+from path_list import read_path_list
+
+FAKE_ADB = Path(__file__).resolve().parent / "fake_adb.py"
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "benchmark_results.json"
+
+
+def timed(results: list[dict], benchmark: str, packages: int, mode: str, action) -> object:
+    """Run an action, append its wall time to the results and return its value."""
+    start = time.perf_counter()
+    value = action()
+    seconds = time.perf_counter() - start
+    results.append({"benchmark": benchmark, "packages": packages, "mode": mode, "seconds": round(seconds, 6)})
+    print(f"{benchmark:<13} {mode:<12} {packages:>6} packages: {seconds * 1000:10.1f} ms", file=sys.stderr)
+    return value
+
+
+def open_gui():
+    """Return an AndroidDebloater on a hidden window, or None when there is no display."""
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    from android_debloater import AndroidDebloater
+
+    app = AndroidDebloater(root, "Android Debloater benchmark")
+    sys.stdout = app.old_stdout
+    return app
+
+
+def run_size(engine: DebloaterEngine, app, count: int, serials: list[str], workdir: Path) -> list[dict]:
+    """
+    Run every benchmark against devices seeded with `count` packages.
+
+    Args:
+        engine (DebloaterEngine): The engine to drive, the GUI itself when `app` is set.
+        app (AndroidDebloater | None): The hidden GUI, or None to run headless.
+        count (int): The number of packages per device.
+        serials (list[str]): The simulated device serials.
+        workdir (Path): A scratch directory for this size.
+
+    Returns:
+        list[dict]: One timing per benchmark and mode.
+    """
+    os.environ["FAKE_ADB_STATE"] = str(workdir / "devices")
+    os.environ["FAKE_ADB_PACKAGES"] = str(count)
+    engine.set_adb_path(FAKE_ADB)
+    # Never let the async backend reach a real adb server listening on this machine.
+    engine.async_adb = AsyncAdb(FAKE_ADB, callback_queue=engine.callback_queue, port=None)
+    engine.inventory_cache = InventoryCache(workdir / "cache")
+    engine.job_journal = JobJournal(workdir / "jobs")
+    serial = serials[0]
+    results = []
+
+    if app:
+        timed(results, "devices", count, "gui", app._get_device_name_thread)
+        app.root.update()
+        app.device_var.set(f"{engine.device_models[serial]} - {serial}")
+    else:
+        timed(results, "devices", count, "headless", lambda: engine.resolve_device_models(engine.list_devices()))
+
+    def fetch() -> list[dict]:
+        if app:
+            app._fetch_apps_thread(serial, engine.device_models[serial])
+            return app.app_list
+        return engine.fetch_inventory(serial)[0]
+
+    apps = timed(results, "fetch", count, "cold", fetch)
+    timed(results, "fetch", count, "warm", fetch)
+    timed(results, "metadata", count, "streamed", lambda: engine.fetch_package_metadata(serial))
+
+    if app:
+        app.app_list = []
+        app.update_app_tree()
+        app.app_list = apps
+        timed(results, "app-tree", count, "populate", lambda: (app.update_app_tree(), app.root.update_idletasks()))
+
+    targets = [item["package"] for item in apps if item["type"] == "User"][::10]
+    if app:
+        timed(results, "debloat", len(targets), "gui", lambda: app._debloat_thread(targets))
+    else:
+        timed(results, "debloat", len(targets), "headless", lambda: engine.uninstall_packages(serial, targets))
+    timed(results, "fetch", count, "incremental", fetch)
+    requests = [(device, "getprop ro.product.model") for device in serials for _ in range(50)]
+    timed(results, "fleet-shell", len(requests), engine.adb_backend, lambda: engine.shell_many(requests))
+
+    if not engine.check_root(serial):
+        print("remove-paths skipped: the simulated devices are not rooted", file=sys.stderr)
+        engine.session_pool.close_all()
+        return results
+    path_file = workdir / "paths.txt"
+    folders = sorted({item["path"].rsplit("/", 1)[0] for item in apps if item["type"] == "System" and item.get("path")})
+    path_file.write_text("".join(f"{folder}\n" for folder in folders[::10]))
+    removed = len(folders[::10])
+    preflight, _ = timed(results, "preflight", removed, "batched", lambda: engine.preflight_paths(serial, read_path_list(path_file)))
+    existing = [path for path, (matches, _) in preflight.items() if matches]
+    if app:
+        timed(results, "remove-paths", removed, "gui", lambda: app._remove_apps_in_thread(existing))
+    else:
+        timed(results, "remove-paths", removed, "batched", lambda: engine.remove_paths(serial, existing))
+    per_path = [f"{folder}\n" for folder in folders[5::10]]
+    timed(results, "remove-paths", len(per_path), "per-path", lambda: engine.remove_paths(serial, per_path, batch=False))
+
+    engine.session_pool.close_all()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="packages per device")
+    parser.add_argument("--devices", type=int, default=4, help="number of simulated devices")
+    parser.add_argument("--backend", choices=("pool", "async", "spawn"), default="pool", help="device I/O backend")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every adb invocation")
+    parser.add_argument("--shell-latency", type=float, default=0.0, help="seconds added to every device command")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability that an uninstall or rm fails")
+    parser.add_argument("--no-root", action="store_true", help="simulate devices without su")
+    parser.add_argument("--headless", action="store_true", help="do not use the GUI even if a display is available")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON output file")
+    args = parser.parse_args()
+
+    serials = [f"FAKE{index + 1:04d}" for index in range(args.devices)]
+    os.environ["FAKE_ADB_DEVICES"] = ",".join(serials)
+    os.environ["FAKE_ADB_LATENCY"] = str(args.latency)
+    os.environ["FAKE_ADB_SHELL_LATENCY"] = str(args.shell_latency)
+    os.environ["FAKE_ADB_FAILURE_RATE"] = str(args.failure_rate)
+    os.environ["FAKE_ADB_ROOT"] = "0" if args.no_root else "1"
+
+    app = None if args.headless else open_gui()
+    engine = app or DebloaterEngine(FAKE_ADB)
+    engine.adb_backend = args.backend
+    if app is None:
+        engine.log_stream = None
+    else:
+        app.adb_active = True
+
+    results = []
+    workroot = Path(tempfile.mkdtemp(prefix="unbloatware_bench_"))
+    try:
+        for count in args.sizes:
+            results.extend(run_size(engine, app, count, serials, workroot / str(count)))
+    finally:
+        shutil.rmtree(workroot, ignore_errors=True)
+        if app:
+            app.root.destroy()
+
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mode": "gui" if app else "headless",
+            "backend": args.backend,
+            "devices": args.devices,
+            "latency": args.latency,
+            "shell_latency": args.shell_latency,
+            "failure_rate": args.failure_rate,
+            "root": not args.no_root,
+        },
+        "results": results,
+        "commands": engine.command_stats.summary(),
+    }
+    args.output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
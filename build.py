@@ -4,13 +4,16 @@ import subprocess
 from pathlib import Path
 
 
-def build_with_nuitka(icon: Path, licence: Path, adb_path: Path):
+def build_with_nuitka(icon: Path, licence: Path, adb_path: Path, onefile: bool = True):
     """
     Build the application using Nuitka with the provided icon and license file.
+
+    A onefile build unpacks itself on every start; pass onefile=False for a
+    standalone folder build that starts faster.
     """
     command = [
         sys.executable, "-m", "nuitka",
-        "--onefile",
+        "--onefile" if onefile else "--standalone",
         f"--windows-icon-from-ico={icon}",
         f"--include-data-files={icon}={icon}",
         f"--include-data-files={licence}={licence}",
@@ -18,6 +21,7 @@ def build_with_nuitka(icon: Path, licence: Path, adb_path: Path):
         fr"--include-data-files={adb_path}\AdbWinApi.dll={adb_path}\AdbWinApi.dll",
         fr"--include-data-files={adb_path}\AdbWinUsbApi.dll={adb_path}\AdbWinUsbApi.dll",
         f"--include-data-files={Path('assets/example_app_paths.txt')}=assets/example_app_paths.txt",
+        f"--include-data-files={Path('assets/packages.csv')}=assets/packages.csv",
         "--enable-plugin=tk-inter",
         "--windows-console-mode=disable",
         "--python-flag=no_site",
@@ -71,7 +75,7 @@ if __name__ == "__main__":
     adb = Path("assets/adb")
 
     print("Starting Nuitka build...")
-    build_with_nuitka(icon_path, licence_path, adb)
+    build_with_nuitka(icon_path, licence_path, adb, onefile="--standalone" not in sys.argv)
     
     print("Starting Inno Setup build...")
     iss_file_path = Path("android_debloater.iss")
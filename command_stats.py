@@ -0,0 +1,172 @@
+import time
+import json
+import threading
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+
+# Upper bounds of the latency buckets in seconds: 0.1 ms to ~2 min, 25% apart.
+BUCKET_BOUNDS: list[float] = [0.0001 * 1.25 ** index for index in range(64)]
+MAX_RECORDS: int = 10000
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+CSV_FIELDS: tuple[str, ...] = ("timestamp", "category", "device", "seconds", "returncode", "output_bytes")
+
+
+def command_category(args: list[str]) -> str:
+    """
+    Derive the category of an adb command line for the statistics.
+
+    Args:
+        args (list[str]): The adb arguments, without the adb executable.
+
+    Returns:
+        str: The adb command (e.g. "devices"), or "shell:<program>" for device shell commands.
+    """
+    if args[:1] == ["-s"]:
+        args = args[2:]
+    if not args:
+        return "adb"
+    if args[0] != "shell":
+        return args[0]
+    words = args[1:]
+    if words[:2] == ["su", "-c"] and len(words) > 2:
+        words = words[2:]
+    return f"shell:{words[0].split()[0]}" if words and words[0].strip() else "shell"
+
+
+class LatencyHistogram:
+    """Latency distribution of one command category on one device, in fixed log-scale buckets."""
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.buckets: list[int] = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.maximum: float = 0.0
+        self.errors: int = 0
+        self.output_bytes: int = 0
+
+    def add(self, seconds: float, returncode: int, output_bytes: int) -> None:
+        """Add one command to the histogram."""
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.errors += returncode != 0
+        self.output_bytes += output_bytes
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate a latency percentile.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The percentile in seconds, interpolated within its bucket and capped at the maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            if seen + bucket >= rank:
+                lower = BUCKET_BOUNDS[index - 1] if index else 0.0
+                upper = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.maximum
+                return min(lower + (upper - lower) * (rank - seen) / bucket, self.maximum)
+            seen += bucket
+        return self.maximum
+
+
+class CommandStats:
+    """Thread-safe store of per-command latency, exit code and output size."""
+
+    def __init__(self, max_records: int = MAX_RECORDS):
+        """
+        Initialize the store.
+
+        Args:
+            max_records (int): The number of most recent commands kept for export.
+        """
+        self.histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self.records: deque = deque(maxlen=max_records)
+        self.lock = threading.Lock()
+
+    def record(self, category: str, device: str, seconds: float, returncode: int, output_bytes: int) -> None:
+        """
+        Record one finished command.
+
+        Args:
+            category (str): The command category (see `command_category`).
+            device (str): The device serial, or "" for server commands.
+            seconds (float): The wall time of the command.
+            returncode (int): The exit code of the command.
+            output_bytes (int): The size of stdout and stderr.
+        """
+        with self.lock:
+            histogram = self.histograms.get((category, device))
+            if histogram is None:
+                histogram = self.histograms[(category, device)] = LatencyHistogram()
+            histogram.add(seconds, returncode, output_bytes)
+            self.records.append((time.time(), category, device, seconds, returncode, output_bytes))
+
+    def summary(self) -> list[dict]:
+        """
+        Summarize the latency of every category and device.
+
+        Returns:
+            list[dict]: One row per category and device, slowest p95 first, with times in milliseconds.
+        """
+        with self.lock:
+            rows = []
+            for (category, device), histogram in self.histograms.items():
+                row = {"category": category, "device": device, "count": histogram.count}
+                for percent in PERCENTILES:
+                    row[f"p{percent}_ms"] = round(histogram.percentile(percent) * 1000, 3)
+                row["mean_ms"] = round(histogram.total / histogram.count * 1000, 3)
+                row["max_ms"] = round(histogram.maximum * 1000, 3)
+                row["errors"] = histogram.errors
+                row["output_bytes"] = histogram.output_bytes
+                rows.append(row)
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def clear(self) -> None:
+        """Forget every recorded command."""
+        with self.lock:
+            self.histograms.clear()
+            self.records.clear()
+
+    def export_json(self, path: Path) -> None:
+        """
+        Write the summary and the recent commands to a JSON file.
+
+        Args:
+            path (Path): The output file.
+        """
+        with self.lock:
+            records = [dict(zip(CSV_FIELDS, record)) for record in self.records]
+        document = {"summary": self.summary(), "records": records}
+        Path(path).write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+    def export_csv(self, path: Path) -> None:
+        """
+        Write the recent commands to a CSV file, one row per command.
+
+        Args:
+            path (Path): The output file.
+        """
+        import csv
+
+        with self.lock:
+            records = list(self.records)
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(records)
+
+    def export(self, path: Path) -> None:
+        """Write the statistics as CSV if the file name ends with .csv, as JSON otherwise."""
+        if str(path).lower().endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
@@ -0,0 +1,253 @@
+"""
+Headless command line interface of the Android Debloater.
+
+Runs against one or many devices without importing tkinter and prints JSON.
+
+Usage:
+    python -m debloater_cli devices
+    python -m debloater_cli fetch [--details] [-s SERIAL ...]
+    python -m debloater_cli debloat --group bixby [-s SERIAL ...]
+    python -m debloater_cli debloat --vendor samsung [--rating recommended]
+    python -m debloater_cli debloat com.example.app [com.other.app ...]
+    python -m debloater_cli remove-paths file.txt [--dry-run] [-s SERIAL ...]
+    python -m debloater_cli --stats stats.csv fetch
+    python -m debloater_cli --packages my_list.csv debloat --group my_group
+    python -m debloater_cli jobs [-s SERIAL ...]
+    python -m debloater_cli resume [-s SERIAL ...]
+    python -m debloater_cli restore JOB
+    python -m debloater_cli --backend async shell "getprop ro.build.version.release"
+
+Debloats and batched path removals are journaled in ~/.unbloatware/jobs, so an
+interrupted run can be resumed and the packages a job removed can be restored.
+
+Devices default to every authorized device from `adb devices`.
+
+Exit codes:
+    0  Every item succeeded on every device.
+    1  Some items failed.
+    2  Invalid arguments (e.g. an unknown group).
+    3  No device to work on.
+    4  A device could not be processed at all.
+"""
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+from debloater_engine import DebloaterEngine
+from package_database import RATINGS, get_database
+from device_scripts import REMOVE_MISSING, is_valid_device_path
+from fleet import run_on_fleet
+from path_list import read_path_list
+
+EXIT_OK: int = 0
+EXIT_PARTIAL: int = 1
+EXIT_USAGE: int = 2
+EXIT_NO_DEVICES: int = 3
+EXIT_DEVICE_ERROR: int = 4
+
+
+def default_adb_path() -> Path:
+    """Return the bundled adb binary, or the one on PATH if it is not bundled."""
+    bundled = Path(__file__).parent.resolve() / "assets" / "adb" / "adb.exe"
+    if bundled.exists():
+        return bundled
+    return Path(shutil.which("adb") or "adb")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="debloater_cli", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--adb", type=Path, default=None, help="path to the adb executable")
+    parser.add_argument("--backend", choices=("pool", "socket", "async", "spawn"), default="pool", help="device I/O backend")
+    parser.add_argument("--quiet", action="store_true", help="do not log progress to stderr")
+    parser.add_argument("--stats", type=Path, default=None, help="write per-command latency stats (.json or .csv)")
+    parser.add_argument("--packages", type=Path, action="append", default=[], dest="packages_files",
+                        help="package list (.csv) merged into the package database (repeatable)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("devices", help="list connected devices")
+    restore_parser = subparsers.add_parser("restore", help="reinstall the packages removed by a job")
+    restore_parser.add_argument("job", help="job ID (see the jobs command)")
+    for name, help_text in (("fetch", "list installed applications"),
+                            ("debloat", "uninstall applications for user 0"),
+                            ("remove-paths", "remove files listed in a text file (root)"),
+                            ("jobs", "list the journaled jobs"),
+                            ("resume", "resume interrupted jobs"),
+                            ("shell", "run a shell command on every device concurrently")):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("-s", "--serial", action="append", dest="serials", help="device serial (repeatable)")
+        if name == "fetch":
+            subparser.add_argument("--details", action="store_true",
+                                   help="add version, installer, install times and sizes (dumpsys)")
+        elif name == "debloat":
+            subparser.add_argument("--group", action="append", default=[], help="default package group (repeatable)")
+            subparser.add_argument("--vendor", action="append", default=[], help="package database vendor (repeatable)")
+            subparser.add_argument("--rating", choices=RATINGS, default=None,
+                                   help="only take group and vendor packages rated this safe or safer")
+            subparser.add_argument("packages", nargs="*", help="package names")
+        elif name == "remove-paths":
+            subparser.add_argument("path_file", type=Path, help="text file with one path per line")
+            subparser.add_argument("--per-path", action="store_true", help="run one rm command per path")
+            subparser.add_argument("--dry-run", action="store_true", help="only report what exists and its size")
+        elif name == "shell":
+            subparser.add_argument("shell_command", metavar="command", help="the shell command line")
+    return parser
+
+
+def item_results(results: dict[str, tuple[int, str]]) -> dict[str, dict]:
+    """Convert (exit code, message) tuples into JSON objects."""
+    return {item: {"code": code, "message": message} for item, (code, message) in results.items()}
+
+
+def exit_code(results: dict[str, dict]) -> int:
+    """
+    Derive the process exit code from per-device results.
+
+    Args:
+        results (dict[str, dict]): The JSON results of each device.
+
+    Returns:
+        int: One of the EXIT_* codes.
+    """
+    if any("error" in result for result in results.values()):
+        return EXIT_DEVICE_ERROR
+    for result in results.values():
+        if any(item["code"] != 0 for item in result.get("items", {}).values()):
+            return EXIT_PARTIAL
+    return EXIT_OK
+
+
+def run(args: argparse.Namespace, engine: DebloaterEngine) -> tuple[dict, int]:
+    """
+    Run a parsed command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        engine (DebloaterEngine): The engine to drive.
+
+    Returns:
+        tuple[dict, int]: The JSON document and the exit code.
+    """
+    if args.command == "devices":
+        devices = engine.list_devices()
+        return {"command": "devices", "devices": devices}, EXIT_OK if devices else EXIT_NO_DEVICES
+
+    output = {"command": args.command}
+    if args.command == "restore":
+        state = engine.job_journal.load(args.job)
+        if state is None:
+            return dict(output, error=f"Unknown job: {args.job}"), EXIT_USAGE
+        results = run_on_fleet([state["device"]], lambda device: {"items": item_results(engine.restore_job(args.job))})
+        return dict(output, job=args.job, results=results), exit_code(results)
+
+    if args.command == "debloat":
+        database = get_database()
+        for path in args.packages_files:
+            database.add_source(path)
+        entries = {("group", group): database.group(group) for group in args.group}
+        entries.update({("vendor", vendor): database.vendor(vendor) for vendor in args.vendor})
+        unknown = [f"{kind} {name}" for (kind, name), found in entries.items() if not found]
+        if unknown:
+            return dict(output, error=f"Unknown package {', '.join(unknown)}"), EXIT_USAGE
+        allowed = RATINGS[:RATINGS.index(args.rating) + 1] if args.rating else None
+        packages = list(dict.fromkeys(args.packages + [
+            entry["package"] for found in entries.values() for entry in found
+            if allowed is None or entry["rating"] in allowed
+        ]))
+        if not packages:
+            return dict(output, error="No packages given."), EXIT_USAGE
+
+        def task(device: str) -> dict:
+            job = engine.start_job(device, "uninstall", packages)
+            results = engine.run_job(job)
+            return {"job": job, "items": item_results({app: results.get(app, (1, "No status reported")) for app in packages})}
+    elif args.command == "remove-paths":
+        try:
+            paths = read_path_list(args.path_file)
+        except OSError as e:
+            return dict(output, error=str(e)), EXIT_USAGE
+
+        def task(device: str) -> dict:
+            if not engine.check_root(device):
+                raise Exception("Root access required")
+            preflight, total = engine.preflight_paths(device, paths)
+            existing = [path for path, (matches, _) in preflight.items() if matches]
+            # Per-path bytes overlap when paths do; "bytes" counts every match once.
+            result = {
+                "preflight": {path: {"matches": matches, "bytes": size} for path, (matches, size) in preflight.items()},
+                "bytes": total,
+            }
+            if args.dry_run:
+                return result
+            items = {
+                path: (REMOVE_MISSING, "Does not exist") if is_valid_device_path(path) else (1, "Invalid path")
+                for path in preflight if path not in existing
+            }
+            if existing and args.per_path:
+                items.update(engine.remove_paths(device, existing, batch=False))
+            elif existing:
+                result["job"] = engine.start_job(device, "remove-paths", existing)
+                removed = engine.run_job(result["job"])
+                items.update((path, removed.get(path, (1, "No status reported"))) for path in existing)
+            return dict(result, items=item_results({path: items[path] for path in preflight}))
+    elif args.command == "jobs":
+        def task(device: str) -> dict:
+            return {"jobs": [{
+                "job": state["job"], "kind": state["kind"], "created": state["created"], "finished": state["finished"],
+                "items": len(state["items"]), "results": len(state["results"]),
+                "failed": sum(code != 0 for code, _ in state["results"].values()),
+                "restorable": len(engine.job_journal.restorable(state)),
+            } for state in engine.job_journal.jobs(device)]}
+    elif args.command == "resume":
+        def task(device: str) -> dict:
+            jobs = engine.unfinished_jobs(device)
+            items = {}
+            for job in jobs:
+                items.update(engine.run_job(job))
+            return {"jobs": jobs, "items": item_results(items)}
+    elif args.command == "fetch":
+        def task(device: str) -> dict:
+            apps, changed = engine.fetch_inventory(device)
+            if args.details:
+                metadata = engine.fetch_package_metadata(device)
+                apps = [dict(app, **metadata.get(app["package"], {})) for app in apps]
+            return {"apps": apps, "refreshed": changed}
+
+    devices = args.serials or engine.ready_devices()
+    if not devices:
+        return dict(output, error="No authorized devices connected."), EXIT_NO_DEVICES
+    if args.command == "shell":
+        results = {
+            device: {"items": {args.shell_command: {"code": result.returncode, "message": result.stdout + result.stderr}}}
+            if result is not None else {"error": "adb could not run the command"}
+            for device, result in zip(devices, engine.shell_many([(device, args.shell_command) for device in devices]))
+        }
+        return dict(output, results=results), exit_code(results)
+    results = run_on_fleet(devices, task)
+    return dict(output, results=results), exit_code(results)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the command line interface."""
+    args = build_parser().parse_args(argv)
+    engine = DebloaterEngine(args.adb or default_adb_path())
+    engine.adb_backend = args.backend
+    if args.quiet:
+        engine.log_stream = None
+    try:
+        output, code = run(args, engine)
+    finally:
+        engine.session_pool.close_all()
+        engine.close_async_adb()
+        if args.stats:
+            engine.command_stats.export(args.stats)
+    json.dump(output, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,785 @@
+import sys
+import time
+import tempfile
+import queue
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Generator
+from adb_session import SessionPool, SessionError, SessionClosedError, CREATE_NO_WINDOW
+from adb_client import AdbClient, AdbError, AdbStreamError, parse_device_lines
+from command_stats import CommandStats, command_category
+from device_scripts import (
+    build_uninstall_script, build_remove_script, build_preflight_script, build_restore_script, parse_status_lines,
+    parse_preflight_lines, is_valid_package, is_valid_device_path, PREFLIGHT_TOTAL, REMOUNT_ITEM, REMOVE_MISSING
+)
+from fleet import FLEET_MAX_WORKERS
+from inventory_cache import InventoryCache
+from job_journal import JobJournal
+from package_metadata import METADATA_SCRIPT, parse_metadata
+from path_list import iter_path_list
+from task_scheduler import task_cancelled
+
+if TYPE_CHECKING:
+    from async_adb import AsyncAdb
+
+
+class StreamCancelled(Exception):
+    """Raised from a line callback to stop a streamed command when its task was cancelled."""
+
+
+class DebloaterEngine:
+    """The adb and device logic of the debloater, independent of any GUI toolkit."""
+
+    def __init__(self, adb_path: Path):
+        """
+        Initialize the engine.
+
+        Args:
+            adb_path (Path): The path to the ADB executable.
+        """
+        self.adb_path: Path = adb_path
+        # "pool" keeps a persistent shell per device, "socket" talks to the adb
+        # server directly, "async" multiplexes every device on one asyncio event
+        # loop and "spawn" runs the adb binary for every command.
+        self.adb_backend: str = "pool"
+        self.session_pool: SessionPool = SessionPool(adb_path)
+        self.adb_client: AdbClient = AdbClient()
+        self.async_adb: AsyncAdb | None = None
+        # Where `shell_async` callbacks are delivered, e.g. the Tk UI queue.
+        self.callback_queue: queue.Queue | None = None
+        self.inventory_cache: InventoryCache = InventoryCache()
+        self.job_journal: JobJournal = JobJournal()
+        self.device_models: dict[str, str] = {}
+        self.command_stats: CommandStats = CommandStats()
+        self.log_stream = sys.stderr
+
+    def set_adb_path(self, adb_path: Path) -> None:
+        """
+        Switch to another adb executable, such as the benchmark fake.
+
+        Args:
+            adb_path (Path): The path to the ADB executable.
+        """
+        self.session_pool.close_all()
+        self.close_async_adb()
+        self.adb_path = adb_path
+        self.session_pool = SessionPool(adb_path)
+        self.device_models.clear()
+
+    def get_async_adb(self) -> "AsyncAdb":
+        """Return the asyncio backend, creating it on first use."""
+        if self.async_adb is None:
+            # Imported here: asyncio adds noticeably to the start-up time of the other backends.
+            from async_adb import AsyncAdb
+
+            self.async_adb = AsyncAdb(self.adb_path, callback_queue=self.callback_queue)
+        return self.async_adb
+
+    def close_async_adb(self) -> None:
+        """Stop the event loop of the asyncio backend, if it was started."""
+        if self.async_adb is not None:
+            self.async_adb.close()
+            self.async_adb = None
+
+    def log_message(self, message: str) -> None:
+        """
+        Log a message to the log stream (overridden by the GUI).
+
+        Args:
+            message (str): The message to log.
+        """
+        if self.log_stream is not None:
+            print(message, file=self.log_stream)
+
+    def execute(self, command: str, print_log: bool = True) -> subprocess.CompletedProcess | None:
+        """
+        Execute the given adb command.
+
+        Device shell commands (`-s <serial> shell ...`) are routed through the
+        selected backend: a persistent per-device shell session ("pool") or the
+        adb server socket ("socket"). Other commands always run the adb binary.
+
+        Args:
+            command (str): The adb command to execute.
+            print_log (bool): Whether to print the command log. Defaults to True.
+
+        Returns:
+            subprocess.CompletedProcess | None: The result of the command execution.
+        """
+        command_list = [self.adb_path] + command.split()
+        category = command_category(command_list[1:])
+        device = command_list[2] if command_list[1:2] == ["-s"] and len(command_list) > 2 else ""
+        start = time.perf_counter()
+        if len(command_list) > 4 and command_list[1] == "-s" and command_list[3] == "shell":
+            result = self._backend_shell(command_list[2], " ".join(command_list[4:]))
+            if result is not None:
+                self._record(category, device, start, result)
+                if result.returncode == 0:
+                    return result
+                if print_log:
+                    self.log_message(f"Error: {result.stderr}")
+                return None
+        try:
+            result = subprocess.run(
+                command_list,
+                check=True,
+                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                creationflags=CREATE_NO_WINDOW
+            )
+            self._record(category, device, start, result)
+            return result
+        except subprocess.CalledProcessError as e:
+            self._record(category, device, start, e)
+            if print_log:
+                self.log_message(f"Error: {e.stderr}")
+            return None
+
+    def run_shell(self, device: str, script: str) -> subprocess.CompletedProcess | None:
+        """
+        Run a generated shell script on a device in a single round trip.
+
+        Unlike `execute`, the script is passed to the device shell as one
+        command line and a non-zero exit code does not discard the output.
+
+        Args:
+            device (str): The device ID.
+            script (str): The shell script to run.
+
+        Returns:
+            subprocess.CompletedProcess | None: The result of the script, or None if adb could not run it.
+        """
+        start = time.perf_counter()
+        result = self._backend_shell(device, script)
+        if result is None:
+            try:
+                result = subprocess.run(
+                    [self.adb_path, "-s", device, "shell", script],
+                    text=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    creationflags=CREATE_NO_WINDOW
+                )
+            except OSError as e:
+                self.log_message(f"Error: {e}")
+                return None
+        self._record("shell:script", device, start, result)
+        return result
+
+    async def _timed_shell(self, device: str, command: str) -> subprocess.CompletedProcess:
+        """Run a shell command on the asyncio backend and record it in the statistics."""
+        start = time.perf_counter()
+        result = await self.get_async_adb().shell(device, command)
+        self._record(command_category(["-s", device, "shell", command]), device, start, result)
+        return result
+
+    def shell_many(self, requests: list[tuple[str, str]]) -> list[subprocess.CompletedProcess | None]:
+        """
+        Run shell commands on devices concurrently.
+
+        With the "async" backend every command is a coroutine on the one event loop,
+        bounded by the per-device and global limits of `AsyncAdb`; otherwise a
+        thread pool runs them through `run_shell`.
+
+        Args:
+            requests (list[tuple[str, str]]): The (device ID, command) pairs.
+
+        Returns:
+            list[subprocess.CompletedProcess | None]: The results in request order, None for a command
+            adb could not run.
+        """
+        if not requests:
+            return []
+        if self.adb_backend != "async":
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(len(requests), FLEET_MAX_WORKERS)) as executor:
+                return list(executor.map(lambda request: self.run_shell(*request), requests))
+
+        import asyncio
+
+        async def gather() -> list:
+            return await asyncio.gather(*(self._timed_shell(device, command) for device, command in requests),
+                                        return_exceptions=True)
+
+        results = []
+        for (device, _), result in zip(requests, self.get_async_adb().run(gather())):
+            if isinstance(result, Exception):
+                self.log_message(f"Error on {device}: {result}")
+                result = None
+            results.append(result)
+        return results
+
+    def shell_async(self, device: str, command: str, callback: Callable) -> None:
+        """
+        Run a shell command on the asyncio event loop without blocking the caller.
+
+        Args:
+            device (str): The device ID.
+            command (str): The shell command line.
+            callback (Callable): Called with the `subprocess.CompletedProcess`, or the exception if adb
+                could not run, through `callback_queue` when one is set (the GUI thread).
+        """
+        self.get_async_adb().submit(self._timed_shell(device, command), callback)
+
+    def stream_shell(self, device: str, command: str) -> Generator[str, None, subprocess.CompletedProcess]:
+        """
+        Run a shell command on a device and yield its stdout lines as they arrive.
+
+        Unlike `run_shell`, the output is never held in memory as a whole, which
+        suits multi-megabyte dumps. It always runs the adb binary. Once exhausted,
+        the generator returns the result with an empty stdout, the stderr and the
+        exit code of adb.
+
+        Args:
+            device (str): The device ID.
+            command (str): The shell command line.
+
+        Yields:
+            str: Each line of stdout, including the newline.
+        """
+        start = time.perf_counter()
+        output_bytes = 0
+        # A file, not a pipe: nobody reads stderr while stdout streams, so a pipe could fill up.
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                [self.adb_path, "-s", device, "shell", command],
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                creationflags=CREATE_NO_WINDOW
+            )
+            try:
+                for line in process.stdout:
+                    output_bytes += len(line)
+                    yield line
+            finally:
+                process.stdout.close()
+                if process.poll() is None:
+                    process.terminate()
+                returncode = process.wait()
+                category = f"shell:{command.split()[0]}" if command.strip() else "shell"
+                self.command_stats.record(category, device, time.perf_counter() - start, returncode, output_bytes)
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+        return subprocess.CompletedProcess([str(self.adb_path), "-s", device, "shell", command], returncode, "", stderr)
+
+    def stream_statuses(self, device: str, script: str, job: str | None = None,
+                        event: str = "result") -> dict[str, tuple[int, str]]:
+        """
+        Run a generated script and collect its status lines as they arrive.
+
+        The script runs through the selected backend, falling back to the adb
+        binary like `run_shell`. With a job, each status is appended to the job
+        journal the moment it is read, so an interrupted batch leaves the
+        unfinished items pending. A cancelled scheduler task stops the script
+        between two items. If adb fails before any status arrives (device
+        offline, no root, ...), its error is raised.
+
+        Args:
+            device (str): The device ID.
+            script (str): The script, printing `parse_status_lines` lines.
+            job (str | None): The journaled job the items belong to.
+            event (str): The journal event ("result" or "restore").
+
+        Returns:
+            dict[str, tuple[int, str]]: The exit code and message for each reported item.
+        """
+        results = {}
+
+        def on_line(line: str) -> None:
+            for item, (code, message) in parse_status_lines(line).items():
+                results[item] = (code, message)
+                if job is not None and item != REMOUNT_ITEM:
+                    self.job_journal.record(job, item, code, message, event)
+            if task_cancelled():
+                raise StreamCancelled()
+
+        start = time.perf_counter()
+        try:
+            result = self._backend_shell(device, script, on_line)
+            if result is not None:
+                self._record("shell:script", device, start, result)
+            else:
+                lines = self.stream_shell(device, script)
+                try:
+                    while True:
+                        on_line(next(lines))
+                except StopIteration as stop:
+                    result = stop.value
+                finally:
+                    lines.close()
+        except StreamCancelled:
+            self.log_message(f"Cancelled on {device} after {len(results)} item(s).")
+            return results
+        error = result.stderr.strip()
+        if result.returncode != 0 and not results:
+            raise Exception(error or f"adb exited with code {result.returncode}")
+        if result.returncode != 0 and error:
+            self.log_message(f"Error on {device}: {error}")
+        return results
+
+    def _record(self, category: str, device: str, start: float,
+                result: subprocess.CompletedProcess | subprocess.CalledProcessError) -> None:
+        """
+        Record the latency, exit code and output size of a finished command.
+
+        Args:
+            category (str): The command category.
+            device (str): The device ID, or "" for server commands.
+            start (float): The `time.perf_counter()` value when the command started.
+            result (subprocess.CompletedProcess | subprocess.CalledProcessError): The outcome of the command.
+        """
+        output_bytes = len(result.stdout or "") + len(result.stderr or "")
+        self.command_stats.record(category, device, time.perf_counter() - start, result.returncode, output_bytes)
+
+    def _backend_shell(self, device: str, command: str,
+                       on_line: Callable[[str], None] | None = None) -> subprocess.CompletedProcess | None:
+        """
+        Run a shell command through the pool, socket or async backend.
+
+        Args:
+            device (str): The device ID.
+            command (str): The shell command line.
+            on_line (Callable[[str], None] | None): Called with each stdout line as it arrives, instead
+                of collecting stdout in the result. It runs on the calling thread with every backend.
+
+        Returns:
+            subprocess.CompletedProcess | None: The result, or None when the caller should spawn adb instead.
+            A command that failed after it may have run is reported with exit code -1 rather than
+            None, so that it is not run a second time.
+        """
+        try:
+            if self.adb_backend == "pool":
+                return self.session_pool.run(device, command, on_line=on_line)
+            if self.adb_backend == "socket":
+                return self.adb_client.shell(device, command, on_line)
+            if self.adb_backend == "async":
+                if on_line is not None:
+                    return self._stream_async(device, command, on_line)
+                adb = self.get_async_adb()
+                return adb.run(adb.shell(device, command))
+        except SessionClosedError:
+            return None
+        except (SessionError, AdbStreamError) as e:
+            return subprocess.CompletedProcess([str(self.adb_path), "-s", device, "shell", command], -1, "", str(e))
+        except (AdbError, OSError):
+            pass
+        return None
+
+    def _stream_async(self, device: str, command: str, on_line: Callable[[str], None]) -> subprocess.CompletedProcess:
+        """
+        Run a shell command on the event loop while its lines are handled on this thread.
+
+        The loop only queues the lines, so a slow `on_line` (such as a journal
+        write) never holds up the other devices' streams. If `on_line` raises,
+        the command is cancelled.
+
+        Args:
+            device (str): The device ID.
+            command (str): The shell command line.
+            on_line (Callable[[str], None]): Called with each stdout line.
+
+        Returns:
+            subprocess.CompletedProcess: The result of the command.
+        """
+        lines = queue.Queue()
+        adb = self.get_async_adb()
+        future = adb.submit(adb.shell(device, command, lines.put))
+        future.add_done_callback(lambda _: lines.put(None))
+        try:
+            while (line := lines.get()) is not None:
+                on_line(line)
+        except BaseException:
+            future.cancel()
+            raise
+        return future.result()
+
+    def ensure_server(self) -> None:
+        """Start the adb server unless one is already answering."""
+        if self.adb_client.is_server_alive():
+            self.log_message("ADB server is already running.")
+            return
+        self.log_message("ADB server is starting...")
+        self.execute("start-server")
+        self.log_message("ADB server started.")
+
+    def shutdown_server(self) -> None:
+        """Close the shell sessions and stop the adb server if it is running."""
+        self.session_pool.close_all()
+        self.close_async_adb()
+        if self.adb_client.is_server_alive():
+            self.adb_client.kill_server()
+
+    def get_device_model(self, device: str) -> str:
+        """
+        Get the model name of the connected device.
+
+        Args:
+            device (str): The device ID.
+
+        Returns:
+            str: The model name of the device.
+        """
+        try:
+            result = self.execute(f"-s {device} shell getprop ro.product.model")
+            if result and result.returncode == 0:
+                return result.stdout.strip()
+            return "unknown"
+        except Exception as e:
+            self.log_message(f"Failed to get model for device {device}: {e}")
+            return "unknown"
+
+    def list_devices(self) -> list[dict]:
+        """
+        List the devices reported by `adb devices -l`.
+
+        Returns:
+            list[dict]: The serial, state and details (such as model) of each device.
+        """
+        if self.adb_backend == "socket":
+            try:
+                return self.adb_client.devices()
+            except AdbError:
+                pass
+        result = self.execute("devices -l")
+        if not result:
+            return []
+        return parse_device_lines(result.stdout)
+
+    def ready_devices(self) -> list[str]:
+        """
+        List the serials of the authorized, connected devices.
+
+        Returns:
+            list[str]: The device IDs in the "device" state.
+        """
+        return [device["serial"] for device in self.list_devices() if device["state"] == "device"]
+
+    def resolve_device_models(self, devices: list[dict]) -> dict[str, str]:
+        """
+        Return the model of every ready device, memoized per serial.
+
+        Models come from the `model:` field of `adb devices -l`; devices without
+        it are looked up with concurrent getprop calls (see `shell_many`).
+
+        Args:
+            devices (list[dict]): The devices from `list_devices`.
+
+        Returns:
+            dict[str, str]: The model of each device in the "device" state.
+        """
+        ready = [device for device in devices if device["state"] == "device"]
+        for device in ready:
+            if device["serial"] not in self.device_models and device.get("model"):
+                self.device_models[device["serial"]] = device["model"].replace("_", " ")
+        missing = [device["serial"] for device in ready if device["serial"] not in self.device_models]
+        if missing:
+            results = self.shell_many([(serial, "getprop ro.product.model") for serial in missing])
+            for serial, result in zip(missing, results):
+                model = result.stdout.strip() if result and result.returncode == 0 else ""
+                self.device_models[serial] = model or "unknown"
+        return {device["serial"]: self.device_models[device["serial"]] for device in ready}
+
+    def fetch_inventory(self, device: str) -> tuple[list[dict], list[str]]:
+        """
+        Fetch the application list of a device through the inventory cache.
+
+        Args:
+            device (str): The device ID.
+
+        Returns:
+            tuple[list[dict], list[str]]: The application list and the names of the refetched sections.
+        """
+        apps, changed = self.inventory_cache.refresh(device, self.run_shell)
+        return list(apps), changed
+
+    def removed_packages(self, device: str) -> set[str]:
+        """
+        Get the packages uninstalled for user 0 but kept on a device, as of the last inventory fetch.
+
+        Args:
+            device (str): The device ID.
+
+        Returns:
+            set[str]: The package names.
+        """
+        return set(self.inventory_cache.removed.get(device, ()))
+
+    def fetch_package_metadata(self, device: str) -> dict[str, dict]:
+        """
+        Fetch version, installer, install times and sizes of every package.
+
+        One `dumpsys package` and one `dumpsys diskstats` run in a single round
+        trip, and their output is parsed while it streams in.
+
+        Args:
+            device (str): The device ID.
+
+        Returns:
+            dict[str, dict]: The metadata of each package (see `package_metadata.parse_metadata`).
+        """
+        return parse_metadata(self.stream_shell(device, METADATA_SCRIPT))
+
+    def uninstall_packages(self, device: str, apps: list[str], job: str | None = None) -> dict[str, tuple[int, str]]:
+        """
+        Uninstall packages for user 0 with a single generated shell script.
+
+        Args:
+            device (str): The device ID.
+            apps (list[str]): The package names to uninstall.
+            job (str | None): The journaled job to checkpoint each package in (see `run_job`).
+
+        Returns:
+            dict[str, tuple[int, str]]: The exit code and pm output for each package.
+        """
+        results = {app: (1, "Invalid package name") for app in apps if not is_valid_package(app)}
+        if job is not None:
+            for app, (code, message) in results.items():
+                self.job_journal.record(job, app, code, message)
+        valid_apps = [app for app in apps if app not in results]
+        if valid_apps:
+            self.log_message(f"Debloating {len(valid_apps)} application(s)...")
+            if job is not None:
+                results.update(self.stream_statuses(device, build_uninstall_script(valid_apps), job))
+            else:
+                result = self.run_shell(device, build_uninstall_script(valid_apps))
+                if result is None:
+                    raise Exception("Unknown error")
+                results.update(parse_status_lines(result.stdout))
+
+        return self._report_uninstall(device, apps, results)
+
+    def _report_uninstall(self, device: str, apps: list[str], results: dict[str, tuple[int, str]]) -> dict[str, tuple[int, str]]:
+        """Log the outcome of an uninstall; packages without a status count as failed."""
+        removed = 0
+        for app in apps:
+            code, message = results.setdefault(app, (1, "No status reported"))
+            if code == 0:
+                removed += 1
+                self.log_message(f"Successfully debloated on {device}: {app}")
+            else:
+                self.log_message(f"Failed to debloat {app} on {device}: {message}")
+        self.log_message(f"Debloated {removed} of {len(apps)} application(s) on {device}.")
+        return results
+
+    def check_root(self, device: str) -> bool:
+        """
+        Check if the device has root access.
+
+        Args:
+            device (str): The device ID.
+
+        Returns:
+            bool: True if `su` works on the device.
+        """
+        result = self.execute(f"-s {device} shell su -c echo rooted")
+        return bool(result and "rooted" in result.stdout)
+
+    def preflight_paths(self, device: str, lines: list[str]) -> tuple[dict[str, tuple[int, int]], int]:
+        """
+        Check which listed paths exist on a rooted device and how much space they use, in one round trip.
+
+        Args:
+            device (str): The device ID.
+            lines (list[str]): The lines of the path list, or the paths themselves.
+
+        Returns:
+            tuple[dict[str, tuple[int, int]], int]: The number of matches and their disk usage in bytes
+            for each normalized path, in list order (invalid paths have no matches), and the bytes
+            used by all matches together. Overlapping paths share bytes, so the per-path figures
+            do not add up to the total.
+        """
+        paths = list(iter_path_list(lines))
+        results = {path: (0, 0) for path in paths}
+        total = 0
+        valid_paths = [path for path in paths if is_valid_device_path(path)]
+        for path in paths:
+            if path not in valid_paths:
+                self.log_message(f"Skipping invalid path: {path}")
+        if valid_paths:
+            result = self.run_shell(device, build_preflight_script(valid_paths))
+            if result is None:
+                raise Exception("Unknown error")
+            statuses = parse_preflight_lines(result.stdout)
+            if not statuses and result.returncode != 0:
+                raise Exception(result.stderr.strip() or "Unknown error")
+            results.update((path, status) for path, status in statuses.items() if path in results)
+            total = statuses.get(PREFLIGHT_TOTAL, (0, 0))[1]
+        return results, total
+
+    def remove_paths(self, device: str, lines: list[str], batch: bool = True) -> dict[str, tuple[int, str]]:
+        """
+        Remove the paths listed in the lines of a text file from a rooted device.
+
+        Args:
+            device (str): The device ID.
+            lines (list[str]): The lines of the path list, or the paths themselves (see `iter_path_list`).
+            batch (bool): Whether to remove every path with one `su` script (see
+                `remove_paths_batched`) instead of one `rm` command per path. Defaults to True.
+
+        Returns:
+            dict[str, tuple[int, str]]: The exit code and message for each path.
+        """
+        paths = list(iter_path_list(lines))
+        if batch:
+            return self.remove_paths_batched(device, paths)
+        results = {}
+        if any(path == "/system" or path.startswith("/system/") for path in paths):
+            self.execute(f"-s {device} shell su -c mount -o rw,remount /system")
+            self.log_message("System mounted as READ/WRITE")
+
+        for app_path in paths:
+            result = self.execute(f"-s {device} shell rm -r {app_path}", print_log=False)
+            if result is None:
+                results[app_path] = (1, "Does not exist")
+                self.log_message(f"{app_path} already does not exist on {device}.")
+            elif result.returncode == 0:
+                results[app_path] = (0, "Removed")
+                self.log_message(f"Successfully removed: {app_path}")
+            else:
+                results[app_path] = (result.returncode, result.stderr.strip())
+                self.log_message(f"Failed to remove: {app_path}. Error: {result.stderr}")
+        return results
+
+    def remove_paths_batched(self, device: str, paths: list[str], job: str | None = None) -> dict[str, tuple[int, str]]:
+        """
+        Remove paths from a rooted device in one `su` round trip.
+
+        Glob patterns (e.g. `/system/vendor/operator/app/*.apk`) are expanded on
+        the device, and /system is remounted read-write first when needed.
+
+        Args:
+            device (str): The device ID.
+            paths (list[str]): The normalized paths or glob patterns.
+            job (str | None): The journaled job to checkpoint each path in (see `run_job`).
+
+        Returns:
+            dict[str, tuple[int, str]]: The exit code and message for each path; REMOVE_MISSING
+            marks paths that did not exist.
+        """
+        results = {path: (1, "Invalid path") for path in paths if not is_valid_device_path(path)}
+        if job is not None:
+            for path, (code, message) in results.items():
+                self.job_journal.record(job, path, code, message)
+        valid_paths = [path for path in paths if path not in results]
+        if valid_paths:
+            self.log_message(f"Removing {len(valid_paths)} path(s) on {device}...")
+            if job is not None:
+                statuses = self.stream_statuses(device, build_remove_script(valid_paths), job)
+                if not statuses:
+                    raise Exception("No status reported")
+            else:
+                result = self.run_shell(device, build_remove_script(valid_paths))
+                if result is None:
+                    raise Exception("Unknown error")
+                statuses = parse_status_lines(result.stdout)
+                if not statuses and result.returncode != 0:
+                    raise Exception(result.stderr.strip() or "Unknown error")
+            remount = statuses.pop(REMOUNT_ITEM, None)
+            if remount is not None:
+                if remount[0] == 0:
+                    self.log_message("System mounted as READ/WRITE")
+                else:
+                    self.log_message(f"Failed to remount /system: {remount[1]}")
+            results.update(statuses)
+
+        for path in paths:
+            code, message = results.setdefault(path, (1, "No status reported"))
+            if code == 0:
+                self.log_message(f"Successfully removed: {path} ({message})")
+            elif code == REMOVE_MISSING:
+                self.log_message(f"{path} already does not exist on {device}.")
+            else:
+                self.log_message(f"Failed to remove: {path}. Error: {message}")
+        return results
+
+    def start_job(self, device: str, kind: str, items: list[str]) -> str:
+        """
+        Plan a journaled batch job.
+
+        Args:
+            device (str): The device ID.
+            kind (str): "uninstall" (package names) or "remove-paths" (normalized paths).
+            items (list[str]): The items of the job.
+
+        Returns:
+            str: The job ID.
+        """
+        return self.job_journal.start(device, kind, items)
+
+    def run_job(self, job: str) -> dict[str, tuple[int, str]]:
+        """
+        Run the pending items of a journaled job, i.e. start it or resume it.
+
+        Items are checkpointed as their status arrives; the job is marked finished
+        once every item has a result.
+
+        Args:
+            job (str): The job ID.
+
+        Returns:
+            dict[str, tuple[int, str]]: The exit code and message of every item that has a result.
+        """
+        state = self.job_journal.load(job)
+        if state is None:
+            raise Exception(f"Unknown job: {job}")
+        pending = self.job_journal.pending(state)
+        if len(pending) < len(state["items"]):
+            self.log_message(f"Resuming job {job}: {len(pending)} of {len(state['items'])} item(s) pending.")
+        if pending:
+            if state["kind"] == "uninstall":
+                self.uninstall_packages(state["device"], pending, job)
+            else:
+                self.remove_paths_batched(state["device"], pending, job)
+        state = self.job_journal.load(job)
+        if not self.job_journal.pending(state):
+            self.job_journal.finish(job)
+        return state["results"]
+
+    def unfinished_jobs(self, device: str) -> list[str]:
+        """
+        Find the interrupted jobs of a device.
+
+        Args:
+            device (str): The device ID.
+
+        Returns:
+            list[str]: The IDs of the jobs with pending items, oldest first.
+        """
+        return [state["job"] for state in reversed(self.job_journal.jobs(device)) if not state["finished"]]
+
+    def restore_job(self, job: str) -> dict[str, tuple[int, str]]:
+        """
+        Reinstall the packages an uninstall job removed, with one `cmd package install-existing` script.
+
+        Args:
+            job (str): The job ID.
+
+        Returns:
+            dict[str, tuple[int, str]]: The exit code and output for each package.
+        """
+        state = self.job_journal.load(job)
+        if state is None:
+            raise Exception(f"Unknown job: {job}")
+        if state["kind"] != "uninstall":
+            raise Exception("Only uninstall jobs can be restored; removed files are gone.")
+        packages = [package for package in self.job_journal.restorable(state) if is_valid_package(package)]
+        if not packages:
+            self.log_message(f"Nothing to restore for job {job}.")
+            return {}
+        device = state["device"]
+        self.log_message(f"Restoring {len(packages)} application(s) on {device}...")
+        results = self.stream_statuses(device, build_restore_script(packages), job, "restore")
+        restored = 0
+        for package in packages:
+            code, message = results.setdefault(package, (1, "No status reported"))
+            if code == 0:
+                restored += 1
+            else:
+                self.log_message(f"Failed to restore {package} on {device}: {message}")
+        self.log_message(f"Restored {restored} of {len(packages)} application(s) on {device}.")
+        return results
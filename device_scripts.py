@@ -0,0 +1,187 @@
+import re
+
+STATUS_PREFIX: str = "__UNBLOAT__"
+PACKAGE_PATTERN = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+# Absolute paths made of characters that need no quoting, plus the glob characters * ? [ ].
+DEVICE_PATH_PATTERN = re.compile(r"^/[A-Za-z0-9_.,+@%=:~/*?\[\]-]*$")
+REMOUNT_ITEM: str = "remount:/system"
+# The preflight status line holding the combined disk usage of every match.
+PREFLIGHT_TOTAL: str = "total"
+REMOVE_MISSING: int = 2
+
+
+def is_valid_package(package: str) -> bool:
+    """
+    Check that a package name is safe to embed in a shell script.
+
+    Args:
+        package (str): The package name.
+
+    Returns:
+        bool: True if the name only contains package name characters.
+    """
+    return bool(PACKAGE_PATTERN.match(package))
+
+
+def is_valid_device_path(path: str) -> bool:
+    """
+    Check that a device path is safe to embed in a shell script.
+
+    Args:
+        path (str): The absolute path, which may contain glob characters.
+
+    Returns:
+        bool: True if the path only contains characters that need no quoting.
+    """
+    return bool(DEVICE_PATH_PATTERN.match(path)) and "/../" not in f"{path}/"
+
+
+def build_uninstall_script(packages: list[str]) -> str:
+    """
+    Build one shell script that uninstalls every package for user 0.
+
+    The script prints one status line per package:
+    `__UNBLOAT__|<package>|<exit code>|<pm output>`.
+
+    Args:
+        packages (list[str]): The package names to uninstall.
+
+    Returns:
+        str: The shell script.
+    """
+    return (
+        f"for p in {' '.join(packages)}; do "
+        f"r=$(pm uninstall -k --user 0 \"$p\" 2>&1); s=$?; "
+        f"echo \"{STATUS_PREFIX}|$p|$s|$(printf '%s' \"$r\" | tr '\\n' ' ')\"; "
+        f"done"
+    )
+
+
+def build_restore_script(packages: list[str]) -> str:
+    """
+    Build one shell script that reinstalls packages kept on the device for user 0.
+
+    This undoes `pm uninstall -k --user 0`. The script prints one status line per
+    package, like `build_uninstall_script`.
+
+    Args:
+        packages (list[str]): The package names to restore.
+
+    Returns:
+        str: The shell script.
+    """
+    return (
+        f"for p in {' '.join(packages)}; do "
+        f"r=$(cmd package install-existing --user 0 \"$p\" 2>&1); s=$?; "
+        f"echo \"{STATUS_PREFIX}|$p|$s|$(printf '%s' \"$r\" | tr '\\n' ' ')\"; "
+        f"done"
+    )
+
+
+def parse_status_lines(output: str) -> dict[str, tuple[int, str]]:
+    """
+    Parse the status lines printed by a generated script.
+
+    Args:
+        output (str): The stdout of the script.
+
+    Returns:
+        dict[str, tuple[int, str]]: The exit code and message for each item.
+    """
+    results = {}
+    for line in output.splitlines():
+        if not line.startswith(STATUS_PREFIX):
+            continue
+        _, item, code, message = line.split("|", 3)
+        results[item] = (int(code) if code.lstrip("-").isdigit() else 1, message.strip())
+    return results
+
+
+def build_remove_script(paths: list[str]) -> str:
+    """
+    Build one `su -c` command that removes every path, expanding globs on the device.
+
+    /system is remounted read-write first if any path is under it. The script
+    prints one status line per path:
+    `__UNBLOAT__|<path>|<code>|matched=<n> removed=<n>[ error=<rm output>]`, where
+    the code is 0 when every match was removed, REMOVE_MISSING when nothing
+    matched and 1 when a removal failed. The remount reports as REMOUNT_ITEM.
+
+    Args:
+        paths (list[str]): The paths or glob patterns, checked with `is_valid_device_path`.
+
+    Returns:
+        str: The shell command line.
+    """
+    remount = ""
+    if any(path == "/system" or path.startswith("/system/") for path in paths):
+        remount = (
+            "r=$(mount -o rw,remount /system 2>&1); "
+            f"echo \"{STATUS_PREFIX}|{REMOUNT_ITEM}|$?|$(printf %s \"$r\" | tr \"\\n\" \" \")\"; "
+        )
+    quoted = " ".join(f'"{path}"' for path in paths)
+    script = (
+        f"{remount}for p in {quoted}; do "
+        "n=0; k=0; e=; "
+        "for t in $p; do "
+        "if [ -e \"$t\" ] || [ -L \"$t\" ]; then "
+        "n=$((n+1)); "
+        "if r=$(rm -rf \"$t\" 2>&1); then k=$((k+1)); else e=$(printf %s \"$r\" | tr \"\\n\" \" \"); fi; "
+        "fi; "
+        "done; "
+        f"if [ $n -eq 0 ]; then s={REMOVE_MISSING}; elif [ $k -eq $n ]; then s=0; else s=1; fi; "
+        f"echo \"{STATUS_PREFIX}|$p|$s|matched=$n removed=$k${{e:+ error=$e}}\"; "
+        "done"
+    )
+    return f"su -c '{script}'"
+
+
+def build_preflight_script(paths: list[str]) -> str:
+    """
+    Build one `su -c` command that counts the matches and disk usage of every path.
+
+    The script prints one line per path:
+    `__UNBLOAT__|<path>|<number of matches>|<disk usage in KiB>`, then a
+    PREFLIGHT_TOTAL line with the usage of all matches from one `du -c`, which
+    counts paths that overlap (a folder and a glob inside it) only once.
+
+    Args:
+        paths (list[str]): The paths or glob patterns, checked with `is_valid_device_path`.
+
+    Returns:
+        str: The shell command line.
+    """
+    quoted = " ".join(f'"{path}"' for path in paths)
+    script = (
+        "a=; m=0; "
+        f"for p in {quoted}; do "
+        "n=0; k=0; "
+        "for t in $p; do if [ -e \"$t\" ] || [ -L \"$t\" ]; then n=$((n+1)); a=\"$a $t\"; fi; done; "
+        "if [ $n -gt 0 ]; then "
+        "k=$(du -sk $p 2>/dev/null | { c=0; while read s r; do c=$((c+${s:-0})); done; echo $c; }); "
+        "fi; "
+        "m=$((m+n)); "
+        f"echo \"{STATUS_PREFIX}|$p|$n|${{k:-0}}\"; "
+        "done; "
+        "k=0; "
+        "if [ -n \"$a\" ]; then k=$(du -skc $a 2>/dev/null | { c=0; while read s r; do c=${s:-0}; done; echo $c; }); fi; "
+        f"echo \"{STATUS_PREFIX}|{PREFLIGHT_TOTAL}|$m|${{k:-0}}\""
+    )
+    return f"su -c '{script}'"
+
+
+def parse_preflight_lines(output: str) -> dict[str, tuple[int, int]]:
+    """
+    Parse the output of a preflight script.
+
+    Args:
+        output (str): The stdout of the script.
+
+    Returns:
+        dict[str, tuple[int, int]]: The number of matches and their disk usage in bytes for each path,
+        and for PREFLIGHT_TOTAL.
+    """
+    return {
+        path: (matches, int(kbytes) * 1024 if kbytes.isdigit() else 0)
+        for path, (matches, kbytes) in parse_status_lines(output).items()
+    }
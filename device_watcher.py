@@ -0,0 +1,65 @@
+import threading
+from typing import Callable
+from adb_client import AdbClient, AdbError
+
+POLL_INTERVAL: float = 2.0
+
+
+class DeviceWatcher:
+    """Follows device hot-plug events from the adb server on a background thread."""
+
+    def __init__(self, client: AdbClient, on_change: Callable[[list[dict]], None],
+                 poll: Callable[[], list[dict]] | None = None):
+        """
+        Initialize the watcher.
+
+        Args:
+            client (AdbClient): The client used for the `track-devices` stream.
+            on_change (Callable[[list[dict]], None]): Called with the device list whenever it changes.
+            poll (Callable[[], list[dict]] | None): Lists devices when the stream is unavailable.
+        """
+        self.client = client
+        self.on_change = on_change
+        self.poll = poll
+        self.stop_event = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.sock = None
+        self.last_devices: list[dict] | None = None
+
+    def start(self) -> None:
+        """Start watching, unless the watcher is already running."""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and close the tracker stream."""
+        self.stop_event.set()
+        sock, self.sock = self.sock, None
+        if sock:
+            sock.close()
+
+    def _publish(self, devices: list[dict]) -> None:
+        """Report a device list if it differs from the last one."""
+        if devices != self.last_devices:
+            self.last_devices = devices
+            self.on_change(devices)
+
+    def _run(self) -> None:
+        """Consume the tracker stream, polling while it cannot be opened."""
+        while not self.stop_event.is_set():
+            try:
+                self.sock = self.client.open_device_tracker()
+                while not self.stop_event.is_set():
+                    self._publish(self.client.read_device_list(self.sock))
+            except AdbError:
+                if self.stop_event.is_set():
+                    return
+                if self.poll:
+                    try:
+                        self._publish(self.poll())
+                    except Exception:
+                        pass
+            self.stop_event.wait(POLL_INTERVAL)
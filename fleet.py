@@ -0,0 +1,73 @@
+from typing import Callable
+
+FLEET_MAX_WORKERS: int = 16
+
+
+def run_on_fleet(devices: list[str], task: Callable[[str], dict], max_workers: int = FLEET_MAX_WORKERS) -> dict[str, dict]:
+    """
+    Run a task on every device concurrently, one lane per device.
+
+    Args:
+        devices (list[str]): The device IDs.
+        task (Callable[[str], dict]): The task, called with a device ID, returning a result per package.
+        max_workers (int): The upper bound of concurrently served devices.
+
+    Returns:
+        dict[str, dict]: The result of the task for each device. A device whose
+        task raised is mapped to {"error": <message>}.
+    """
+    if not devices:
+        return {}
+    from concurrent.futures import ThreadPoolExecutor
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(len(devices), max_workers), thread_name_prefix="fleet") as executor:
+        futures = {device: executor.submit(task, device) for device in devices}
+        for device, future in futures.items():
+            try:
+                results[device] = future.result()
+            except Exception as e:
+                results[device] = {"error": str(e)}
+    return results
+
+
+def aggregate_by_package(results: dict[str, dict[str, tuple[int, str]]]) -> dict[str, dict[str, tuple[int, str]]]:
+    """
+    Pivot per-device results into per-package results.
+
+    Args:
+        results (dict[str, dict[str, tuple[int, str]]]): The exit code and message per package for each device.
+
+    Returns:
+        dict[str, dict[str, tuple[int, str]]]: The exit code and message per device for each package.
+    """
+    by_package = {}
+    for device, packages in results.items():
+        if "error" in packages:
+            continue
+        for package, status in packages.items():
+            by_package.setdefault(package, {})[device] = status
+    return by_package
+
+
+def summarize(results: dict[str, dict[str, tuple[int, str]]]) -> list[str]:
+    """
+    Build human-readable summary lines for a fleet run.
+
+    Args:
+        results (dict[str, dict[str, tuple[int, str]]]): The exit code and message per package for each device.
+
+    Returns:
+        list[str]: One line per device followed by one line per package.
+    """
+    lines = []
+    for device, packages in results.items():
+        if "error" in packages:
+            lines.append(f"{device}: error: {packages['error']}")
+            continue
+        succeeded = sum(1 for code, _ in packages.values() if code == 0)
+        lines.append(f"{device}: {succeeded} succeeded, {len(packages) - succeeded} failed")
+    for package, devices in aggregate_by_package(results).items():
+        succeeded = sum(1 for code, _ in devices.values() if code == 0)
+        lines.append(f"{package}: removed on {succeeded}/{len(devices)} device(s)")
+    return lines
@@ -1,12 +1,40 @@
 import sys
 import queue
+import time
 import threading
-import subprocess
 import tkinter as tk
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from default_packages import get_packages
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from search_index import SearchIndex
+from adb_session import InteractiveShell, SessionError
+from path_list import format_bytes
+from command_stats import CommandStats, PERCENTILES
+from preset_index import PresetMatchIndex
+from job_journal import JobJournal
+from tkinter import ttk
+
+SEARCH_DEBOUNCE_MS: int = 150
+LOG_DRAIN_MS: int = 100
+LOG_MAX_LINES: int = 2000
+STATS_REFRESH_MS: int = 1000
+TERMINAL_MAX_LINES: int = 5000
+TERMINAL_FRAME_BUDGET_MS: float = 12.0
+TERMINAL_CHUNK_CHARS: int = 65536
+TERMINAL_POLL_MIN_MS: int = 15
+TERMINAL_POLL_MAX_MS: int = 200
+# Column id, heading and width of the Applications view.
+APP_TREE_COLUMNS: tuple[tuple[str, str, int], ...] = (
+    ("package", "Package Name", 320),
+    ("status", "Status", 70),
+    ("type", "Type", 60),
+    ("version", "Version", 90),
+    ("installer", "Installer", 140),
+    ("first_install", "Installed", 125),
+    ("last_update", "Updated", 125),
+    ("code_size", "App Size", 75),
+    ("data_size", "Data Size", 75),
+)
 
 
 class GUI:
@@ -24,13 +52,27 @@ class GUI:
         self.root.title(window_title)
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.root_mode: bool = False
+        self.fleet_mode: bool = False
         self.app_list: list = []
+        self.app_tree_items: dict[str, str] = {}
+        self.app_tree_values: dict[str, tuple] = {}
+        self.app_tree_shown: list[str] = []
+        self.app_search_index: SearchIndex | None = None
+        self.app_search_source: list | None = None
+        self.pending_filter: str | None = None
+        self.log_queue: queue.Queue = queue.Queue()
+        self.ui_queue: queue.Queue = queue.Queue()
+        self.log_history: list[str] = []
         self.old_stdout = sys.stdout
         sys.stdout = self
-        self.package_tree_holder: ttk.Treeview | None = None
         self.package_command: callable | None = None
+        self.package_manager: DefaultPackageManager | None = None
+        self.preset_index: PresetMatchIndex | None = None
         self.adb_path: Path | None = None
+        self.command_stats: CommandStats | None = None
+        self.job_journal: JobJournal | None = None
         self._setup_ui()
+        self.root.after(LOG_DRAIN_MS, self._poll_queues)
 
     @staticmethod
     def set_icon(root: tk.Tk, icon_path: Path) -> None:
@@ -82,14 +124,11 @@ class GUI:
         )
         app_list_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.app_tree: ttk.Treeview = ttk.Treeview(
-            app_list_frame, columns=("package", "status", "type"), show="headings"
+            app_list_frame, columns=tuple(column for column, _, _ in APP_TREE_COLUMNS), show="headings"
         )
-        self.app_tree.heading("package", text="Package Name")
-        self.app_tree.heading("status", text="Status")
-        self.app_tree.heading("type", text="Type")
-        self.app_tree.column("package", width=400)
-        self.app_tree.column("status", width=100)
-        self.app_tree.column("type", width=100)
+        for column, heading, width in APP_TREE_COLUMNS:
+            self.app_tree.heading(column, text=heading)
+            self.app_tree.column(column, width=width)
         self.app_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         app_list_scrollbar: ttk.Scrollbar = ttk.Scrollbar(
             app_list_frame, command=self.app_tree.yview
@@ -144,9 +183,9 @@ class GUI:
             parent_frame, text="Uninstall Selected", command=self.debloat_selected
         )
         self.debloat_button.pack(side=tk.LEFT, padx=5, pady=5)
-        self.remove_files_button: ttk.Button = ttk.Button(
-            parent_frame, text="Remove Files from Txt", command=self.remove_apps_from_path
-        )
+        # Root mode widgets are only built the first time root mode is switched on.
+        self.button_frame: ttk.LabelFrame = parent_frame
+        self.remove_files_button: ttk.Button | None = None
         self.manage_packages_button: ttk.Button = ttk.Button(
             parent_frame, text="Manage Packages", command=self.open_package_manager
         )
@@ -162,6 +201,19 @@ class GUI:
         self.root.config(menu=menu)
         root_menu: tk.Menu = tk.Menu(menu, tearoff=0)
         root_menu.add_command(label="Root Mode", command=self.toggle_root_mode)
+        root_menu.add_command(label="Fleet Mode", command=self.toggle_fleet_mode)
+        backend_menu: tk.Menu = tk.Menu(root_menu, tearoff=0)
+        self.backend_var: tk.StringVar = tk.StringVar(value="pool")
+        for label, backend in (("Shell Session Pool", "pool"), ("ADB Server Socket", "socket"),
+                               ("Asyncio Event Loop", "async"), ("ADB Binary", "spawn")):
+            backend_menu.add_radiobutton(
+                label=label, value=backend, variable=self.backend_var, command=self.select_adb_backend
+            )
+        root_menu.add_cascade(label="ADB Backend", menu=backend_menu)
+        root_menu.add_command(label="Command Stats...", command=self.open_command_stats)
+        root_menu.add_command(label="Jobs...", command=self.open_jobs)
+        root_menu.add_command(label="Cancel Tasks", command=self.cancel_tasks)
+        root_menu.add_command(label="Save Logs...", command=self.save_logs)
         menu.add_cascade(label="Option", menu=root_menu)
         self.menu: tk.Menu = menu
         self.root_menu: tk.Menu = root_menu
@@ -178,11 +230,30 @@ class GUI:
             self.root_menu.entryconfig("Root Mode ✓", label="Root Mode")
             self._switch_to_normal_mode()
 
+    def toggle_fleet_mode(self) -> None:
+        """Toggle fleet mode, in which uninstalls, fetches and path removals apply to every connected device."""
+        self.fleet_mode = not self.fleet_mode
+        if self.fleet_mode:
+            self.log_message("Fleet mode is activated: uninstalls, fetches and path removals apply to all connected devices")
+            self.root_menu.entryconfig("Fleet Mode", label="Fleet Mode ✓")
+        else:
+            self.log_message("Fleet mode is deactivated")
+            self.root_menu.entryconfig("Fleet Mode ✓", label="Fleet Mode")
+
+    def select_adb_backend(self) -> None:
+        """Apply the ADB backend chosen in the Option menu."""
+        self.adb_backend = self.backend_var.get()
+        self.log_message(f"ADB backend: {self.adb_backend}")
+
     def _switch_to_root_mode(self) -> None:
         """Switch to root mode UI."""
         self.load_apps_button.pack_forget()
         self.debloat_button.pack_forget()
         self.manage_packages_button.pack_forget()
+        if self.remove_files_button is None:
+            self.remove_files_button = ttk.Button(
+                self.button_frame, text="Remove Files from Txt", command=self.remove_apps_from_path
+            )
         self.remove_files_button.pack(side=tk.LEFT, padx=5, pady=5)
 
     def _switch_to_normal_mode(self) -> None:
@@ -190,7 +261,8 @@ class GUI:
         self.load_apps_button.pack(side=tk.LEFT, padx=5, pady=5)
         self.debloat_button.pack(side=tk.LEFT, padx=5, pady=5)
         self.manage_packages_button.pack(side=tk.LEFT, padx=5, pady=5)
-        self.remove_files_button.pack_forget()
+        if self.remove_files_button is not None:
+            self.remove_files_button.pack_forget()
 
     def show_permission_warning(self, device_id: str) -> None:
         """
@@ -199,6 +271,8 @@ class GUI:
         Args:
             device_id (str): The ID of the unauthorized device.
         """
+        from tkinter import messagebox
+
         messagebox.showwarning(
             "Permission Needed",
             f"The device ({device_id}) is unauthorized. Please allow USB Debugging on the device.",
@@ -206,15 +280,66 @@ class GUI:
 
     def log_message(self, message: str) -> None:
         """
-        Log a message to the log text widget.
+        Queue a message for the log text widget. Safe to call from any thread.
 
         Args:
             message (str): The message to log.
         """
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        full_message = f"[{current_time}] {message}\n"
-        self.log_text.insert(tk.END, full_message)
-        self.log_text.yview(tk.END)
+        self.log_queue.put(f"[{current_time}] {message}\n")
+
+    def run_on_ui(self, callback: callable, *args) -> None:
+        """
+        Schedule a callback on the Tk thread. Safe to call from any thread.
+
+        Args:
+            callback (callable): The function to call.
+            *args: The arguments to pass to the callback.
+        """
+        self.ui_queue.put((callback, args))
+
+    def _poll_queues(self) -> None:
+        """Run queued UI callbacks and flush queued log messages on the Tk thread."""
+        while True:
+            try:
+                callback, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                self.log_message(f"UI update failed: {e}")
+        self._drain_log_queue()
+        self.root.after(LOG_DRAIN_MS, self._poll_queues)
+
+    def _drain_log_queue(self) -> None:
+        """Insert queued log messages in one batch on the Tk thread and trim the scrollback."""
+        batch = []
+        while True:
+            try:
+                batch.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self.log_history.extend(batch)
+            self.log_text.insert(tk.END, "".join(batch[-LOG_MAX_LINES:]))
+            excess = int(self.log_text.index("end-1c").split(".")[0]) - LOG_MAX_LINES
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+            self.log_text.yview(tk.END)
+
+    def save_logs(self) -> None:
+        """Save the full log history, including lines trimmed from the widget, to a text file."""
+        from tkinter import filedialog
+
+        file_path = filedialog.asksaveasfilename(
+            title="Save Logs", defaultextension=".txt", filetypes=(("Text Files", "*.txt"), ("All Files", "*.*"))
+        )
+        if not file_path:
+            return
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.writelines(self.log_history)
+        self.log_message(f"Saved {len(self.log_history)} log messages to {file_path}")
 
     def write(self, message: str) -> None:
         """
@@ -251,7 +376,7 @@ class GUI:
         """Load applications from the device (overridden in AndroidDebloater class)."""
         pass
 
-    def debloat_selected(self, package_tree: ttk.Treeview = None) -> None:
+    def debloat_selected(self) -> None:
         """
         Uninstall the selected applications. (overridden in AndroidDebloater class)."""
         pass
@@ -260,39 +385,300 @@ class GUI:
         """Remove applications listed in a text file (overridden in AndroidDebloater class)."""
         pass
 
+    def cancel_tasks(self) -> None:
+        """Cancel the background tasks (overridden in AndroidDebloater class)."""
+        pass
+
     def update_app_tree(self) -> None:
-        """Update the application list tree view based on search query."""
-        search_query = self.search_var.get().lower()
-        filtered_apps = [
-            app for app in self.app_list if search_query in app["package"].lower()
-        ]
-        for row in self.app_tree.get_children():
-            self.app_tree.delete(row)
-        for app in filtered_apps:
-            self.app_tree.insert("", tk.END, values=(app["package"], app["status"], app["type"]))
+        """
+        Update the application list tree view based on search query.
+
+        Rows are kept in `app_tree_items` (package -> item id) and only the
+        detach, reattach, move, update and delete operations needed to go from
+        the shown rows to the new filtered list are applied.
+        """
+        filtered_apps = self._search_apps(self.search_var.get())
+        new_order = [app["package"] for app in filtered_apps]
+        wanted = set(new_order)
+        shown = set(self.app_tree_shown)
+        known = {app["package"] for app in self.app_list}
+
+        for package in [package for package in self.app_tree_items if package not in known]:
+            self.app_tree.delete(self.app_tree_items.pop(package))
+            self.app_tree_values.pop(package, None)
+            shown.discard(package)
+        hidden = [self.app_tree_items[package] for package in shown if package not in wanted]
+        if hidden:
+            self.app_tree.detach(*hidden)
+
+        kept = [package for package in self.app_tree_shown if package in wanted and package in shown]
+        reorder = kept != [package for package in new_order if package in shown]
+        for index, app in enumerate(filtered_apps):
+            package = app["package"]
+            values = self._app_tree_row(app)
+            item = self.app_tree_items.get(package)
+            if item is None:
+                self.app_tree_items[package] = self.app_tree.insert("", index, values=values)
+                self.app_tree_values[package] = values
+                continue
+            if self.app_tree_values.get(package) != values:
+                self.app_tree.item(item, values=values)
+                self.app_tree_values[package] = values
+            if reorder or package not in shown:
+                self.app_tree.move(item, "", index)
+        self.app_tree_shown = new_order
+
+    @staticmethod
+    def _app_tree_row(app: dict) -> tuple:
+        """
+        Build the Treeview values of an application.
+
+        Args:
+            app (dict): The application entry.
+
+        Returns:
+            tuple: The column values. The metadata columns stay empty until the enrichment arrives.
+        """
+        installer = app.get("installer", "")
+        return (
+            app["package"], app["status"], app["type"],
+            app.get("version", ""),
+            "" if installer == "null" else installer,
+            app.get("first_install", ""),
+            app.get("last_update", ""),
+            format_bytes(app["code_size"]) if "code_size" in app else "",
+            format_bytes(app["data_size"]) if "data_size" in app else "",
+        )
+
+    def _search_apps(self, query: str) -> list[dict]:
+        """
+        Find the applications whose package name contains the query.
+
+        The search index is rebuilt only when `app_list` is replaced, i.e. once per inventory load or debloat.
+
+        Args:
+            query (str): The search text.
+
+        Returns:
+            list[dict]: The matching applications, in list order.
+        """
+        if self.app_search_index is None or self.app_search_source is not self.app_list:
+            self.app_search_source = self.app_list
+            self.app_search_index = SearchIndex([app["package"] for app in self.app_list])
+        apps = self.app_search_source
+        return [apps[position] for position in self.app_search_index.search(query)]
 
     def filter_app_list(self, *args) -> None:
-        """Filter the application list based on search input."""
+        """Filter the application list based on search input, once a burst of keystrokes settles."""
+        if self.pending_filter is not None:
+            self.root.after_cancel(self.pending_filter)
+        self.pending_filter = self.root.after(SEARCH_DEBOUNCE_MS, self._apply_app_filter)
+
+    def _apply_app_filter(self) -> None:
+        """Run the debounced application filter."""
+        self.pending_filter = None
         self.update_app_tree()
 
     def open_package_manager(self) -> None:
         """Open the package manager window."""
-        package_manager = DefaultPackageManager(self.root, self.package_command)
-        self.package_tree_holder = package_manager.get_package_tree()
+        self.package_manager = DefaultPackageManager(self.root, self.package_command, self.get_preset_index())
+
+    def get_preset_index(self) -> PresetMatchIndex:
+        """Return the index matching the preset packages with the device inventory, building it on first use."""
+        if self.preset_index is None:
+            from package_database import get_database
+
+            self.preset_index = PresetMatchIndex(get_database().entries())
+        return self.preset_index
+
+    def update_preset_matches(self, device: str, installed: list[str], removed: set[str]) -> None:
+        """
+        Match the preset packages with a new device inventory. Runs on the Tk thread.
+
+        Args:
+            device (str): The device ID.
+            installed (list[str]): The installed packages.
+            removed (set[str]): The packages uninstalled for user 0 but kept on the device.
+        """
+        self._refresh_package_manager(self.get_preset_index().update(device, installed, removed))
+
+    def mark_presets_removed(self, device: str, packages: set[str]) -> None:
+        """
+        Record uninstalled packages in the preset match index. Runs on the Tk thread.
+
+        Args:
+            device (str): The device the packages were uninstalled from.
+            packages (set[str]): The uninstalled packages.
+        """
+        if self.preset_index is not None and self.preset_index.device == device:
+            self._refresh_package_manager(self.preset_index.mark_removed(packages))
+
+    def _refresh_package_manager(self, changed: set[str]) -> None:
+        """Show the new state of the changed preset packages if the package manager is open."""
+        if changed and self.package_manager is not None and self.package_manager.package_window.winfo_exists():
+            self.package_manager.refresh_matches(changed)
 
     def open_terminal(self) -> None:
         """Open the terminal."""
         try:
             model, device_id = self.device_var.get().rsplit(" - ", 1)
-            terminal_window = Terminal(self.root, model, device_id, self.adb_path)
+            terminal_window = Terminal(self.root, model, device_id, self.adb_path, self.command_stats)
         except (IndexError, ValueError):
             self.log_message("No device selected or invalid device ID.")
 
+    def open_command_stats(self) -> None:
+        """Open the command latency statistics window."""
+        if self.command_stats is None:
+            self.log_message("No command statistics available.")
+            return
+        CommandStatsWindow(self.root, self.command_stats)
+
+    def open_jobs(self) -> None:
+        """Open the window listing the journaled batch jobs of the selected device."""
+        device = self.device_var.get().rsplit(" - ", 1)[-1] if self.device_var.get() else None
+        JobsWindow(self.root, self.job_journal, device, self.resume_job, self.restore_removed)
+
+    def resume_job(self, job: str) -> None:
+        """Resume an interrupted job (overridden in AndroidDebloater class)."""
+        pass
+
+    def restore_removed(self, job: str) -> None:
+        """Reinstall the packages removed by a job (overridden in AndroidDebloater class)."""
+        pass
+
+
+class JobsWindow:
+    """Window listing the journaled batch jobs, to resume interrupted ones or restore what they removed."""
+
+    def __init__(self, root: tk.Tk, journal: JobJournal, device: str | None, resume: callable, restore: callable):
+        """
+        Initialize the jobs window.
+
+        Args:
+            root (tk.Tk): The root Tkinter window.
+            journal (JobJournal): The job journals.
+            device (str | None): Only show the jobs of this device, if given.
+            resume (callable): Called with a job ID to resume it.
+            restore (callable): Called with a job ID to restore its removed packages.
+        """
+        self.journal = journal
+        self.device = device
+        self.resume = resume
+        self.restore = restore
+        self.window = tk.Toplevel(root)
+        self.window.title(f"Jobs - {device}" if device else "Jobs")
+        self.window.geometry("900x400")
+
+        columns = ("Job", "Kind", "Started", "Items", "Done", "Failed", "Pending", "Restorable")
+        self.tree = ttk.Treeview(self.window, columns=columns, show="headings", selectmode="browse")
+        for column in columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=300 if column == "Job" else 80, anchor=tk.W if column == "Job" else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(button_frame, text="Resume", command=lambda: self._run(self.resume)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Restore Removed", command=lambda: self._run(self.restore)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Refresh", command=self.refresh).pack(side=tk.LEFT, padx=5)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Reload the journals."""
+        if not self.window.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for state in self.journal.jobs(self.device):
+            failed = sum(code != 0 for code, _ in state["results"].values())
+            self.tree.insert("", tk.END, iid=state["job"], values=(
+                state["job"], state["kind"], datetime.fromtimestamp(state["created"]).strftime("%Y-%m-%d %H:%M:%S"),
+                len(state["items"]), len(state["results"]) - failed, failed,
+                len(self.journal.pending(state)), len(self.journal.restorable(state)),
+            ))
+
+    def _run(self, action: callable) -> None:
+        """Run an action on the selected job and refresh the list once it had time to start."""
+        selection = self.tree.selection()
+        if selection:
+            action(selection[0])
+            self.window.after(STATS_REFRESH_MS, self.refresh)
+
+
+class CommandStatsWindow:
+    """Window showing the latency percentiles of the adb commands run so far."""
+
+    def __init__(self, root: tk.Tk, stats: CommandStats):
+        """
+        Initialize the statistics window.
+
+        Args:
+            root (tk.Tk): The root Tkinter window.
+            stats (CommandStats): The statistics to show.
+        """
+        self.stats = stats
+        self.window = tk.Toplevel(root)
+        self.window.title("Command Stats")
+        self.window.geometry("900x400")
+
+        columns = ("Category", "Device", "Count") + tuple(f"p{percent} (ms)" for percent in PERCENTILES) + (
+            "Max (ms)", "Errors", "Output (bytes)")
+        self.tree = ttk.Treeview(self.window, columns=columns, show="headings")
+        for column in columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=160 if column in ("Category", "Device") else 80,
+                             anchor=tk.W if column in ("Category", "Device") else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(button_frame, text="Export JSON...", command=lambda: self.export(".json")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Export CSV...", command=lambda: self.export(".csv")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Redraw the table and schedule the next refresh while the window is open."""
+        if not self.window.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for row in self.stats.summary():
+            self.tree.insert("", tk.END, values=(
+                row["category"], row["device"], row["count"],
+                *(f"{row[f'p{percent}_ms']:.1f}" for percent in PERCENTILES),
+                f"{row['max_ms']:.1f}", row["errors"], row["output_bytes"]
+            ))
+        self.window.after(STATS_REFRESH_MS, self.refresh)
+
+    def export(self, extension: str) -> None:
+        """
+        Export the statistics to a file chosen by the user.
+
+        Args:
+            extension (str): ".json" or ".csv".
+        """
+        from tkinter import filedialog
+
+        label = "JSON Files" if extension == ".json" else "CSV Files"
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window, title="Export Command Stats", defaultextension=extension,
+            filetypes=((label, f"*{extension}"), ("All Files", "*.*"))
+        )
+        if file_path:
+            self.stats.export(Path(file_path))
+
+    def reset(self) -> None:
+        """Forget the recorded commands."""
+        self.stats.clear()
+        self.tree.delete(*self.tree.get_children())
+
 
 class Terminal:
     """Class representing a terminal."""
 
-    def __init__(self, root: tk.Tk, model: str, device_id: str, adb_path: Path):
+    # Whether `su` worked, per device serial, shared by every terminal window.
+    root_access: dict[str, bool] = {}
+
+    def __init__(self, root: tk.Tk, model: str, device_id: str, adb_path: Path, command_stats: CommandStats | None = None):
         """
         Initialize the Terminal.
 
@@ -301,6 +687,7 @@ class Terminal:
             model (str): The device model.
             device_id (str): The selected device ID.
             adb_path (Path): The path to the ADB executable.
+            command_stats (CommandStats | None): Where to record the latency of the commands, if anywhere.
         """
         self.terminal_window = tk.Toplevel(root)
         self.terminal_window.title("ADB Shell")
@@ -311,16 +698,29 @@ class Terminal:
         self.model = model
         self.device_id = device_id
         self.adb_path = adb_path
+        self.command_stats = command_stats
         self.command_history = []
         self.history_index = 0
-        self.process = None
         self.output_queue = queue.Queue()
         self.is_root = False
-
-        # Set terminal style
+        self.running: tuple[str, float] | None = None
+        self.output_bytes = 0
+        self.su_output: list[str] | None = None
+        self.user_shell: InteractiveShell | None = None
+        self.root_shell: InteractiveShell | None = None
+        # Output waiting to be rendered: (tag, text) chunks, prompts (None) and root switches.
+        self.pending_output: deque = deque()
+        self.pending_lines = 0
+        self.poll_delay = TERMINAL_POLL_MIN_MS
+        self.spool_file = None
+        self.spool_lock = threading.Lock()
+
+        from tkinter import scrolledtext
+
+        # Set terminal style. Undo is off: its stack would keep every output chunk.
         self.terminal_text = scrolledtext.ScrolledText(
             self.terminal_window, wrap=tk.WORD, height=20, width=50, relief=tk.FLAT,
-            bg="#000000", fg="white", insertbackground="white", undo=True
+            bg="#000000", fg="white", insertbackground="white", undo=False
         )
         self.terminal_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         self._bind_events()
@@ -328,13 +728,118 @@ class Terminal:
         # Configure tags for prompt and command/output
         self.terminal_text.tag_config("prompt", foreground="#00FF00")
         self.terminal_text.tag_config("command_output", foreground="white")
+        self.terminal_text.tag_config("error_output", foreground="#FF6666")
 
         self.prompt = f"{self.model}@android$ "
+        self.user_shell = self._start_shell()
         self._insert_prompt()
+        self._create_menu()
+        self.terminal_window.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Start periodic check for process output
         self.terminal_window.after(100, self._process_output)
 
+    def _create_menu(self) -> None:
+        """Create the Output menu of the terminal window."""
+        menu = tk.Menu(self.terminal_window, tearoff=0)
+        output_menu = tk.Menu(menu, tearoff=0)
+        output_menu.add_command(label="Spool to File...", command=self.start_spool)
+        output_menu.add_command(label="Stop Spooling", command=self.stop_spool)
+        output_menu.add_command(label="Clear Scrollback", command=self.clear_scrollback)
+        menu.add_cascade(label="Output", menu=output_menu)
+        self.terminal_window.config(menu=menu)
+
+    def start_spool(self) -> None:
+        """Append all further output, including lines trimmed from the scrollback, to a file."""
+        from tkinter import filedialog
+
+        file_path = filedialog.asksaveasfilename(
+            parent=self.terminal_window, title="Spool Output", defaultextension=".txt",
+            filetypes=(("Text Files", "*.txt"), ("All Files", "*.*"))
+        )
+        if not file_path:
+            return
+        self.stop_spool()
+        with self.spool_lock:
+            self.spool_file = open(file_path, "a", encoding="utf-8")
+        self.output_queue.put(("command_output", f"Spooling output to {file_path}\n"))
+
+    def stop_spool(self) -> None:
+        """Close the spool file, if any."""
+        with self.spool_lock:
+            spool_file, self.spool_file = self.spool_file, None
+        if spool_file is not None:
+            spool_file.close()
+
+    def _spool(self, text: str) -> None:
+        """Write text to the spool file, if spooling."""
+        with self.spool_lock:
+            if self.spool_file is not None:
+                self.spool_file.write(text)
+
+    def clear_scrollback(self) -> None:
+        """Delete the output above the current prompt."""
+        self.terminal_text.delete("1.0", "input_start linestart")
+
+    @property
+    def shell(self) -> InteractiveShell | None:
+        """The device shell that runs the commands: the root shell in root mode."""
+        return self.root_shell if self.is_root else self.user_shell
+
+    def _start_shell(self, root: bool = False, cwd: str | None = None) -> InteractiveShell | None:
+        """
+        Start a persistent device shell for this window.
+
+        Args:
+            root (bool): Whether to start a root shell (`adb shell su`).
+            cwd (str | None): The directory to change to, e.g. after an interrupted command.
+
+        Returns:
+            InteractiveShell | None: The running shell, or None if adb could not be started.
+        """
+        shell = InteractiveShell(
+            self.adb_path, self.device_id, self._on_shell_output, self._on_shell_done, ["su"] if root else None
+        )
+        try:
+            shell.start()
+            if cwd:
+                shell.send(f"cd {cwd}")
+            return shell
+        except (OSError, SessionError) as e:
+            self.terminal_text.insert(tk.END, f"Could not start adb shell: {e}\n", "error_output")
+            return None
+
+    def _on_shell_output(self, stream: str, text: str) -> None:
+        """Queue a chunk of shell output. Called from the shell reader threads."""
+        if self.su_output is not None:
+            self.su_output.append(text)
+            return
+        self.output_bytes += len(text)
+        self._spool(text)
+        self.output_queue.put(("error_output" if stream == "stderr" else "command_output", text))
+
+    def _on_shell_done(self, returncode: int) -> None:
+        """Record a finished command and queue the next prompt. Called from the shell reader threads."""
+        if self.su_output is not None:
+            rooted = returncode == 0 and "0" in "".join(self.su_output).split()
+            self.su_output = None
+            Terminal.root_access[self.device_id] = rooted
+            self.output_queue.put(("root", rooted))
+        elif self.running is not None:
+            category, start = self.running
+            if self.command_stats is not None:
+                self.command_stats.record(category, self.device_id, time.perf_counter() - start, returncode, self.output_bytes)
+        self.running = None
+        self.output_queue.put(None)
+
+    def _on_close(self) -> None:
+        """Close the device shells together with the window."""
+        for shell in (self.user_shell, self.root_shell):
+            if shell is not None:
+                shell.close()
+        self.stop_spool()
+        self.terminal_window.destroy()
+
     def _bind_events(self):
         """Bind events to terminal text widget."""
         self.terminal_text.bind("<Return>", self._on_key_press)
@@ -409,7 +914,10 @@ class Terminal:
         self.terminal_text.insert(tk.END, self.command_history[self.history_index], "command_output")
 
     def _on_ctrl_c(self, event: tk.Event) -> str:
-        """Handle Ctrl+C key press event to terminate the process.
+        """Handle Ctrl+C key press event to terminate the running command.
+
+        The device shell is restarted in the same directory, since adb shell
+        without a terminal cannot forward the interrupt.
 
         Args:
             event (tk.Event): The Tkinter event object.
@@ -417,11 +925,20 @@ class Terminal:
         Returns:
             str: Returns "break" to stop further event processing.
         """
-        if self.process and self.process.poll() is None:
-            self.process.terminate()
-            self.process = None
+        shell = self.root_shell if self.su_output is not None else self.shell
+        if shell is not None and shell.is_busy():
             self.terminal_text.insert(tk.END, "\nProcess terminated by user\n", "command_output")
-            self._insert_prompt()
+            if self.su_output is not None:
+                self.su_output = None
+                self.root_shell = None
+                shell.close()
+                return "break"
+            shell.close()
+            restarted = self._start_shell(self.is_root, shell.cwd)
+            if self.is_root:
+                self.root_shell = restarted
+            else:
+                self.user_shell = restarted
         return "break"
 
     def _on_ctrl_v(self, event: tk.Event) -> str:
@@ -484,128 +1001,271 @@ class Terminal:
             self.terminal_text.mark_set(tk.INSERT, "input_start")
 
     def _execute_command(self) -> None:
-        """Execute the command entered in the terminal."""
+        """Execute the command entered in the terminal in the persistent device shell."""
         command = self.terminal_text.get("input_start", "end-1c").strip()
-        if command:
-            self.command_history.append(command)
-            self.history_index = len(self.command_history)
+        if not command:
             self.terminal_text.insert(tk.END, "\n", "command_output")
+            self.terminal_text.see(tk.END)
+            return
 
-            if command == "su":
-                if self._check_root_access():
-                    self.is_root = True
-                    self.prompt = f"{self.model}@root$ "
-                    self.terminal_text.insert(tk.END, "Switched to root mode\n", "command_output")
-                    self._insert_prompt()
-                    return
-                self._insert_prompt()
-                return
+        self.command_history.append(command)
+        self.history_index = len(self.command_history)
+        self.terminal_text.insert(tk.END, "\n", "command_output")
 
-            if command == "exit" or (self.is_root and command == "Ctrl+Z"):
-                self.is_root = False
-                self.prompt = f"{self.model}@android$ "
+        if self.su_output is not None or (self.shell is not None and self.shell.is_busy()):
+            self.terminal_text.insert(tk.END, "A command is still running (Ctrl+C to stop it)\n", "error_output")
+            self._insert_prompt()
+            return
+        if self.shell is None or not self.shell.is_alive():
+            cwd = self.shell.cwd if self.shell else None
+            if self.is_root:
+                self.root_shell = self._start_shell(True, cwd)
+            else:
+                self.user_shell = self._start_shell(False, cwd)
+            if self.shell is None:
                 self._insert_prompt()
                 return
 
-            full_command = [str(self.adb_path), "-s", self.device_id, "shell"]
+        if command == "su":
             if self.is_root:
-                full_command.extend(["su", "-c", command])
+                self._insert_prompt()
+            elif Terminal.root_access.get(self.device_id) is False:
+                self.terminal_text.insert(tk.END, "Root access is required for this command\n", "command_output")
+                self._insert_prompt()
             else:
-                full_command.append(command)
-
-            self.process = subprocess.Popen(
-                full_command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+                # Open a root shell next to the user shell and confirm it with `id -u`.
+                self.root_shell = self._start_shell(True, self.user_shell.cwd)
+                if self.root_shell is None:
+                    self._insert_prompt()
+                    return
+                self.su_output = []
+                self.root_shell.run("id -u")
+            return
+
+        if command == "exit" or (self.is_root and command == "Ctrl+Z"):
+            if self.root_shell is not None:
+                self.root_shell.close()
+                self.root_shell = None
+            self.is_root = False
+            self.prompt = f"{self.model}@android$ "
+            self._insert_prompt()
+            return
 
-            threading.Thread(target=self._read_process_output, daemon=True).start()
-        else:
-            self.terminal_text.insert(tk.END, "\n", "command_output")
+        self._spool(f"{self.prompt}{command}\n")
+        self.running = (f"terminal:{command.split()[0]}", time.perf_counter())
+        self.output_bytes = 0
+        self.shell.run(command)
         self.terminal_text.see(tk.END)
 
-    def _read_process_output(self) -> None:
-        """Read the output from the subprocess and insert it into the terminal."""
-        try:
-            for line in iter(self.process.stdout.readline, ''):
-                self.output_queue.put(line)
-            for line in iter(self.process.stderr.readline, ''):
-                self.output_queue.put(line)
-            self.output_queue.put(None)
-        except AttributeError:
-            pass
-        finally:
-            self.process = None
-            self.output_queue.put(None)
-
     def _process_output(self) -> None:
-        """Process the output queue and insert it into the terminal."""
-        while not self.output_queue.empty():
-            line = self.output_queue.get()
-            if line is None:
-                self.terminal_text.insert(tk.END, "\n", "command_output")
+        """
+        Render queued output within a per-frame time budget and schedule the next poll.
+
+        Consecutive chunks of the same stream are inserted together, the view
+        scrolls once per frame and the scrollback is trimmed to TERMINAL_MAX_LINES.
+        Polling speeds up while output flows and backs off when idle.
+        """
+        if not self.terminal_window.winfo_exists():
+            return
+        self._collect_output()
+        deadline = time.perf_counter() + TERMINAL_FRAME_BUDGET_MS / 1000
+        rendered = False
+        while self.pending_output and time.perf_counter() < deadline:
+            item = self.pending_output.popleft()
+            rendered = True
+            if item is None:
+                if self.terminal_text.get("end-2c") != "\n":
+                    self.terminal_text.insert(tk.END, "\n", "command_output")
                 self._insert_prompt()
-                break
-            self.terminal_text.insert(tk.END, line, "command_output")
+                continue
+            tag, value = item
+            if tag == "root":
+                self._apply_root_result(value)
+                continue
+            chunks = [value]
+            size = len(value)
+            while (self.pending_output and self.pending_output[0] is not None
+                   and self.pending_output[0][0] == tag and size < TERMINAL_CHUNK_CHARS):
+                chunk = self.pending_output.popleft()[1]
+                chunks.append(chunk)
+                size += len(chunk)
+            text = "".join(chunks)
+            self.pending_lines -= text.count("\n")
+            self.terminal_text.insert(tk.END, text, tag)
+
+        if rendered:
+            excess = int(self.terminal_text.index("end-1c").split(".")[0]) - TERMINAL_MAX_LINES
+            if excess > 0:
+                self.terminal_text.delete("1.0", f"{excess + 1}.0")
             self.terminal_text.see(tk.END)
-        self.terminal_window.after(100, self._process_output)
+            self.poll_delay = TERMINAL_POLL_MIN_MS
+        else:
+            self.poll_delay = min(self.poll_delay * 2, TERMINAL_POLL_MAX_MS)
+        self.terminal_window.after(self.poll_delay, self._process_output)
+
+    def _collect_output(self) -> None:
+        """
+        Move the output queue into the render backlog.
+
+        When the backlog holds more lines than the scrollback can show, the
+        oldest output is dropped (it stays in the spool file, if any).
+        """
+        while True:
+            try:
+                item = self.output_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_output.append(item)
+            if item is not None and item[0] != "root":
+                self.pending_lines += item[1].count("\n")
+        if self.pending_lines <= TERMINAL_MAX_LINES:
+            return
+        kept = deque()
+        dropped = 0
+        for item in self.pending_output:
+            if self.pending_lines > TERMINAL_MAX_LINES and item is not None and item[0] != "root":
+                lines = item[1].count("\n")
+                self.pending_lines -= lines
+                dropped += lines
+                continue
+            kept.append(item)
+        notice = f"[... {dropped} lines skipped{', see the spool file' if self.spool_file else ''} ...]\n"
+        kept.appendleft(("error_output", notice))
+        self.pending_lines += 1
+        self.pending_output = kept
+
+    def _apply_root_result(self, rooted: bool) -> None:
+        """
+        Switch to the root prompt after a successful `su`, or report that root is unavailable.
 
-    def _check_root_access(self) -> bool:
-        """Check if the device has root access."""
-        check_command = [str(self.adb_path), "-s", self.device_id, "shell", "su", "-c", "echo rooted"]
-        result = subprocess.run(check_command,                 
-                                check=True,
-                                text=True,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                creationflags=subprocess.CREATE_NO_WINDOW)
-        if "rooted" in result.stdout:
-            return True
+        Args:
+            rooted (bool): Whether the root shell confirmed uid 0.
+        """
+        self.is_root = rooted
+        if rooted:
+            self.prompt = f"{self.model}@root$ "
+            self.terminal_text.insert(tk.END, "Switched to root mode\n", "command_output")
+            return
+        if self.root_shell is not None:
+            self.root_shell.close()
+            self.root_shell = None
         self.terminal_text.insert(tk.END, "Root access is required for this command\n", "command_output")
-        return False
-            
+
 
 class DefaultPackageManager:
     """Class for managing default packages."""
 
-    def __init__(self, root: tk.Tk, debloat_command: callable):
+    def __init__(self, root: tk.Tk, debloat_command: callable, preset_index: PresetMatchIndex | None = None):
         """
         Initialize the DefaultPackageManager.
 
         Args:
             root (tk.Tk): The root Tkinter window.
             debloat_command (callable): The command to execute for debloating.
+            preset_index (PresetMatchIndex | None): The match of the presets with the device inventory.
         """
         self.package_window: tk.Toplevel = tk.Toplevel(root)
         self.package_window.geometry("800x600")
-        self.package_groups: dict = get_packages()
+        from package_database import get_database
+
+        self.package_rows: list[tuple[str, str, str, str]] = [
+            (entry["group"], entry["package"], entry["vendor"], entry["rating"]) for entry in get_database().entries()
+        ]
+        self.package_index: SearchIndex = SearchIndex(["\0".join(row) for row in self.package_rows])
+        self.preset_index: PresetMatchIndex = preset_index or PresetMatchIndex(get_database().entries())
+        self.row_positions: dict[tuple[str, str], int] = {}
+        self.package_keys: dict[str, list[tuple[str, str]]] = {}
+        self.group_keys: dict[str, list[tuple[str, str]]] = {}
+        for position, (group, package, _, _) in enumerate(self.package_rows):
+            self.row_positions[(group, package)] = position
+            self.package_keys.setdefault(package, []).append((group, package))
+            self.group_keys.setdefault(group, []).append((group, package))
+        # The selection lives here, keyed by (group, package), and is pushed to the tree in one call.
+        self.selected_keys: set[tuple[str, str]] = set()
+        self.key_items: dict[tuple[str, str], str] = {}
+        self.item_keys: dict[str, tuple[str, str]] = {}
+        self.group_items: dict[str, str] = {}
+        self.pending_filter: str | None = None
         GUI.set_icon(self.package_window, Path("assets/android_debloater.ico"))
         self.debloat_button_command: callable = debloat_command
         self._setup_ui()
 
     def _setup_ui(self) -> None:
         """Set up the user interface for the package manager."""
+        self._create_group_summary_frame()
         self._create_package_list_frame()
         self._create_search_frame()
         self._create_action_frame()
 
+    def _create_group_summary_frame(self) -> None:
+        """Create the frame with the installed, missing and removed members of each group."""
+        group_frame: ttk.LabelFrame = ttk.LabelFrame(self.package_window, text="Groups on Device")
+        group_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        self.group_tree: ttk.Treeview = ttk.Treeview(
+            group_frame, columns=("group", "installed", "missing", "removed"), show="headings", height=5
+        )
+        for column, heading, width in (("group", "Group", 200), ("installed", "Installed", 120),
+                                       ("missing", "Missing", 120), ("removed", "Removed", 120)):
+            self.group_tree.heading(column, text=heading)
+            self.group_tree.column(column, width=width)
+        self.group_tree.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=5)
+        group_scrollbar: ttk.Scrollbar = ttk.Scrollbar(group_frame, command=self.group_tree.yview)
+        group_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.group_tree.config(yscrollcommand=group_scrollbar.set)
+        self.group_tree.bind("<Double-1>", self.select_chosen_groups)
+        for group in self.preset_index.groups:
+            self.group_items[group] = self.group_tree.insert("", tk.END, values=(group, *self._group_counts(group)))
+
+    def _group_counts(self, group: str) -> tuple:
+        """Return the installed, missing and removed columns of a group, empty without an inventory."""
+        return self.preset_index.counts(group) if self.preset_index.loaded else ("", "", "")
+
+    def _insert_package_row(self, row: tuple[str, str, str, str]) -> None:
+        """Insert a package row with its state on the device."""
+        item = self.package_tree.insert("", tk.END, values=(*row, self.preset_index.status(row[1])))
+        self.key_items[(row[0], row[1])] = item
+        self.item_keys[item] = (row[0], row[1])
+
+    def refresh_matches(self, changed: set[str]) -> None:
+        """
+        Show the new device state of preset packages.
+
+        Args:
+            changed (set[str]): The packages whose state changed.
+        """
+        groups = set()
+        for package in changed:
+            status = self.preset_index.status(package)
+            for key in self.package_keys.get(package, []):
+                if key in self.key_items:
+                    self.package_tree.set(self.key_items[key], "status", status)
+            groups.update(self.preset_index.package_groups.get(package, []))
+        for group in groups:
+            if group in self.group_items:
+                self.group_tree.item(self.group_items[group], values=(group, *self._group_counts(group)))
+
     def _create_package_list_frame(self) -> None:
         """Create the package list frame."""
         package_list_frame: ttk.LabelFrame = ttk.LabelFrame(self.package_window, text="Package Groups")
         package_list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.package_tree: ttk.Treeview = ttk.Treeview(package_list_frame, columns=("group", "package"), show="headings")
+        self.package_tree: ttk.Treeview = ttk.Treeview(
+            package_list_frame, columns=("group", "package", "vendor", "rating", "status"), show="headings"
+        )
         self.package_tree.heading("group", text="Group")
         self.package_tree.heading("package", text="Package Name")
-        self.package_tree.column("group", width=150)
-        self.package_tree.column("package", width=600)
+        self.package_tree.heading("vendor", text="Vendor")
+        self.package_tree.heading("rating", text="Removal")
+        self.package_tree.heading("status", text="On Device")
+        self.package_tree.column("group", width=120)
+        self.package_tree.column("package", width=340)
+        self.package_tree.column("vendor", width=100)
+        self.package_tree.column("rating", width=90)
+        self.package_tree.column("status", width=90)
         self.package_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         package_scrollbar: ttk.Scrollbar = ttk.Scrollbar(package_list_frame, command=self.package_tree.yview)
         package_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.package_tree.config(yscrollcommand=package_scrollbar.set)
+        self.package_tree.bind("<<TreeviewSelect>>", self._on_package_select)
         self.insert_default_packages()
 
     def _create_search_frame(self) -> None:
@@ -615,7 +1275,7 @@ class DefaultPackageManager:
         search_label: ttk.Label = ttk.Label(search_frame, text="Search:")
         search_label.pack(side=tk.LEFT, padx=5)
         search_var: tk.StringVar = tk.StringVar()
-        search_var.trace("w", lambda *args: self.filter_packages(search_var))
+        search_var.trace("w", lambda *args: self._schedule_package_filter(search_var))
         search_entry: ttk.Entry = ttk.Entry(search_frame, textvariable=search_var)
         search_entry.pack(fill=tk.X, padx=5)
         self.search_var: tk.StringVar = search_var
@@ -626,14 +1286,32 @@ class DefaultPackageManager:
         action_frame.pack(fill=tk.X, padx=10, pady=10)
         select_all_button: ttk.Button = ttk.Button(action_frame, text="Select All", command=lambda: self.select_all_packages(self.search_var))
         select_all_button.pack(side=tk.LEFT, padx=5)
+        invert_button: ttk.Button = ttk.Button(action_frame, text="Invert", command=self.invert_package_selection)
+        invert_button.pack(side=tk.LEFT, padx=5)
+        group_button: ttk.Button = ttk.Button(action_frame, text="Select Group", command=self.select_chosen_groups)
+        group_button.pack(side=tk.LEFT, padx=5)
+        clear_button: ttk.Button = ttk.Button(action_frame, text="Clear", command=self.clear_package_selection)
+        clear_button.pack(side=tk.LEFT, padx=5)
         debloat_button: ttk.Button = ttk.Button(action_frame, text="Uninstall Selected", command=self.debloat_button_command)
         debloat_button.pack(side=tk.LEFT, padx=5)
+        self.selection_label: ttk.Label = ttk.Label(action_frame, text="0 selected")
+        self.selection_label.pack(side=tk.RIGHT, padx=5)
 
     def insert_default_packages(self) -> None:
         """Insert default packages into the tree view."""
-        for group, packages in self.package_groups.items():
-            for package in packages:
-                self.package_tree.insert("", tk.END, values=(group, package))
+        for row in self.package_rows:
+            self._insert_package_row(row)
+
+    def _schedule_package_filter(self, search_holder: tk.StringVar) -> None:
+        """
+        Filter the package list once a burst of keystrokes settles.
+
+        Args:
+            search_holder (tk.StringVar): The variable holding the search query.
+        """
+        if self.pending_filter is not None:
+            self.package_window.after_cancel(self.pending_filter)
+        self.pending_filter = self.package_window.after(SEARCH_DEBOUNCE_MS, self.filter_packages, search_holder)
 
     def filter_packages(self, search_holder: tk.StringVar) -> None:
         """
@@ -642,17 +1320,24 @@ class DefaultPackageManager:
         Args:
             search_holder (tk.StringVar): The variable holding the search query.
         """
-        search_query = search_holder.get().lower()
-        filtered_packages = [
-            (group, package)
-            for group, packages in self.package_groups.items()
-            for package in packages
-            if search_query in package.lower() or search_query in group.lower()
-        ]
-        for row in self.package_tree.get_children():
-            self.package_tree.delete(row)
-        for group, package in filtered_packages:
-            self.package_tree.insert("", tk.END, values=(group, package))
+        self.pending_filter = None
+        filtered_packages = [self.package_rows[position] for position in self.package_index.search(search_holder.get())]
+        self.package_tree.delete(*self.package_tree.get_children())
+        self.key_items, self.item_keys = {}, {}
+        for row in filtered_packages:
+            self._insert_package_row(row)
+        self._apply_package_selection()
+
+    def _apply_package_selection(self) -> None:
+        """Show the selection model in the tree with a single call."""
+        self.package_tree.selection_set([self.key_items[key] for key in self.selected_keys if key in self.key_items])
+        self.selection_label.config(text=f"{len(self.selected_keys)} selected")
+
+    def _on_package_select(self, event=None) -> None:
+        """Take clicks in the tree into the selection model; selected rows hidden by the filter stay selected."""
+        shown = {self.item_keys[item] for item in self.package_tree.selection() if item in self.item_keys}
+        self.selected_keys = {key for key in self.selected_keys if key not in self.key_items} | shown
+        self.selection_label.config(text=f"{len(self.selected_keys)} selected")
 
     def select_all_packages(self, search_holder: tk.StringVar) -> None:
         """
@@ -661,11 +1346,46 @@ class DefaultPackageManager:
         Args:
             search_holder (tk.StringVar): The variable holding the search query.
         """
-        query = search_holder.get().lower()
-        for item in self.package_tree.get_children():
-            values = self.package_tree.item(item, "values")
-            if query in values[1].lower() or query in values[0].lower():
-                self.package_tree.selection_add(item)
+        rows = (self.package_rows[position] for position in self.package_index.search(search_holder.get()))
+        self.selected_keys.update((group, package) for group, package, _, _ in rows)
+        self._apply_package_selection()
+
+    def invert_package_selection(self) -> None:
+        """Invert the selection of the shown packages."""
+        self.selected_keys ^= self.key_items.keys()
+        self._apply_package_selection()
+
+    def select_package_group(self, group: str) -> None:
+        """
+        Select every package of a group, including the ones hidden by the search.
+
+        Args:
+            group (str): The group name.
+        """
+        self.selected_keys.update(self.group_keys.get(group, []))
+        self._apply_package_selection()
+
+    def select_chosen_groups(self, event=None) -> None:
+        """Select the packages of the groups chosen in the group summary."""
+        item_groups = {item: group for group, item in self.group_items.items()}
+        for item in self.group_tree.selection():
+            self.selected_keys.update(self.group_keys.get(item_groups[item], []))
+        self._apply_package_selection()
+
+    def clear_package_selection(self) -> None:
+        """Deselect every package."""
+        self.selected_keys.clear()
+        self._apply_package_selection()
+
+    def selected_packages(self) -> list[str]:
+        """
+        Get the selected package names.
+
+        Returns:
+            list[str]: The package names in list order, each once.
+        """
+        keys = sorted(self.selected_keys, key=self.row_positions.__getitem__)
+        return list(dict.fromkeys(package for _, package in keys))
 
     def get_package_tree(self) -> ttk.Treeview:
         """
@@ -0,0 +1,123 @@
+from typing import Iterable, Iterator
+
+SECTION_MARKER: str = "__UNBLOAT_SECTION__"
+
+# Disabled packages come first so every package line can be completed as soon as it is read.
+# "known" also lists the packages uninstalled for user 0 but kept on the device.
+INVENTORY_SECTIONS: dict[str, str] = {
+    "disabled": "pm list packages -d",
+    "system": "pm list packages -s -f -i",
+    "user": "pm list packages -3 -f -i",
+    "known": "pm list packages -u",
+}
+
+
+def build_inventory_script(sections: Iterable[str] = INVENTORY_SECTIONS) -> str:
+    """
+    Build a script that lists the given inventory sections in one round trip.
+
+    Args:
+        sections (Iterable[str]): The names of the sections to list.
+
+    Returns:
+        str: The shell script.
+    """
+    return "; ".join(
+        f"echo {SECTION_MARKER} {name}; {INVENTORY_SECTIONS[name]}"
+        for name in INVENTORY_SECTIONS if name in sections
+    )
+
+
+def build_probe_script() -> str:
+    """
+    Build a script that prints the build fingerprint and a hash of every inventory section.
+
+    Only a few short lines cross the wire, so the probe is cheap even for large inventories.
+
+    Returns:
+        str: The shell script.
+    """
+    hashes = "; ".join(
+        f"echo \"{SECTION_MARKER} {name} $({command} | md5sum)\""
+        for name, command in INVENTORY_SECTIONS.items()
+    )
+    return f"getprop ro.build.fingerprint; {hashes}"
+
+
+def parse_probe(output: str) -> tuple[str, dict[str, str]]:
+    """
+    Parse the output of `build_probe_script`.
+
+    Args:
+        output (str): The stdout of the probe script.
+
+    Returns:
+        tuple[str, dict[str, str]]: The build fingerprint and the hash of each section.
+    """
+    fingerprint = ""
+    hashes = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith(SECTION_MARKER):
+            fields = line[len(SECTION_MARKER):].split()
+            if len(fields) >= 2:
+                hashes[fields[0]] = fields[1]
+        elif line and not fingerprint:
+            fingerprint = line
+    return fingerprint, hashes
+
+
+INVENTORY_SCRIPT: str = build_inventory_script()
+
+
+def parse_package_line(line: str) -> tuple[str, str, str]:
+    """
+    Parse a `pm list packages -f -i` line.
+
+    Args:
+        line (str): A line such as `package:/system/app/Foo/Foo.apk=com.foo  installer=null`.
+
+    Returns:
+        tuple[str, str, str]: The package name, APK path and installer.
+    """
+    body = line[len("package:"):] if line.startswith("package:") else line
+    body, _, installer = body.partition("  installer=")
+    path, _, package = body.rpartition("=")
+    return package.strip(), path, installer.strip() or "null"
+
+
+def parse_inventory(lines: Iterable[str], disabled: set | None = None, known: set | None = None) -> Iterator[dict]:
+    """
+    Parse the output of an inventory script in one streaming pass.
+
+    Args:
+        lines (Iterable[str]): The output lines of the inventory script.
+        disabled (set | None): If given, collects the packages of the disabled section.
+        known (set | None): If given, collects the packages of the known section.
+
+    Yields:
+        dict: The package, status, type, path and installer of each package.
+    """
+    section = None
+    disabled = set() if disabled is None else disabled
+    known = set() if known is None else known
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(SECTION_MARKER):
+            section = line[len(SECTION_MARKER):].strip()
+            continue
+        if section == "disabled":
+            disabled.add(line[len("package:"):])
+        elif section == "known":
+            known.add(line[len("package:"):])
+        elif section in ("system", "user"):
+            package, path, installer = parse_package_line(line)
+            yield {
+                "package": package,
+                "status": "Disabled" if package in disabled else "Active",
+                "type": "System" if section == "system" else "User",
+                "path": path,
+                "installer": installer,
+            }
@@ -0,0 +1,134 @@
+import os
+import json
+import threading
+import subprocess
+from pathlib import Path
+from typing import Callable
+from inventory import INVENTORY_SECTIONS, build_inventory_script, build_probe_script, parse_probe, parse_inventory
+
+CACHE_DIR: Path = Path.home() / ".unbloatware" / "inventory"
+TYPE_SECTIONS: dict[str, str] = {"System": "system", "User": "user"}
+
+
+class InventoryCache:
+    """Persistent package inventory cache keyed by device serial and build fingerprint."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (Path): The directory holding the cache files.
+        """
+        self.cache_dir = cache_dir
+        self.entries: dict[tuple[str, str], dict] = {}
+        self.removed: dict[str, set[str]] = {}
+        self.lock = threading.Lock()
+
+    def _path(self, serial: str, fingerprint: str) -> Path:
+        """Return the cache file of a device build."""
+        import hashlib
+
+        key = hashlib.sha1(f"{serial}|{fingerprint}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def load(self, serial: str, fingerprint: str) -> dict | None:
+        """
+        Load the cached inventory of a device build, from memory or disk.
+
+        Args:
+            serial (str): The device serial.
+            fingerprint (str): The `ro.build.fingerprint` of the device.
+
+        Returns:
+            dict | None: The entry with "hashes" and "apps", or None if nothing is cached.
+        """
+        with self.lock:
+            entry = self.entries.get((serial, fingerprint))
+            if entry is not None:
+                return entry
+            try:
+                entry = json.loads(self._path(serial, fingerprint).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return None
+            if entry.get("serial") != serial or entry.get("fingerprint") != fingerprint:
+                return None
+            self.entries[(serial, fingerprint)] = entry
+            return entry
+
+    def store(self, serial: str, fingerprint: str, hashes: dict[str, str], apps: list[dict],
+              known: list[str] | None = None) -> None:
+        """
+        Save the inventory of a device build to memory and disk.
+
+        Args:
+            serial (str): The device serial.
+            fingerprint (str): The `ro.build.fingerprint` of the device.
+            hashes (dict[str, str]): The probe hash of each inventory section.
+            apps (list[dict]): The application list.
+            known (list[str] | None): Every package on the device, including the ones uninstalled for user 0.
+        """
+        entry = {"serial": serial, "fingerprint": fingerprint, "hashes": hashes, "apps": apps, "known": known or []}
+        with self.lock:
+            self.entries[(serial, fingerprint)] = entry
+            path = self._path(serial, fingerprint)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+                os.replace(tmp_path, path)
+            except OSError:
+                pass
+
+    def refresh(self, serial: str, run_shell: Callable[[str, str], subprocess.CompletedProcess | None]) -> tuple[list[dict], list[str]]:
+        """
+        Return the current inventory of a device, fetching only the sections that changed.
+
+        A probe hashes every inventory section on the device. Sections whose hash
+        matches the cache are reused; the others are fetched in one round trip.
+
+        Args:
+            serial (str): The device serial.
+            run_shell (Callable[[str, str], subprocess.CompletedProcess | None]): Runs a script on a device.
+
+        The packages uninstalled for user 0 but kept on the device are left in `removed[serial]`.
+
+        Returns:
+            tuple[list[dict], list[str]]: The application list and the names of the refetched sections.
+        """
+        probe = run_shell(serial, build_probe_script())
+        if not probe or probe.returncode != 0:
+            raise Exception("Error probing package lists.")
+        fingerprint, hashes = parse_probe(probe.stdout)
+
+        entry = self.load(serial, fingerprint)
+        cached_hashes = entry["hashes"] if entry else {}
+        changed = [name for name in INVENTORY_SECTIONS if not hashes.get(name) or hashes.get(name) != cached_hashes.get(name)]
+        if not changed:
+            self._set_removed(serial, entry["apps"], entry["known"])
+            return entry["apps"], []
+
+        result = run_shell(serial, build_inventory_script(["disabled"] + changed))
+        if not result or result.returncode != 0:
+            raise Exception("Error fetching package lists.")
+        disabled, known = set(), set()
+        fresh = list(parse_inventory(result.stdout.splitlines(), disabled, known))
+
+        apps = []
+        for section in ("system", "user"):
+            if section in changed:
+                apps.extend(app for app in fresh if TYPE_SECTIONS[app["type"]] == section)
+                continue
+            for app in entry["apps"]:
+                if TYPE_SECTIONS[app["type"]] == section:
+                    apps.append(dict(app, status="Disabled" if app["package"] in disabled else "Active"))
+
+        known = sorted(known) if "known" in changed else entry["known"]
+        self.store(serial, fingerprint, hashes, apps, known)
+        self._set_removed(serial, apps, known)
+        return apps, changed
+
+    def _set_removed(self, serial: str, apps: list[dict], known: list[str]) -> None:
+        """Record the known packages of a device that are not in its application list."""
+        installed = {app["package"] for app in apps}
+        self.removed[serial] = {package for package in known if package not in installed}
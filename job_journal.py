@@ -0,0 +1,145 @@
+import re
+import json
+import time
+import threading
+from pathlib import Path
+
+JOURNAL_DIR: Path = Path.home() / ".unbloatware" / "jobs"
+JOB_KINDS: tuple[str, ...] = ("uninstall", "remove-paths")
+
+
+class JobJournal:
+    """
+    Append-only journals of batch jobs, one JSON Lines file per device and job.
+
+    The first line of a journal plans the job and lists its items. Every finished
+    item appends a "result" line as soon as its status arrives, restores append
+    "restore" lines and a completed job ends with a "finish" line. A job cut short
+    (app closed, cable pulled) therefore records exactly which items are pending.
+    """
+
+    def __init__(self, journal_dir: Path = JOURNAL_DIR):
+        """
+        Initialize the journals.
+
+        Args:
+            journal_dir (Path): The directory holding the journal files.
+        """
+        self.journal_dir = journal_dir
+        self.lock = threading.Lock()
+
+    def _path(self, job: str) -> Path:
+        """Return the journal file of a job."""
+        return self.journal_dir / f"{job}.jsonl"
+
+    def _append(self, job: str, *events: dict) -> None:
+        """Append events to a journal and flush them to disk."""
+        lines = "".join(json.dumps(event) + "\n" for event in events)
+        with self.lock:
+            with open(self._path(job), "a", encoding="utf-8") as file:
+                file.write(lines)
+
+    def start(self, device: str, kind: str, items: list[str]) -> str:
+        """
+        Plan a new job.
+
+        Args:
+            device (str): The device ID.
+            kind (str): One of JOB_KINDS.
+            items (list[str]): The packages or paths of the job.
+
+        Returns:
+            str: The job ID, made of the device, the start time and the kind.
+        """
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        created = time.time()
+        safe_device = re.sub(r"[^A-Za-z0-9_.-]", "_", device)
+        job = f"{safe_device}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(created))}-{int(created * 1000) % 1000:03d}-{kind}"
+        self._append(job, {"event": "plan", "device": device, "kind": kind, "created": created,
+                           "items": list(dict.fromkeys(items))})
+        return job
+
+    def record(self, job: str, item: str, code: int, message: str, event: str = "result") -> None:
+        """
+        Record the outcome of one item.
+
+        Args:
+            job (str): The job ID.
+            item (str): The package or path.
+            code (int): The exit code, 0 for success.
+            message (str): The device output.
+            event (str): "result" for the job itself or "restore" for its restore.
+        """
+        self._append(job, {"event": event, "item": item, "code": code, "message": message})
+
+    def finish(self, job: str) -> None:
+        """Mark a job as complete."""
+        self._append(job, {"event": "finish", "time": time.time()})
+
+    def load(self, job: str) -> dict | None:
+        """
+        Replay a journal.
+
+        Args:
+            job (str): The job ID.
+
+        Returns:
+            dict | None: The job with "job", "device", "kind", "created", "items", "results"
+            (item -> (code, message)), "restored" (item -> (code, message)) and "finished",
+            or None if the journal does not exist or has no plan. A torn last line is ignored.
+        """
+        try:
+            with open(self._path(job), "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except OSError:
+            return None
+        state = None
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get("event") == "plan":
+                state = {"job": job, "device": event["device"], "kind": event["kind"], "created": event["created"],
+                         "items": event["items"], "results": {}, "restored": {}, "finished": False}
+            elif state is None:
+                continue
+            elif event.get("event") == "result":
+                state["results"][event["item"]] = (event["code"], event["message"])
+            elif event.get("event") == "restore":
+                state["restored"][event["item"]] = (event["code"], event["message"])
+            elif event.get("event") == "finish":
+                state["finished"] = True
+        return state
+
+    def jobs(self, device: str | None = None) -> list[dict]:
+        """
+        Replay every journal, newest first.
+
+        Args:
+            device (str | None): Only the jobs of this device, if given.
+
+        Returns:
+            list[dict]: The jobs (see `load`).
+        """
+        states = []
+        if not self.journal_dir.is_dir():
+            return states
+        for path in self.journal_dir.glob("*.jsonl"):
+            state = self.load(path.stem)
+            if state and (device is None or state["device"] == device):
+                states.append(state)
+        return sorted(states, key=lambda state: state["created"], reverse=True)
+
+    @staticmethod
+    def pending(state: dict) -> list[str]:
+        """Return the planned items of a job that have no result yet."""
+        return [item for item in state["items"] if item not in state["results"]]
+
+    @staticmethod
+    def restorable(state: dict) -> list[str]:
+        """Return the packages an uninstall job removed and that were not restored yet."""
+        if state["kind"] != "uninstall":
+            return []
+        return [item for item in state["items"]
+                if state["results"].get(item, (1,))[0] == 0 and state["restored"].get(item, (1,))[0] != 0]
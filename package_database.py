@@ -0,0 +1,285 @@
+import os
+import csv
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DEFAULT_SOURCE: Path = Path(__file__).parent.resolve() / "assets" / "packages.csv"
+USER_SOURCE_DIR: Path = Path.home() / ".unbloatware" / "packages"
+INDEX_PATH: Path = Path.home() / ".unbloatware" / "packages.sqlite3"
+# Bump when the index layout changes so that old index files are rebuilt.
+SCHEMA_VERSION: int = 1
+FIELDS: tuple[str, ...] = ("package", "group", "vendor", "rating", "region", "description")
+RATINGS: tuple[str, ...] = ("recommended", "advanced", "expert", "unsafe")
+
+SCHEMA: str = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE packages (
+    package TEXT NOT NULL,
+    grp TEXT NOT NULL,
+    vendor TEXT NOT NULL,
+    rating TEXT NOT NULL,
+    region TEXT NOT NULL,
+    description TEXT NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (package, grp)
+);
+CREATE INDEX packages_group ON packages (grp, position);
+CREATE INDEX packages_vendor ON packages (vendor, position);
+CREATE INDEX packages_position ON packages (position);
+"""
+COLUMNS: str = "package, grp, vendor, rating, region, description"
+# A later definition keeps the position of the one it overrides and only replaces the fields it sets.
+UPSERT: str = """
+INSERT INTO packages VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (package, grp) DO UPDATE SET
+    vendor = COALESCE(NULLIF(excluded.vendor, ''), vendor),
+    rating = COALESCE(NULLIF(excluded.rating, ''), rating),
+    region = COALESCE(NULLIF(excluded.region, ''), region),
+    description = COALESCE(NULLIF(excluded.description, ''), description),
+    source = excluded.source
+"""
+
+
+def iter_source(path: Path) -> Iterator[dict]:
+    """
+    Read the definitions of a package list source line by line.
+
+    A source is a CSV file with a header naming some of FIELDS; "package" and "group"
+    are required. Lines starting with `#` are comments.
+
+    Args:
+        path (Path): The CSV file.
+
+    Yields:
+        dict: Each definition with every field of FIELDS (missing ones are "").
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        lines = (line for line in file if not line.lstrip().startswith("#"))
+        for row in csv.DictReader(lines):
+            entry = {field: (row.get(field) or "").strip() for field in FIELDS}
+            if entry["package"] and entry["group"]:
+                entry["rating"] = entry["rating"].lower()
+                yield entry
+
+
+class PackageDatabase:
+    """
+    Preset package definitions compiled from CSV sources into an SQLite index.
+
+    Nothing is read until the first query. The index is rebuilt only when a source file
+    was added, removed or changed since it was compiled; otherwise the sources are not
+    parsed at all. Later sources override the fields they set of earlier definitions
+    of the same package and group.
+    """
+
+    def __init__(self, sources: list[Path] | None = None, index_path: Path = INDEX_PATH,
+                 user_dir: Path | None = USER_SOURCE_DIR):
+        """
+        Initialize the database.
+
+        Args:
+            sources (list[Path] | None): The source files, lowest priority first. Defaults to the preset list.
+            index_path (Path): The compiled index file.
+            user_dir (Path | None): A directory whose *.csv lists are merged on top of the sources.
+        """
+        self.sources: list[Path] = list(sources) if sources is not None else [DEFAULT_SOURCE]
+        self.index_path = index_path
+        self.user_dir = user_dir
+        self.connection: sqlite3.Connection | None = None
+        self.lock = threading.Lock()
+
+    def add_source(self, path: Path) -> None:
+        """
+        Merge another package list on top of the current ones.
+
+        Args:
+            path (Path): The CSV file.
+        """
+        with self.lock:
+            self.sources.append(Path(path))
+            self._close()
+
+    def source_files(self) -> list[Path]:
+        """Return every source file, lowest priority first."""
+        files = list(self.sources)
+        if self.user_dir is not None and self.user_dir.is_dir():
+            files.extend(sorted(self.user_dir.glob("*.csv")))
+        return files
+
+    def _stamp(self, files: list[Path]) -> str:
+        """Describe the sources by path, size and modification time."""
+        parts = [f"schema={SCHEMA_VERSION}"]
+        for path in files:
+            try:
+                stat = path.stat()
+                parts.append(f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}")
+            except OSError:
+                parts.append(f"{path}|missing")
+        return "\n".join(parts)
+
+    def _compile(self, files: list[Path], stamp: str, target: str) -> sqlite3.Connection:
+        """
+        Parse the sources into a new index.
+
+        Args:
+            files (list[Path]): The source files, lowest priority first.
+            stamp (str): The description of the sources stored with the index.
+            target (str): The database file, or ":memory:".
+
+        Returns:
+            sqlite3.Connection: The connection to the new index.
+        """
+        connection = sqlite3.connect(target, check_same_thread=False)
+        # The file is swapped in only once complete, so it needs no journal or syncing.
+        connection.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        position = 0
+        with connection:
+            for path in files:
+                try:
+                    entries = list(iter_source(path))
+                except (OSError, csv.Error, UnicodeDecodeError):
+                    continue
+                rows = []
+                for entry in entries:
+                    rows.append((*(entry[field] for field in FIELDS), str(path), position))
+                    position += 1
+                connection.executemany(UPSERT, rows)
+            connection.execute("INSERT INTO meta VALUES ('stamp', ?)", (stamp,))
+        return connection
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the compiled index, compiling it first if the sources changed."""
+        if self.connection is not None:
+            return self.connection
+        files = self.source_files()
+        stamp = self._stamp(files)
+        connection = None
+        try:
+            connection = sqlite3.connect(self.index_path, check_same_thread=False)
+            row = connection.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+            if row and row[0] == stamp:
+                self.connection = connection
+                return connection
+        except sqlite3.Error:
+            pass
+        if connection is not None:
+            # Close it first: Windows cannot replace a file that is still open.
+            connection.close()
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.unlink(missing_ok=True)
+            self._compile(files, stamp, str(tmp_path)).close()
+            os.replace(tmp_path, self.index_path)
+            self.connection = sqlite3.connect(self.index_path, check_same_thread=False)
+        except (OSError, sqlite3.Error):
+            self.connection = self._compile(files, stamp, ":memory:")
+        return self.connection
+
+    def _close(self) -> None:
+        """Close the index so that the next query checks the sources again."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def reload(self) -> None:
+        """Pick up changed sources on the next query."""
+        with self.lock:
+            self._close()
+
+    def _query(self, where: str = "", parameters: Iterable = ()) -> list[dict]:
+        """Run a query over the definitions, in source order."""
+        with self.lock:
+            rows = self._open().execute(
+                f"SELECT {COLUMNS} FROM packages {where} ORDER BY position", tuple(parameters)
+            ).fetchall()
+        return [dict(zip(FIELDS, row)) for row in rows]
+
+    def entries(self) -> list[dict]:
+        """
+        Get every definition.
+
+        Returns:
+            list[dict]: The definitions with the fields of FIELDS, in source order.
+        """
+        return self._query()
+
+    def lookup(self, package: str) -> list[dict]:
+        """
+        Get the definitions of a package, one per group that lists it.
+
+        Args:
+            package (str): The package name.
+
+        Returns:
+            list[dict]: The definitions.
+        """
+        return self._query("WHERE package = ?", (package,))
+
+    def group(self, group: str) -> list[dict]:
+        """
+        Get the definitions of a group.
+
+        Args:
+            group (str): The group name.
+
+        Returns:
+            list[dict]: The definitions, empty if the group does not exist.
+        """
+        return self._query("WHERE grp = ?", (group,))
+
+    def vendor(self, vendor: str) -> list[dict]:
+        """
+        Get the definitions of a vendor.
+
+        Args:
+            vendor (str): The vendor name, e.g. "samsung".
+
+        Returns:
+            list[dict]: The definitions, empty if the vendor is unknown.
+        """
+        return self._query("WHERE vendor = ?", (vendor,))
+
+    def _distinct(self, column: str) -> list[str]:
+        """Return the distinct values of a column in order of first appearance."""
+        with self.lock:
+            rows = self._open().execute(
+                f"SELECT {column} FROM packages GROUP BY {column} ORDER BY MIN(position)"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def group_names(self) -> list[str]:
+        """Return the group names in source order."""
+        return self._distinct("grp")
+
+    def vendor_names(self) -> list[str]:
+        """Return the vendor names in source order."""
+        return [vendor for vendor in self._distinct("vendor") if vendor]
+
+    def groups(self) -> dict[str, list[str]]:
+        """
+        Get the package names of every group.
+
+        Returns:
+            dict[str, list[str]]: The package names keyed by group, in source order.
+        """
+        groups = {}
+        for entry in self.entries():
+            groups.setdefault(entry["group"], []).append(entry["package"])
+        return groups
+
+
+_database: PackageDatabase | None = None
+_database_lock = threading.Lock()
+
+
+def get_database() -> PackageDatabase:
+    """Return the shared package database; it opens lazily on the first query."""
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = PackageDatabase()
+        return _database
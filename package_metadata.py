@@ -0,0 +1,105 @@
+import json
+from itertools import takewhile
+from typing import Iterable, Iterator
+from inventory import SECTION_MARKER
+
+# One round trip: the package records, then the sizes collected by the diskstats service.
+METADATA_SCRIPT: str = f"dumpsys package packages; echo {SECTION_MARKER}; dumpsys diskstats"
+
+# Fields of a `dumpsys package` record that hold the rest of the line (timestamps contain spaces).
+LINE_FIELDS: dict[str, str] = {
+    "versionName": "version",
+    "installerPackageName": "installer",
+    "firstInstallTime": "first_install",
+    "lastUpdateTime": "last_update",
+}
+DISKSTATS_FIELDS: dict[str, str] = {
+    "Package Names": "packages",
+    "App Sizes": "code_size",
+    "App Data Sizes": "data_size",
+}
+
+
+def parse_dumpsys_package(lines: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    """
+    Parse the "Packages:" section of `dumpsys package` line by line.
+
+    Args:
+        lines (Iterable[str]): The output lines, e.g. a process stdout.
+
+    Yields:
+        tuple[str, dict]: Each package with its "version", "version_code", "installer",
+        "first_install" and "last_update" (the fields the record has).
+    """
+    in_packages = False
+    package, record = None, {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if not line.startswith(" "):
+            if package:
+                yield package, record
+                package, record = None, {}
+            in_packages = stripped == "Packages:"
+            continue
+        if not in_packages:
+            continue
+        if stripped.startswith("Package [") and "]" in stripped:
+            if package:
+                yield package, record
+            package, record = stripped[len("Package ["):stripped.index("]")], {}
+            continue
+        if package is None:
+            continue
+        key, _, value = stripped.partition("=")
+        if key in LINE_FIELDS:
+            record.setdefault(LINE_FIELDS[key], value.strip())
+        elif key == "versionCode":
+            record.setdefault("version_code", value.split()[0] if value else "")
+    if package:
+        yield package, record
+
+
+def parse_diskstats(lines: Iterable[str]) -> dict[str, dict]:
+    """
+    Parse the per-package sizes of `dumpsys diskstats`.
+
+    Args:
+        lines (Iterable[str]): The output lines.
+
+    Returns:
+        dict[str, dict]: The "code_size" and "data_size" in bytes of each package.
+    """
+    columns = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        field = DISKSTATS_FIELDS.get(name.strip())
+        if field:
+            try:
+                columns[field] = json.loads(value)
+            except ValueError:
+                continue
+    packages = columns.get("packages", [])
+    return {
+        package: {field: columns[field][index] for field in ("code_size", "data_size")
+                  if field in columns and index < len(columns[field])}
+        for index, package in enumerate(packages)
+    }
+
+
+def parse_metadata(lines: Iterable[str]) -> dict[str, dict]:
+    """
+    Parse the output of METADATA_SCRIPT as it streams in.
+
+    Args:
+        lines (Iterable[str]): The output lines.
+
+    Returns:
+        dict[str, dict]: The metadata of each package.
+    """
+    lines = iter(lines)
+    metadata = dict(parse_dumpsys_package(takewhile(lambda line: line.strip() != SECTION_MARKER, lines)))
+    for package, sizes in parse_diskstats(lines).items():
+        metadata.setdefault(package, {}).update(sizes)
+    return metadata
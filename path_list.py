@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+def normalize_device_path(path: str) -> str:
+    """
+    Normalize an absolute device path: collapse repeated slashes, drop "." segments and trailing slashes.
+
+    Args:
+        path (str): The absolute path, which may contain glob characters.
+
+    Returns:
+        str: The normalized path.
+    """
+    return "/" + "/".join(segment for segment in path.split("/") if segment not in ("", "."))
+
+
+def iter_path_list(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the normalized, deduplicated paths of a path list, one line at a time.
+
+    Everything after a `#` is a comment. A line may hold several whitespace-separated
+    words; the words starting with "/" are paths (so lines such as `rm -rf /system/app/X`
+    also work). Glob patterns are passed through for the device to expand.
+
+    Args:
+        lines (Iterable[str]): The lines of the path list, e.g. an open file.
+
+    Yields:
+        str: Each path or glob pattern, the first time it appears.
+    """
+    seen = set()
+    for line in lines:
+        for word in line.split("#", 1)[0].split():
+            if not word.startswith("/"):
+                continue
+            path = normalize_device_path(word)
+            if path not in seen:
+                seen.add(path)
+                yield path
+
+
+def read_path_list(path_file: Path) -> list[str]:
+    """
+    Read the paths of a path list file without loading the whole file at once.
+
+    Args:
+        path_file (Path): The text file with one or more paths per line.
+
+    Returns:
+        list[str]: The normalized, deduplicated paths in file order.
+    """
+    with open(path_file, "r", encoding="utf-8", errors="replace") as file:
+        return list(iter_path_list(file))
+
+
+def format_bytes(size: int) -> str:
+    """
+    Format a byte count for humans.
+
+    Args:
+        size (int): The number of bytes.
+
+    Returns:
+        str: The size with a binary unit, e.g. "12.5 MiB".
+    """
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
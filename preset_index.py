@@ -0,0 +1,131 @@
+from typing import Iterable
+
+INSTALLED: str = "Installed"
+MISSING: str = "Missing"
+REMOVED: str = "Removed"
+
+
+class PresetMatchIndex:
+    """Intersection of the preset package groups with the inventory of one device, updated incrementally."""
+
+    def __init__(self, entries: Iterable[dict]):
+        """
+        Build the index without any device inventory.
+
+        Args:
+            entries (Iterable[dict]): The package database definitions, with "package" and "group".
+        """
+        self.groups: dict[str, list[str]] = {}
+        self.package_groups: dict[str, list[str]] = {}
+        for entry in entries:
+            self.groups.setdefault(entry["group"], []).append(entry["package"])
+            self.package_groups.setdefault(entry["package"], []).append(entry["group"])
+        self.device: str | None = None
+        self.installed: set[str] = set()
+        self.removed: set[str] = set()
+        self.installed_counts: dict[str, int] = dict.fromkeys(self.groups, 0)
+        self.removed_counts: dict[str, int] = dict.fromkeys(self.groups, 0)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether an inventory has been matched."""
+        return self.device is not None
+
+    def _count(self, packages: Iterable[str], counts: dict[str, int], delta: int) -> None:
+        """Add a delta to the group counts of every package."""
+        for package in packages:
+            for group in self.package_groups[package]:
+                counts[group] += delta
+
+    def update(self, device: str, installed: Iterable[str], removed: Iterable[str]) -> set[str]:
+        """
+        Match a new inventory, adjusting only the groups of the presets whose state changed.
+
+        Args:
+            device (str): The device ID. Switching devices starts from an empty inventory.
+            installed (Iterable[str]): The installed packages.
+            removed (Iterable[str]): The packages uninstalled for user 0 but kept on the device.
+
+        Returns:
+            set[str]: The preset packages whose status changed.
+        """
+        if device != self.device:
+            self.device = device
+            self.installed, self.removed = set(), set()
+            self.installed_counts = dict.fromkeys(self.groups, 0)
+            self.removed_counts = dict.fromkeys(self.groups, 0)
+        installed = {package for package in installed if package in self.package_groups}
+        removed = {package for package in removed if package in self.package_groups} - installed
+        changed = set()
+        for old, new, counts in ((self.installed, installed, self.installed_counts),
+                                 (self.removed, removed, self.removed_counts)):
+            gone, added = old - new, new - old
+            self._count(gone, counts, -1)
+            self._count(added, counts, 1)
+            changed |= gone | added
+        self.installed, self.removed = installed, removed
+        return changed
+
+    def mark_removed(self, packages: Iterable[str]) -> set[str]:
+        """
+        Record packages that were just uninstalled, without a new inventory.
+
+        Args:
+            packages (Iterable[str]): The uninstalled packages.
+
+        Returns:
+            set[str]: The preset packages whose status changed.
+        """
+        changed = {package for package in packages if package in self.installed}
+        self.installed -= changed
+        self.removed |= changed
+        self._count(changed, self.installed_counts, -1)
+        self._count(changed, self.removed_counts, 1)
+        return changed
+
+    def status(self, package: str) -> str:
+        """
+        Get the state of a preset package on the device.
+
+        Args:
+            package (str): The package name.
+
+        Returns:
+            str: INSTALLED, REMOVED or MISSING, or "" before an inventory is matched.
+        """
+        if not self.loaded:
+            return ""
+        if package in self.installed:
+            return INSTALLED
+        return REMOVED if package in self.removed else MISSING
+
+    def counts(self, group: str) -> tuple[int, int, int]:
+        """
+        Get the installed, missing and removed member counts of a group.
+
+        Args:
+            group (str): The group name.
+
+        Returns:
+            tuple[int, int, int]: The counts, all members missing before an inventory is matched.
+        """
+        installed, removed = self.installed_counts.get(group, 0), self.removed_counts.get(group, 0)
+        return installed, len(self.groups.get(group, [])) - installed - removed, removed
+
+    def installed_members(self, packages: Iterable[str]) -> tuple[list[str], list[str]]:
+        """
+        Split packages into those installed on the device and the others.
+
+        Before an inventory is matched every package counts as installed.
+
+        Args:
+            packages (Iterable[str]): The package names.
+
+        Returns:
+            tuple[list[str], list[str]]: The installed and the skipped packages, deduplicated, in order.
+        """
+        packages = list(dict.fromkeys(packages))
+        if not self.loaded:
+            return packages, []
+        return ([package for package in packages if package in self.installed],
+                [package for package in packages if package not in self.installed])
@@ -0,0 +1,48 @@
+NGRAM_SIZE: int = 3
+
+
+class SearchIndex:
+    """Case-insensitive substring search over a fixed list of keys, backed by a trigram index."""
+
+    def __init__(self, keys: list[str]):
+        """
+        Build the index.
+
+        Args:
+            keys (list[str]): The searchable text of each item, in display order.
+        """
+        self.keys: list[str] = [key.lower() for key in keys]
+        self.ngrams: dict[str, list[int]] = {}
+        for position, key in enumerate(self.keys):
+            for gram in {key[i:i + NGRAM_SIZE] for i in range(len(key) - NGRAM_SIZE + 1)}:
+                self.ngrams.setdefault(gram, []).append(position)
+        self.last_query: str = ""
+        self.last_result: list[int] = list(range(len(self.keys)))
+
+    def search(self, query: str) -> list[int]:
+        """
+        Find the items whose key contains the query.
+
+        When the query extends the previous one, only the previous matches are
+        scanned. Otherwise the candidates come from the rarest trigram of the query.
+
+        Args:
+            query (str): The search text.
+
+        Returns:
+            list[int]: The positions of the matching items, in display order.
+        """
+        query = query.lower()
+        if not query:
+            result = list(range(len(self.keys)))
+        else:
+            if self.last_query and self.last_query in query:
+                candidates = self.last_result
+            elif len(query) >= NGRAM_SIZE:
+                postings = [self.ngrams.get(query[i:i + NGRAM_SIZE], []) for i in range(len(query) - NGRAM_SIZE + 1)]
+                candidates = min(postings, key=len)
+            else:
+                candidates = range(len(self.keys))
+            result = [position for position in candidates if query in self.keys[position]]
+        self.last_query, self.last_result = query, result
+        return result
@@ -0,0 +1,258 @@
+import heapq
+import itertools
+import threading
+from typing import Callable
+from fleet import FLEET_MAX_WORKERS
+
+SCHEDULER_MAX_WORKERS: int = 4
+# With many busy device lanes the pool grows to one worker per lane, up to this many.
+SCHEDULER_MAX_LANE_WORKERS: int = FLEET_MAX_WORKERS
+# Lower numbers run first.
+PRIORITY_INTERACTIVE: int = 0
+PRIORITY_BACKGROUND: int = 5
+PRIORITY_BULK: int = 10
+
+_current = threading.local()
+
+
+class TaskHandle:
+    """A scheduled task: its state, and the flag a running task checks to stop early."""
+
+    def __init__(self, function: Callable, args: tuple, key: str | None, lane: str | None, priority: int):
+        """
+        Initialize the handle.
+
+        Args:
+            function (Callable): The function to run.
+            args (tuple): Its arguments.
+            key (str | None): Requests with the same key are coalesced.
+            lane (str | None): Tasks with the same lane (e.g. a device serial) never run at the same time.
+            priority (int): One of the PRIORITY_* values.
+        """
+        self.function = function
+        self.args = args
+        self.key = key
+        self.lane = lane
+        self.priority = priority
+        self.state: str = "queued"
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.callbacks: list[Callable[[TaskHandle], None]] = []
+        self.callback_lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the task was asked to stop."""
+        return self.cancel_event.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until the task finished or was cancelled; returns False on timeout."""
+        return self.done_event.wait(timeout)
+
+    def add_done_callback(self, callback: Callable[["TaskHandle"], None]) -> None:
+        """
+        Call `callback(handle)` once the task finished, failed or was cancelled, even before it ran.
+
+        It runs on the thread that ended the task, or at once if the task already ended, and must not raise.
+
+        Args:
+            callback (Callable[[TaskHandle], None]): The callback.
+        """
+        with self.callback_lock:
+            if not self.done_event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback(self)
+
+    def _set_done(self) -> None:
+        """Mark the task as ended and run its callbacks."""
+        with self.callback_lock:
+            self.done_event.set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+def current_task() -> TaskHandle | None:
+    """Return the handle of the task running on this thread, or None outside the scheduler."""
+    return getattr(_current, "handle", None)
+
+
+def task_cancelled() -> bool:
+    """Whether the task running on this thread was cancelled. Long loops check this to stop early."""
+    handle = current_task()
+    return handle is not None and handle.cancelled
+
+
+class TaskScheduler:
+    """
+    Bounded worker threads running prioritized tasks, serialized per lane.
+
+    Workers start on demand up to `max_workers`, or one per device lane with
+    queued or running tasks, up to `max_lane_workers`, so fleet work scales with
+    the number of devices. One more worker is kept for interactive tasks: bulk and
+    background tasks never occupy it, so a Refresh does not wait behind them.
+    The next task is the queued one with the lowest priority number (oldest
+    first) whose lane is idle and that fits its worker share. A request
+    whose key matches a queued task is dropped in favor of that task; one whose
+    key matches a running task is queued once behind it, so a burst of clicks
+    runs at most one more time.
+    """
+
+    def __init__(self, max_workers: int = SCHEDULER_MAX_WORKERS, on_error: Callable[[TaskHandle, Exception], None] | None = None,
+                 max_lane_workers: int = SCHEDULER_MAX_LANE_WORKERS):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers (int): The worker threads available however few lanes are in use.
+            on_error (Callable[[TaskHandle, Exception], None] | None): Called when a task raises.
+            max_lane_workers (int): The upper bound of worker threads when many lanes are in use.
+        """
+        self.max_workers = max_workers
+        self.max_lane_workers = max_lane_workers
+        self.on_error = on_error
+        self.queue: list[tuple[int, int, TaskHandle]] = []
+        self.sequence = itertools.count()
+        self.queued_keys: dict[str, TaskHandle] = {}
+        self.running: set[TaskHandle] = set()
+        self.running_bulk: int = 0
+        self.busy_lanes: set[str] = set()
+        self.workers: int = 0
+        self.idle_workers: int = 0
+        self.closed: bool = False
+        self.condition = threading.Condition()
+
+    def submit(self, function: Callable, *args, key: str | None = None, lane: str | None = None,
+               priority: int = PRIORITY_INTERACTIVE) -> TaskHandle:
+        """
+        Schedule a function.
+
+        Args:
+            function (Callable): The function to run on a worker thread.
+            *args: Its arguments.
+            key (str | None): The coalescing key, e.g. "fetch:<serial>".
+            lane (str | None): The serialization lane, e.g. the device serial.
+            priority (int): One of the PRIORITY_* values.
+
+        Returns:
+            TaskHandle: The new task, or the queued task it was coalesced into.
+        """
+        with self.condition:
+            if self.closed:
+                raise Exception("The task scheduler is shut down.")
+            if key is not None and key in self.queued_keys:
+                handle = self.queued_keys[key]
+                if priority < handle.priority:
+                    handle.priority = priority
+                    self.queue = [(handle.priority if entry is handle else rank, seq, entry) for rank, seq, entry in self.queue]
+                    heapq.heapify(self.queue)
+                return handle
+            handle = TaskHandle(function, args, key, lane, priority)
+            heapq.heappush(self.queue, (priority, next(self.sequence), handle))
+            if key is not None:
+                self.queued_keys[key] = handle
+            if self.idle_workers == 0 and self.workers < self._capacity() + 1:
+                self.workers += 1
+                threading.Thread(target=self._work, name=f"scheduler-{self.workers}", daemon=True).start()
+            self.condition.notify()
+            return handle
+
+    def _capacity(self) -> int:
+        """The workers bulk and background tasks may occupy. Called with the condition held."""
+        lanes = {entry[2].lane for entry in self.queue if entry[2].lane is not None} | self.busy_lanes
+        return max(self.max_workers, min(len(lanes), self.max_lane_workers))
+
+    def _next(self) -> TaskHandle | None:
+        """Pop the most urgent runnable task. Called with the condition held."""
+        blocked = []
+        handle = None
+        bulk_full = self.running_bulk >= self._capacity()
+        while self.queue:
+            entry = heapq.heappop(self.queue)
+            lane_free = entry[2].lane is None or entry[2].lane not in self.busy_lanes
+            if lane_free and not (bulk_full and entry[2].priority > PRIORITY_INTERACTIVE):
+                handle = entry[2]
+                break
+            blocked.append(entry)
+        for entry in blocked:
+            heapq.heappush(self.queue, entry)
+        return handle
+
+    def _work(self) -> None:
+        """Run tasks until the scheduler shuts down."""
+        while True:
+            with self.condition:
+                self.idle_workers += 1
+                handle = self._next()
+                while handle is None and not self.closed:
+                    self.condition.wait()
+                    handle = self._next()
+                self.idle_workers -= 1
+                if handle is None:
+                    self.workers -= 1
+                    return
+                if handle.key is not None and self.queued_keys.get(handle.key) is handle:
+                    del self.queued_keys[handle.key]
+                if handle.lane is not None:
+                    self.busy_lanes.add(handle.lane)
+                if handle.priority > PRIORITY_INTERACTIVE:
+                    self.running_bulk += 1
+                self.running.add(handle)
+                handle.state = "running"
+            _current.handle = handle
+            try:
+                handle.function(*handle.args)
+                handle.state = "cancelled" if handle.cancelled else "done"
+            except Exception as e:
+                handle.state = "failed"
+                if self.on_error is not None:
+                    self.on_error(handle, e)
+            finally:
+                _current.handle = None
+                with self.condition:
+                    self.running.discard(handle)
+                    if handle.lane is not None:
+                        self.busy_lanes.discard(handle.lane)
+                    if handle.priority > PRIORITY_INTERACTIVE:
+                        self.running_bulk -= 1
+                    self.condition.notify_all()
+                handle._set_done()
+
+    def cancel(self, handle: TaskHandle) -> None:
+        """
+        Cancel a task: a queued task never runs, a running one sees `task_cancelled()`.
+
+        Args:
+            handle (TaskHandle): The task.
+        """
+        with self.condition:
+            handle.cancel_event.set()
+            if handle.state != "queued":
+                return
+            self.queue = [entry for entry in self.queue if entry[2] is not handle]
+            heapq.heapify(self.queue)
+            if handle.key is not None and self.queued_keys.get(handle.key) is handle:
+                del self.queued_keys[handle.key]
+            handle.state = "cancelled"
+        handle._set_done()
+
+    def cancel_all(self) -> int:
+        """
+        Cancel every queued and running task.
+
+        Returns:
+            int: The number of tasks cancelled.
+        """
+        with self.condition:
+            handles = [entry[2] for entry in self.queue] + list(self.running)
+        for handle in handles:
+            self.cancel(handle)
+        return len(handles)
+
+    def shutdown(self) -> None:
+        """Cancel every task and let the workers exit."""
+        self.cancel_all()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
@@ -0,0 +1,23 @@
+"""Shared fixtures: the tests drive the debloater against the benchmark fake adb."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+FAKE_ADB = ROOT / "benchmarks" / "fake_adb.py"
+
+
+@pytest.fixture
+def fake_adb(tmp_path, monkeypatch) -> Path:
+    """Point the fake adb at a fresh state directory with one small device, A1, and return its path."""
+    monkeypatch.setenv("FAKE_ADB_STATE", str(tmp_path / "state"))
+    monkeypatch.setenv("FAKE_ADB_DEVICES", "A1")
+    monkeypatch.setenv("FAKE_ADB_PACKAGES", "12")
+    for name in ("FAKE_ADB_LATENCY", "FAKE_ADB_SHELL_LATENCY", "FAKE_ADB_FAILURE_RATE", "FAKE_ADB_ROOT",
+                 "FAKE_ADB_SHELL_V2"):
+        monkeypatch.delenv(name, raising=False)
+    return FAKE_ADB
@@ -0,0 +1,25 @@
+import pytest
+
+from adb_client import AdbClient
+from adb_session import SESSION_TIMEOUT
+from async_adb import AsyncAdb
+from fake_adb_server import start_server
+
+
+@pytest.fixture
+def client(fake_adb):
+    server = start_server(0)
+    yield AdbClient(port=server.server_address[1], timeout=5.0)
+    server.stop()
+
+
+def test_backends_share_the_idle_timeout(fake_adb):
+    assert AdbClient().timeout == AsyncAdb(fake_adb).timeout == SESSION_TIMEOUT
+
+
+def test_shell_reports_exit_code_and_streams(client):
+    result = client.shell("A1", "echo out; echo err >&2; exit 3")
+    assert (result.returncode, result.stdout, result.stderr) == (3, "out\n", "err\n")
+    lines = []
+    assert client.shell("A1", "echo a; echo b", lines.append).returncode == 0
+    assert lines == ["a\n", "b\n"]
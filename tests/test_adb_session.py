@@ -0,0 +1,55 @@
+import pytest
+
+from adb_session import SessionPool
+
+
+@pytest.fixture
+def pool(fake_adb):
+    pool = SessionPool(fake_adb)
+    yield pool
+    pool.close_all()
+
+
+def test_exit_code_and_output_survive_exit(pool):
+    result = pool.run("A1", "echo hi; exit 3", timeout=10)
+    assert (result.returncode, result.stdout) == (3, "hi\n")
+    assert pool.run("A1", "echo still here", timeout=10).stdout == "still here\n"
+
+
+def test_syntax_error_fails_fast(pool):
+    result = pool.run("A1", "echo 'unterminated", timeout=10)
+    assert result.returncode != 0
+    assert result.stderr
+    assert pool.run("A1", "echo ok", timeout=10).returncode == 0
+
+
+def test_state_does_not_leak_between_commands(pool):
+    pool.run("A1", "cd /; LEAKED=yes; export EXPORTED=yes", timeout=10)
+    result = pool.run("A1", 'pwd; echo "[$LEAKED][$EXPORTED]"', timeout=10)
+    assert result.stdout.splitlines()[1] == "[][]"
+    assert result.stdout.splitlines()[0] != "/"
+
+
+def test_stderr_is_separated(pool):
+    result = pool.run("A1", "echo out; echo err >&2", timeout=10)
+    assert (result.stdout, result.stderr) == ("out\n", "err\n")
+
+
+def test_session_stopped_by_callback_is_not_reused(pool):
+    class Stop(Exception):
+        pass
+
+    def on_line(line: str) -> None:
+        raise Stop()
+
+    with pytest.raises(Stop):
+        pool.run("A1", "echo one; echo two", timeout=10, on_line=on_line)
+    assert "A1" not in pool.sessions
+    assert pool.run("A1", "echo again", timeout=10).stdout == "again\n"
+
+
+def test_closed_session_is_replaced(pool):
+    session = pool.get("A1")
+    session.close()
+    assert pool.run("A1", "echo fresh", timeout=10).stdout == "fresh\n"
+    assert pool.get("A1") is not session
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from adb_client import AdbStreamError
+from async_adb import AsyncAdb
+from debloater_engine import DebloaterEngine
+from fake_adb_server import start_server
+from job_journal import JobJournal
+
+# Six lines, 0.4 s apart: the whole command outlasts the 1 s timeout, no single read does.
+STEADY = "for i in 1 2 3 4 5 6; do sleep 0.4; echo $i; done"
+
+
+@pytest.fixture
+def server(fake_adb):
+    server = start_server(0)
+    yield server
+    server.stop()
+
+
+@pytest.fixture(params=["spawn", "socket"])
+def adb(request, fake_adb):
+    port = request.getfixturevalue("server").server_address[1] if request.param == "socket" else None
+    adb = AsyncAdb(fake_adb, port=port, timeout=1.0)
+    yield adb
+    adb.close()
+
+
+def test_steady_output_is_not_cut_off(adb):
+    lines = []
+    result = adb.run(adb.shell("A1", STEADY, lines.append))
+    assert result.returncode == 0
+    assert lines == [f"{i}\n" for i in range(1, 7)]
+
+
+def test_silent_command_times_out(adb):
+    with pytest.raises(AdbStreamError):
+        adb.run(adb.shell("A1", "sleep 3"))
+
+
+def test_slow_journaled_batch_finishes(fake_adb, tmp_path, monkeypatch):
+    engine = DebloaterEngine(fake_adb)
+    engine.log_stream = None
+    engine.job_journal = JobJournal(tmp_path / "jobs")
+    engine.adb_backend = "async"
+    engine.async_adb = AsyncAdb(fake_adb, port=None, timeout=1.0)
+    try:
+        engine.run_shell("A1", "true")
+        packages = [line.split()[0] for line in (tmp_path / "state" / "A1" / "packages").read_text().splitlines()[:6]]
+        monkeypatch.setenv("FAKE_ADB_SHELL_LATENCY", "0.4")
+        job = engine.start_job("A1", "uninstall", packages)
+        results = engine.run_job(job)
+    finally:
+        engine.close_async_adb()
+        engine.session_pool.close_all()
+    assert sorted(results) == sorted(packages)
+    assert all(code == 0 for code, _ in results.values())
+    assert engine.job_journal.load(job)["finished"]
+
+
+def test_close_cancels_commands_in_flight(adb):
+    lines = []
+    future = adb.submit(adb.shell("A1", "echo started; exec sleep 5", lines.append))
+    deadline = time.monotonic() + 5
+    while not lines and time.monotonic() < deadline:
+        time.sleep(0.05)
+    adb.close()
+    assert future.cancelled()
+
+
+def test_stream_lines_are_handled_on_the_calling_thread(fake_adb):
+    engine = DebloaterEngine(fake_adb)
+    engine.adb_backend = "async"
+    engine.async_adb = AsyncAdb(fake_adb, port=None, timeout=5.0)
+    threads = set()
+    try:
+        result = engine._backend_shell("A1", "echo a; echo b", lambda line: threads.add(threading.get_ident()))
+    finally:
+        engine.close_async_adb()
+        engine.session_pool.close_all()
+    assert result.returncode == 0
+    assert threads == {threading.get_ident()}
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from task_scheduler import TaskScheduler, PRIORITY_BULK, SCHEDULER_MAX_LANE_WORKERS
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = TaskScheduler()
+    yield scheduler
+    scheduler.shutdown()
+
+
+def test_bulk_work_scales_with_device_lanes(scheduler):
+    running, peak, lock, release = [0], [0], threading.Lock(), threading.Event()
+
+    def task() -> None:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+
+    handles = [scheduler.submit(task, lane=f"D{index:02d}", priority=PRIORITY_BULK) for index in range(20)]
+    time.sleep(0.5)
+    release.set()
+    assert all(handle.wait(5) for handle in handles)
+    assert peak[0] == SCHEDULER_MAX_LANE_WORKERS
+
+
+def test_interactive_task_does_not_wait_behind_bulk(scheduler):
+    release = threading.Event()
+    bulk = [scheduler.submit(release.wait, 5, lane=f"D{index:02d}", priority=PRIORITY_BULK) for index in range(20)]
+    time.sleep(0.2)
+    refresh = scheduler.submit(lambda: None, key="devices", lane="adb-server")
+    assert refresh.wait(1)
+    release.set()
+    assert all(handle.wait(5) for handle in bulk)
+
+
+def test_done_callback_runs_for_task_cancelled_while_queued(scheduler):
+    release, ended = threading.Event(), []
+    blocker = scheduler.submit(release.wait, 5, lane="D1")
+    queued = scheduler.submit(lambda: None, lane="D1")
+    queued.add_done_callback(lambda handle: ended.append(handle.state))
+    scheduler.cancel(queued)
+    release.set()
+    assert blocker.wait(5)
+    assert ended == ["cancelled"]
+    blocker.add_done_callback(lambda handle: ended.append(handle.state))
+    assert ended == ["cancelled", "done"]